@@ -5,7 +5,13 @@ from .playerid_lookup import playerid_lookup
 from .playerid_lookup import chadwick_register
 from .teamid_lookup import fangraphs_teams
 from .teamid_lookup import team_ids
-from .statcast import statcast, statcast_single_game
+from .statcast import statcast, statcast_async, statcast_single_game
+from .statcast_stream import read_statcast_parquet, statcast_iter, statcast_to_parquet
+from .statcast_sync import statcast_sync
+from .statcast_filters import StatcastFilter
+from .statcast_players import statcast_players
+from .statcast_games import statcast_games, statcast_games_iter
+from .statcast_aggregate import statcast_aggregate
 from .statcast_pitcher import (
 	statcast_pitcher,
 	statcast_pitcher_exitvelo_barrels,
@@ -1,4 +1,5 @@
 from .cache import config
-from .cache import df_cache
-from .cache import disable, enable, flush, purge
+from .cache import df_cache, memory
+from .cache import compact, disable, enable, enforce_max_bytes, flush, purge, register_store, total_size
 from .cache_config import CacheConfig
+from .cache_store import CacheStore
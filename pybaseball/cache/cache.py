@@ -1,13 +1,15 @@
 import abc
+import contextlib
 import datetime
 import functools
 import glob
 import os
-from typing import Any, Callable, Dict, Optional, TypeVar, cast
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast
 
 import pandas as pd
 
-from . import cache_record, func_utils
+from . import cache_index, cache_record, cache_store, file_utils, func_utils, memory_cache, single_flight
 from .cache_config import CacheConfig, autoload_cache
 
 # Doing this instead of defining the types in our cache functions allows VS Code to pick up the proper type annotations
@@ -17,6 +19,18 @@ _CacheFunc = TypeVar("_CacheFunc", bound=Callable[..., pd.DataFrame])
 # Cache is disabled by default
 config = autoload_cache()
 
+# In-process tier that sits in front of the disk records, sized by config.memory_cache_bytes
+memory = memory_cache.MemoryCache()
+
+# Concurrent identical calls within the process wait on a single fetch
+_in_flight = single_flight.SingleFlight()
+
+_compaction_lock = threading.Lock()
+_compaction_thread: Optional[threading.Thread] = None
+
+# Opens each registered store for a config, or gives None if its cache directory doesn't have one
+_store_openers: List[Callable[[CacheConfig], Optional[cache_store.CacheStore]]] = []
+
 
 def enable() -> None:
     config.enable(True)
@@ -26,6 +40,25 @@ def disable() -> None:
     config.enable(False)
 
 
+def register_store(open_store: Callable[[CacheConfig], Optional[cache_store.CacheStore]]) -> None:
+    '''
+    Have purge, flush and compact look after a store keeping its own files in the cache directory, and count it
+    towards max_bytes. open_store gets the store for a config, or None if its cache directory doesn't have one.
+    '''
+    _store_openers.append(open_store)
+
+
+def _open_stores() -> List[cache_store.CacheStore]:
+    stores = [open_store(config) for open_store in _store_openers]
+    return [store for store in stores if store is not None]
+
+
+def total_size() -> int:
+    ''' The size of the cache directory's records and stores, in bytes '''
+    index = cache_index.open_index(config.cache_directory)
+    return (index.total_size() if index is not None else 0) + sum(store.total_size() for store in _open_stores())
+
+
 def purge() -> None:
     ''' Remove all records from the cache '''
     record_files = glob.glob(os.path.join(config.cache_directory, '*.cache_record.json'))
@@ -33,14 +66,98 @@ def purge() -> None:
     for record in records:
         record.delete()
 
+    memory.clear()
+
+    index = cache_index.open_index(config.cache_directory)
+    if index is not None:
+        index.clear()
+
+    for store in _open_stores():
+        store.clear()
+
+    single_flight.remove_stale_locks(config.cache_directory)
+
 
 def flush() -> None:
     ''' Remove all expired files from the cache '''
     record_files = glob.glob(os.path.join(config.cache_directory, '*.cache_record.json'))
     records = [cache_record.CacheRecord(filename) for filename in record_files]
+    index = cache_index.open_index(config.cache_directory)
     for record in records:
         if record.expired:
             record.delete()
+            if index is not None:
+                index.remove(record.filename)
+
+    for store in _open_stores():
+        store.flush()
+
+    memory.clear()
+
+
+def compact(max_bytes: Optional[int] = None) -> int:
+    '''
+    Evict the least valuable records and store entries until the cache directory fits in max_bytes (config.max_bytes
+    by default). Expired entries go first, then entries are evicted according to config.eviction_policy. Lock files
+    no process holds are deleted too.
+    Returns the number of bytes freed.
+    '''
+    max_bytes = config.max_bytes if max_bytes is None else max_bytes
+    index = cache_index.open_index(config.cache_directory)
+    if max_bytes is None or index is None:
+        return 0
+
+    single_flight.remove_stale_locks(config.cache_directory)
+
+    candidates: List[Tuple[cache_index.Usage, Callable[[], None]]] = [
+        (usage, functools.partial(_evict_record, index, key, record_file))
+        for key, record_file, usage in index.usage()
+    ]
+    for store in _open_stores():
+        candidates += [(usage, functools.partial(store.evict, entry)) for entry, usage in store.usage()]
+    candidates.sort(key=lambda candidate: cache_index.eviction_key(candidate[0], config.eviction_policy))
+
+    excess = sum(usage.size for usage, _ in candidates) - max_bytes
+    freed = 0
+    for usage, evict in candidates:
+        if freed >= excess:
+            break
+        evict()
+        freed += usage.size
+
+    return freed
+
+
+def _evict_record(index: cache_index.CacheIndex, key: str, record_file: str) -> None:
+    try:
+        cache_record.CacheRecord(record_file).delete()
+    except OSError:
+        pass
+    index.remove(record_file)
+    memory.remove(key)
+
+
+def enforce_max_bytes() -> None:
+    ''' Compact in the background if the cache directory has grown over config.max_bytes '''
+    if config.max_bytes is not None and total_size() > config.max_bytes:
+        _schedule_compaction()
+
+
+def _safe_compact() -> None:
+    try:
+        compact()
+    except:  # pylint: disable=bare-except
+        pass
+
+
+def _schedule_compaction() -> threading.Thread:
+    ''' Run compact() on a background thread, unless one is already running '''
+    global _compaction_thread  # pylint: disable=global-statement
+    with _compaction_lock:
+        if _compaction_thread is None or not _compaction_thread.is_alive():
+            _compaction_thread = threading.Thread(target=_safe_compact, name='pybaseball-cache-compaction', daemon=True)
+            _compaction_thread.start()
+        return _compaction_thread
 
  # pylint: disable=invalid-name
  # pylint: disable=too-few-public-methods
@@ -53,16 +170,44 @@ class df_cache:
         @functools.wraps(func)
         def _cached(*args: Any, **kwargs: Any) -> pd.DataFrame:
             func_data = self._safe_get_func_data(func, args, kwargs)
-            result = self._safe_load_func_cache(func_data)
+            result = self._safe_load_memory_cache(func_data)
             if result is None:
-                result = func(*args, **kwargs)
-                if len(result) > 0:
-                    self._safe_save_func_cache(func_data, result)
+                result = self._safe_load_func_cache(func_data)
+            if result is not None:
+                return result
 
-            return result
+            if not func_data:
+                return self._call_and_save(func, args, kwargs, func_data)
+
+            key = cache_index.func_key(func_data)
+            return _in_flight.do(
+                key,
+                lambda: self._call_and_save(func, args, kwargs, func_data, key),
+                share=lambda df: df.copy() if isinstance(df, pd.DataFrame) else df,
+            )
 
         return cast(_CacheFunc, _cached)
 
+    def _call_and_save(self, func: _CacheFunc, args: Any, kwargs: Any, func_data: Dict,
+                       key: Optional[str] = None) -> pd.DataFrame:
+        with contextlib.ExitStack() as stack:
+            if key is not None:
+                try:
+                    stack.enter_context(single_flight.file_lock(self.cache_config.cache_directory, key))
+                except OSError:
+                    pass  # locking is best effort, e.g. on a read only directory
+
+                # Another process may have cached this since we missed, whether or not we had to wait for the lock
+                result = self._safe_load_func_cache(func_data)
+                if result is not None:
+                    return result
+
+            result = func(*args, **kwargs)
+            if len(result) > 0:
+                self._safe_save_func_cache(func_data, result)
+
+            return result
+
     def _safe_get_func_data(self, func: _CacheFunc, args: Any, kwargs: Any) -> Dict:
         try:
             func_name = func_utils.get_func_name(func)
@@ -93,27 +238,94 @@ class df_cache:
         except:  # pylint: disable=bare-except
             return {}
 
+    def _safe_load_memory_cache(self, func_data: Dict) -> Optional[pd.DataFrame]:
+        try:
+            if not self.cache_config.enabled or not func_data or self.cache_config.memory_cache_bytes <= 0:
+                return None
+            return memory.get(cache_index.func_key(func_data))
+        except:  # pylint: disable=bare-except
+            return None
+
+    def _safe_save_memory_cache(self, func_data: Dict, result: pd.DataFrame, record: cache_record.CacheRecord) -> None:
+        try:
+            if self.cache_config.memory_cache_bytes > 0:
+                memory.put(
+                    cache_index.func_key(func_data), result, record.expiration_date,
+                    self.cache_config.memory_cache_bytes
+                )
+        except:  # pylint: disable=bare-except
+            pass
+
     def _safe_load_func_cache(self, func_data: Dict) -> Optional[pd.DataFrame]:
         try:
-            glob_path = os.path.join(self.cache_config.cache_directory, f'{func_data["func"]}*.cache_record.json')
-            record_files = glob.glob(glob_path)
+            # Opening the index creates it, and the cache shouldn't touch the disk while it's off
+            if not self.cache_config.enabled or not func_data:
+                return None
 
-            records = [cache_record.CacheRecord(filename) for filename in record_files]
+            index = cache_index.open_index(self.cache_config.cache_directory)
+            if index is None:
+                return self._scan_func_cache(func_data)
 
-            for record in records:
-                if not record.expired and record.supports(func_data):
-                    return record.load_df()
+            key = cache_index.func_key(func_data)
+            record_file = index.lookup(key)
+            if record_file is None:
+                return None
+
+            try:
+                record = cache_record.CacheRecord(record_file)
+            except (OSError, ValueError):
+                # The record was removed from under the index
+                index.remove(record_file)
+                return None
+
+            if not record.expired and record.supports(func_data):
+                result = record.load_df()
+                index.touch(key)
+                self._safe_save_memory_cache(func_data, result, record)
+                return result
 
             return None
         except:  # pylint: disable=bare-except
             return None
 
+    def _scan_func_cache(self, func_data: Dict) -> Optional[pd.DataFrame]:
+        ''' Fallback for when there is no index available: scan all of the function's records '''
+        glob_path = os.path.join(self.cache_config.cache_directory, f'{func_data["func"]}*.cache_record.json')
+        record_files = glob.glob(glob_path)
+
+        records = [cache_record.CacheRecord(filename) for filename in record_files]
+
+        for record in records:
+            if not record.expired and record.supports(func_data):
+                result = record.load_df()
+                self._safe_save_memory_cache(func_data, result, record)
+                return result
+
+        return None
+
     def _safe_save_func_cache(self, func_data: Dict, result: pd.DataFrame) -> None:
         try:
             if self.cache_config.enabled and func_data:
                 new_record = cache_record.CacheRecord(data=func_data, expires=self.expires)
-                new_record.save()
+                # Publish the frame before the record that points at it, and the record before the index entry
                 new_record.save_df(result)
+                try:
+                    new_record.save()
+                except Exception:
+                    # Don't leave an orphaned frame behind
+                    if os.path.exists(new_record.data['dataframe']):
+                        file_utils.remove(new_record.data['dataframe'])
+                    raise
+                self._safe_save_memory_cache(func_data, result, new_record)
+
+                index = cache_index.open_index(self.cache_config.cache_directory)
+                if index is not None:
+                    replaced = index.add(
+                        cache_index.func_key(func_data), func_data['func'], new_record.filename,
+                        new_record.data['expires'], cache_index.record_size(new_record.filename)
+                    )
+                    if replaced is not None:
+                        cache_record.CacheRecord(replaced).delete()
+                    enforce_max_bytes()
         except:  # pylint: disable=bare-except
             pass
-
@@ -2,7 +2,7 @@ import os
 import pathlib
 from typing import Optional
 
-from . import file_utils
+from . import cache_index, file_utils
 from ..datahelpers import singleton
 
 
@@ -10,19 +10,33 @@ class CacheConfig(singleton.Singleton):
     DEFAULT_CACHE_DIR = os.path.join(pathlib.Path.home(), '.pybaseball', 'cache')
     DEFAULT_EXPIRATION = 7  # number of days to cache by default
     DEFAULT_CACHE_TYPE = 'parquet'
+    CACHE_TYPES = ('csv', 'parquet', 'feather')
+    DEFAULT_MEMORY_CACHE_BYTES = 0  # in-memory tier is disabled by default
+    DEFAULT_EVICTION_POLICY = 'lru'
     CFG_FILENAME = 'cache_config.json'
     PYBASEBALL_CACHE_ENV = 'PYBASEBALL_CACHE'
 
-    def __init__(self, enabled: bool = False, default_expiration: int = None, cache_type: Optional[str] = None):
+    def __init__(self, enabled: bool = False, default_expiration: int = None, cache_type: Optional[str] = None,
+                 memory_cache_bytes: Optional[int] = None, max_bytes: Optional[int] = None,
+                 eviction_policy: Optional[str] = None):
         self.enabled = enabled
         self.cache_directory = os.environ.get(CacheConfig.PYBASEBALL_CACHE_ENV) or CacheConfig.DEFAULT_CACHE_DIR
         self.default_expiration = default_expiration or CacheConfig.DEFAULT_EXPIRATION
         if cache_type is not None:
             self.cache_type = cache_type.lower()
-            if self.cache_type not in ('csv', 'parquet'):
+            if self.cache_type not in CacheConfig.CACHE_TYPES:
                 raise ValueError(f"Invalid cache_type: {cache_type}")
         else:
             self.cache_type = CacheConfig.DEFAULT_CACHE_TYPE
+        if memory_cache_bytes is not None and memory_cache_bytes < 0:
+            raise ValueError(f"Invalid memory_cache_bytes: {memory_cache_bytes}")
+        self.memory_cache_bytes = memory_cache_bytes or CacheConfig.DEFAULT_MEMORY_CACHE_BYTES
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError(f"Invalid max_bytes: {max_bytes}")
+        self.max_bytes = max_bytes  # None means the cache directory is unbounded
+        self.eviction_policy = (eviction_policy or CacheConfig.DEFAULT_EVICTION_POLICY).lower()
+        if self.eviction_policy not in cache_index.EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction_policy: {eviction_policy}")
 
         file_utils.mkdir(self.cache_directory)
 
@@ -39,6 +53,9 @@ class CacheConfig(singleton.Singleton):
             'enabled': self.enabled,
             'default_expiration': self.default_expiration,
             'cache_type': self.cache_type.lower(), # in case of "Parquet" or "CSV", ensures a uniform filename.
+            'memory_cache_bytes': self.memory_cache_bytes,
+            'max_bytes': self.max_bytes,
+            'eviction_policy': self.eviction_policy,
         }
         file_utils.safe_jsonify(self.cache_directory, CacheConfig.CFG_FILENAME, data)
 
@@ -0,0 +1,204 @@
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from . import file_utils
+
+INDEX_FILENAME = 'cache_index.sqlite3'
+SCHEMA_VERSION = 2
+
+EVICTION_POLICIES = ('lru', 'lfu')
+
+_local = threading.local()
+
+
+class Usage(NamedTuple):
+    ''' What eviction weighs an entry in the cache directory by '''
+    size: int
+    expired: bool
+    hits: int
+    last_access: float
+
+
+def eviction_key(usage: Usage, policy: str = 'lru') -> Tuple[Any, ...]:
+    '''
+    Sort key putting the least valuable entries first: expired entries always go first, then the least recently used
+    ('lru') or least often hit ('lfu') entries.
+    '''
+    if policy not in EVICTION_POLICIES:
+        raise ValueError(f"Invalid eviction policy: {policy}")
+    if policy == 'lru':
+        return (not usage.expired, usage.last_access)
+    return (not usage.expired, usage.hits, usage.last_access)
+
+
+def func_key(func_data: Dict[str, Any]) -> str:
+    '''
+    A stable hash of the (func, args, kwargs) of a cached call.
+
+    The args and kwargs are normalized through the same JSON serialization used to write the cache records,
+    so a record loaded back from disk hashes to the same key as the call that created it.
+    '''
+    payload = json.dumps(
+        [func_data.get('func'), func_data.get('args'), func_data.get('kwargs')],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def record_size(record_filename: str) -> int:
+    ''' The size on disk of a cache record and its DataFrame '''
+    size = os.path.getsize(record_filename)
+    data = file_utils.load_json(record_filename)
+    if isinstance(data, dict) and data.get('dataframe') and os.path.exists(data['dataframe']):
+        size += os.path.getsize(data['dataframe'])
+    return size
+
+
+class CacheIndex:
+    '''
+    A persistent index of the cache records in a cache directory, keyed by func_key.
+
+    This replaces globbing and parsing every record of a function on each lookup with a single keyed query.
+    Records written by the per-record JSON layout (before the index existed) are imported the first time the
+    index is opened in a directory.
+    '''
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.filename = os.path.join(directory, INDEX_FILENAME)
+        self.connection = sqlite3.connect(self.filename, timeout=30)
+        self._create()
+
+    def _create(self) -> None:
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS records ('
+                'key TEXT PRIMARY KEY, func TEXT NOT NULL, record TEXT NOT NULL, expires TEXT NOT NULL)'
+            )
+            self.connection.execute('CREATE INDEX IF NOT EXISTS records_by_record ON records (record)')
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            self._migrate_legacy_records()
+        if version < 2:
+            self._add_usage_columns()
+        if version < SCHEMA_VERSION:
+            with self.connection:
+                self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def _add_usage_columns(self) -> None:
+        ''' Track the size, last access time and hit count of each record for size-bounded eviction '''
+        with self.connection:
+            self.connection.execute('ALTER TABLE records ADD COLUMN size INTEGER NOT NULL DEFAULT 0')
+            self.connection.execute('ALTER TABLE records ADD COLUMN last_access REAL NOT NULL DEFAULT 0')
+            self.connection.execute('ALTER TABLE records ADD COLUMN hits INTEGER NOT NULL DEFAULT 0')
+
+        usage = []
+        for key, record in self.connection.execute('SELECT key, record FROM records').fetchall():
+            record_file = os.path.join(self.directory, record)
+            try:
+                usage.append((record_size(record_file), os.path.getmtime(record_file), key))
+            except:  # pylint: disable=bare-except
+                continue
+        with self.connection:
+            self.connection.executemany('UPDATE records SET size = ?, last_access = ? WHERE key = ?', usage)
+
+    def _migrate_legacy_records(self) -> None:
+        ''' Import all records written before the index existed '''
+        entries = []
+        for filename in glob.glob(os.path.join(self.directory, '*.cache_record.json')):
+            try:
+                data = file_utils.load_json(filename)
+                assert isinstance(data, dict)
+                entries.append((func_key(data), data.get('func', ''), os.path.basename(filename), data['expires']))
+            except:  # pylint: disable=bare-except
+                continue
+
+        # Keep the record that expires last if several were written for the same call
+        entries.sort(key=lambda entry: entry[3])
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO records (key, func, record, expires) VALUES (?, ?, ?, ?)',
+                entries
+            )
+
+    def lookup(self, key: str) -> Optional[str]:
+        ''' Get the record filename for a key, or None if there isn't one '''
+        row = self.connection.execute('SELECT record FROM records WHERE key = ?', (key,)).fetchone()
+        return os.path.join(self.directory, row[0]) if row else None
+
+    def add(self, key: str, func: str, record_filename: str, expires: str, size: int = 0) -> Optional[str]:
+        '''
+        Point a key at a record. Returns the filename of the record it replaced, if any.
+        '''
+        replaced = self.lookup(key)
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO records (key, func, record, expires, size, last_access, hits) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0)',
+                (key, func, os.path.basename(record_filename), expires, size, time.time())
+            )
+        return replaced if replaced != record_filename else None
+
+    def touch(self, key: str) -> None:
+        ''' Record a cache hit '''
+        with self.connection:
+            self.connection.execute(
+                'UPDATE records SET hits = hits + 1, last_access = ? WHERE key = ?', (time.time(), key)
+            )
+
+    def total_size(self) -> int:
+        return int(self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM records').fetchone()[0])
+
+    def usage(self) -> List[Tuple[str, str, Usage]]:
+        ''' All (key, record filename, usage) entries '''
+        today = str(date.today())
+        rows = self.connection.execute('SELECT key, record, size, expires, hits, last_access FROM records').fetchall()
+        return [
+            (key, os.path.join(self.directory, record), Usage(size, expires < today, hits, last_access))
+            for key, record, size, expires, hits, last_access in rows
+        ]
+
+    def eviction_order(self, policy: str = 'lru') -> List[Tuple[str, str, int]]:
+        ''' All (key, record filename, size) entries, least valuable first (see eviction_key) '''
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Invalid eviction policy: {policy}")
+        entries = sorted(self.usage(), key=lambda entry: eviction_key(entry[2], policy))
+        return [(key, record_file, usage.size) for key, record_file, usage in entries]
+
+    def remove(self, record_filename: str) -> None:
+        with self.connection:
+            self.connection.execute('DELETE FROM records WHERE record = ?', (os.path.basename(record_filename),))
+
+    def clear(self) -> None:
+        with self.connection:
+            self.connection.execute('DELETE FROM records')
+
+
+def open_index(directory: str) -> Optional[CacheIndex]:
+    '''
+    Get the index for a cache directory, reusing a connection per thread.
+    Returns None if the index can't be opened (e.g. the directory doesn't exist or is read only).
+    '''
+    indexes: Dict[str, CacheIndex] = getattr(_local, 'indexes', None) or {}
+    _local.indexes = indexes
+
+    index = indexes.get(directory)
+    if index is not None and os.path.isfile(index.filename):
+        return index
+
+    try:
+        if not os.path.isdir(directory):
+            return None
+        index = CacheIndex(directory)
+        indexes[directory] = index
+        return index
+    except:  # pylint: disable=bare-except
+        return None
@@ -0,0 +1,32 @@
+import abc
+from typing import Any, List, Tuple
+
+from .cache_index import Usage
+
+
+class CacheStore(abc.ABC):
+    '''
+    Data a module keeps in the cache directory in a layout of its own, rather than as cache records (e.g. the
+    Statcast day store). A registered store (see cache.register_store) is purged, flushed and compacted along with
+    the records, and counts towards config.max_bytes.
+    '''
+
+    @abc.abstractmethod
+    def total_size(self) -> int:
+        ''' The size of the store's files, in bytes '''
+
+    @abc.abstractmethod
+    def usage(self) -> List[Tuple[Any, Usage]]:
+        ''' Every entry that can be evicted, with its usage '''
+
+    @abc.abstractmethod
+    def evict(self, entry: Any) -> None:
+        ''' Remove an entry that usage returned '''
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        ''' Remove every entry '''
+
+    @abc.abstractmethod
+    def flush(self) -> None:
+        ''' Remove the entries that have expired '''
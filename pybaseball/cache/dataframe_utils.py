@@ -1,11 +1,33 @@
+import functools
+from typing import List, Optional
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather
+import pyarrow.parquet as pq
+
+from . import file_utils
 
 
-def load_df(filename: str) -> pd.DataFrame:
+def load_df(filename: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    '''
+    Load a cached frame. If columns is given, only those of them the frame has are read (for parquet and feather,
+    without touching the rest of the file)
+    '''
     if filename.lower().endswith('csv'):
-        data = pd.read_csv(filename, index_col=0)
+        if columns is None:
+            data = pd.read_csv(filename, index_col=0)
+        else:
+            # The index is written as the first column, which has no name
+            wanted = set(columns) | {'Unnamed: 0'}
+            data = pd.read_csv(filename, index_col=0, usecols=lambda column: column in wanted)
     elif filename.lower().endswith('parquet'):
-        data = pd.read_parquet(filename)
+        if columns is not None:
+            names = set(pq.read_schema(filename).names)
+            columns = [column for column in columns if column in names]
+        data = pd.read_parquet(filename, columns=columns)
+    elif filename.lower().endswith('feather'):
+        data = load_feather(filename, columns)
     else:
         raise ValueError(f"Cache frame {filename} has an unsupported extension.")
     return data
@@ -13,8 +35,28 @@ def load_df(filename: str) -> pd.DataFrame:
 
 def save_df(data: pd.DataFrame, filename: str) -> None:
     if filename.lower().endswith('csv'):
-        data.to_csv(filename)
+        writer = data.to_csv
     elif filename.lower().endswith('parquet'):
-        data.to_parquet(filename)
+        writer = data.to_parquet
+    elif filename.lower().endswith('feather'):
+        # Uncompressed so the file can be memory mapped on load instead of decoded
+        writer = functools.partial(pyarrow.feather.write_feather, data, compression='uncompressed')
     else:
         raise ValueError(f"DataFrame {filename} is an unsupported type")
+
+    with file_utils.atomic_write(filename) as temp_filename:
+        writer(temp_filename)
+
+
+def load_feather(filename: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    '''
+    Load an Arrow IPC (Feather v2) file through a memory map.
+    The Arrow buffers are backed by the OS page cache, so they are shared by every process on the host
+    reading the same file, and split_blocks lets pandas reuse them for columns that don't need converting.
+    Only the pages of the columns asked for are ever read.
+    '''
+    with pa.memory_map(filename, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select([column for column in columns if column in table.column_names])
+    return table.to_pandas(split_blocks=True)
@@ -1,7 +1,9 @@
+import contextlib
 import json
 import os
 import pathlib
-from typing import Any, Dict, List, Union, cast
+import uuid
+from typing import Any, Dict, Iterator, List, Union, cast
 
 JSONData = Union[List[Any], Dict[str, Any]]
 
@@ -16,11 +18,30 @@ def remove(filename: str) -> None:
     return os.remove(filename)
 
 
+@contextlib.contextmanager
+def atomic_write(filename: str) -> Iterator[str]:
+    '''
+    Yields a temporary filename to write to, which is renamed over filename once the write succeeds.
+    Readers will only ever see the previous file or the complete new one, never a partial write.
+    The temporary file keeps the extension of filename, so writers that dispatch on it still work.
+    '''
+    directory, name = os.path.split(filename)
+    temp_filename = os.path.join(directory, f'.{uuid.uuid4().hex}.tmp.{name}')
+    try:
+        yield temp_filename
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            remove(temp_filename)
+        raise
+
+
 def safe_jsonify(directory: str, filename: str, data: JSONData) -> None:
     mkdir(directory)
     fname = os.path.join(directory, filename)
-    with open(fname, 'w') as json_file:
-        json.dump(data, json_file)
+    with atomic_write(fname) as temp_fname:
+        with open(temp_fname, 'w') as json_file:
+            json.dump(data, json_file)
 
 
 def load_json(filename: str) -> JSONData:
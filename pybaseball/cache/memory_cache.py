@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Optional, Tuple
+
+import pandas as pd
+
+
+def frame_size(df: pd.DataFrame) -> int:
+    ''' The in-memory size of a DataFrame in bytes, including its index and the contents of object columns '''
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class MemoryCache:
+    '''
+    An in-process LRU cache of DataFrames, bounded by the total size of the frames it holds.
+
+    Frames are copied on the way in and on the way out, so callers are free to modify what they get back
+    without corrupting the cached copy.
+    '''
+
+    def __init__(self) -> None:
+        self._frames: 'OrderedDict[str, Tuple[pd.DataFrame, int, date]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is None:
+                return None
+            frame, nbytes, expiration_date = entry
+            if date.today() > expiration_date:
+                del self._frames[key]
+                self.size -= nbytes
+                return None
+            self._frames.move_to_end(key)
+        return frame.copy()
+
+    def put(self, key: str, df: pd.DataFrame, expiration_date: date, max_bytes: int) -> None:
+        nbytes = frame_size(df)
+        if nbytes > max_bytes:
+            # Don't flush everything else out for a frame that will never fit
+            self.remove(key)
+            return
+
+        frame = df.copy()
+        with self._lock:
+            previous = self._frames.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._frames[key] = (frame, nbytes, expiration_date)
+            self.size += nbytes
+            self._evict(max_bytes)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            previous = self._frames.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self.size = 0
+
+    def _evict(self, max_bytes: int) -> None:
+        while self.size > max_bytes and self._frames:
+            _, (_, nbytes, _) = self._frames.popitem(last=False)
+            self.size -= nbytes
@@ -0,0 +1,176 @@
+import contextlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from . import file_utils
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None  # type: ignore
+
+LOCK_DIRECTORY = 'locks'
+
+
+@contextlib.contextmanager
+def file_lock(directory: str, key: str) -> Iterator[bool]:
+    '''
+    Hold an exclusive, cross-process lock for a key in a cache directory.
+    Yields whether the lock was contended, i.e. whether another process held it when we asked for it.
+    Falls back to no locking on platforms without fcntl or msvcrt.
+
+    Every key gets its own lock file: cached functions call other cached functions, so sharing lock files
+    between keys could deadlock a process on itself.
+    '''
+    lock_directory = os.path.join(directory, LOCK_DIRECTORY)
+    file_utils.mkdir(lock_directory)
+    filename = os.path.join(lock_directory, f'{key}.lock')
+    contended = False
+    while True:
+        lock_file = open(filename, 'a+b')
+        try:
+            contended = _lock(lock_file.fileno()) or contended
+        except BaseException:
+            lock_file.close()
+            raise
+        if _is_current(lock_file.fileno(), filename):
+            break
+        # remove_stale_locks deleted the file while we waited on it, so the lock is on the one that replaced it
+        _unlock(lock_file.fileno())
+        lock_file.close()
+
+    try:
+        yield contended
+    finally:
+        _unlock(lock_file.fileno())
+        lock_file.close()
+
+
+def remove_stale_locks(directory: str) -> int:
+    '''
+    Delete the lock files in a cache directory that no process holds, and return how many were deleted.
+    A lock file is only deleted while holding its lock, and file_lock checks the file it locked is still there,
+    so anyone waiting on a deleted lock file moves on to its replacement.
+    '''
+    lock_directory = os.path.join(directory, LOCK_DIRECTORY)
+    if not os.path.isdir(lock_directory):
+        return 0
+    removed = 0
+    for name in os.listdir(lock_directory):
+        if not name.endswith('.lock'):
+            continue
+        filename = os.path.join(lock_directory, name)
+        try:
+            # Not 'a+b', which would make the file again if it's deleted in the meantime
+            with open(filename, 'r+b') as lock_file:
+                if not _try_lock(lock_file.fileno()):
+                    continue
+                try:
+                    if _is_current(lock_file.fileno(), filename):
+                        file_utils.remove(filename)
+                        removed += 1
+                finally:
+                    _unlock(lock_file.fileno())
+        except OSError:
+            pass  # e.g. on Windows, where a file that's open can't be deleted
+    return removed
+
+
+def _is_current(fileno: int, filename: str) -> bool:
+    ''' Whether the open file is still the one at filename, i.e. it hasn't been deleted since it was opened '''
+    try:
+        return os.path.samestat(os.fstat(fileno), os.stat(filename))
+    except FileNotFoundError:
+        return False
+
+
+def _try_lock(fileno: int) -> bool:
+    ''' Lock without waiting. Returns whether the lock was taken, which is always without fcntl or msvcrt. '''
+    if fcntl is not None:
+        try:
+            fcntl.flock(fileno, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+    if msvcrt is not None:
+        try:
+            os.lseek(fileno, 0, os.SEEK_SET)
+            msvcrt.locking(fileno, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    return True
+
+
+def _lock(fileno: int) -> bool:
+    ''' Lock, waiting for whoever holds the lock. Returns whether it had to wait. '''
+    if _try_lock(fileno):
+        return False
+    if fcntl is not None:
+        fcntl.flock(fileno, fcntl.LOCK_EX)
+        return True
+    while not _try_lock(fileno):
+        time.sleep(0.1)
+    return True
+
+
+def _unlock(fileno: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fileno, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fileno, 0, os.SEEK_SET)
+        msvcrt.locking(fileno, msvcrt.LK_UNLCK, 1)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    '''
+    Deduplicates concurrent calls for the same key within a process: the first caller runs the function and every
+    caller that arrives while it is running waits for, and shares, its result (or exception).
+    '''
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any], share: Callable[[Any], Any] = lambda result: result) -> Any:
+        '''
+        Run func for key unless a call for key is already in flight. Waiting callers get share(result),
+        so the leader and the waiters don't end up holding the same mutable object.
+        '''
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return share(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,93 @@
+'''
+The pitch key: game_pk, at_bat_number and pitch_number name one pitch, whichever search, game or player query it
+came from.
+
+pitch_keys packs the three into one int64 per row, so finding duplicates or matching pitches across frames is a hash
+lookup on one column instead of a comparison of every column: dedupe drops repeated pitches, and upsert merges a newer
+fetch into older data, replacing the pitches it has again where they are and adding the rest.
+'''
+from typing import Optional, cast
+
+import numpy as np
+import pandas as pd
+
+from . import statcast_schema
+
+PITCH_KEY = ['game_pk', 'at_bat_number', 'pitch_number']
+
+# Bits for pitch_number and at_bat_number in a packed key, leaving game_pk 45 bits
+_PITCH_BITS = 8
+_AT_BAT_BITS = 10
+# Rows missing part of their key, which never match anything
+MISSING = -1
+
+
+def has_pitch_key(data: Optional[pd.DataFrame]) -> bool:
+    return data is not None and all(column in data.columns for column in PITCH_KEY)
+
+
+def pitch_keys(data: pd.DataFrame) -> pd.Index:
+    '''
+    Each row's pitch key as one int64, or MISSING where part of it is null. Keys that don't fit the packing (which
+    real Statcast data never has) fall back to a 64 bit hash of the three columns.
+    '''
+    parts = [pd.to_numeric(data[column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+             for column in PITCH_KEY]
+    missing = np.isnan(parts[0]) | np.isnan(parts[1]) | np.isnan(parts[2])
+    game_pk, at_bat_number, pitch_number = (np.where(missing, 0, part).astype('int64') for part in parts)
+
+    if (
+        (pitch_number < 0).any() or (pitch_number >= 1 << _PITCH_BITS).any()
+        or (at_bat_number < 0).any() or (at_bat_number >= 1 << _AT_BAT_BITS).any()
+        or (game_pk < 0).any() or (game_pk >= 1 << (63 - _PITCH_BITS - _AT_BAT_BITS)).any()
+    ):
+        keys = pd.util.hash_pandas_object(data[PITCH_KEY], index=False).to_numpy().view('int64')
+    else:
+        keys = (game_pk << (_PITCH_BITS + _AT_BAT_BITS)) | (at_bat_number << _PITCH_BITS) | pitch_number
+    return pd.Index(np.where(missing, MISSING, keys), dtype='int64')
+
+
+def _duplicated(keys: pd.Index, keep: str) -> np.ndarray:
+    # Rows missing their key are never duplicates of each other
+    return cast(np.ndarray, keys.duplicated(keep=keep) & (keys != MISSING))
+
+
+def dedupe(data: pd.DataFrame, keep: str = 'last') -> pd.DataFrame:
+    '''
+    data with each pitch only once: the last time it appears by default (the newest, when frames are concatenated
+    oldest first), or the first with keep='first'. Rows keep their order.
+    '''
+    if data is None or data.empty or not has_pitch_key(data):
+        return data
+    duplicated = _duplicated(pitch_keys(data), keep)
+    return data[~duplicated] if duplicated.any() else data
+
+
+def upsert(existing: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Merge a newer fetch into existing data: the pitches new has again replace their rows in existing, where they are,
+    and the pitches it adds come after. Where new has a pitch more than once, its last row wins; where existing
+    does, only its first row is kept.
+    '''
+    if existing is None or existing.empty or not has_pitch_key(existing):
+        return dedupe(new)
+    if new is None or new.empty or not has_pitch_key(new):
+        return existing
+
+    existing, new = dedupe(existing, keep='first'), dedupe(new)
+    existing_keys, new_keys = pitch_keys(existing), pitch_keys(new)
+    # Where each existing pitch is in new (-1 if it isn't), and which of new's pitches existing doesn't have
+    keyed = np.flatnonzero(new_keys != MISSING)
+    found = new_keys[keyed].get_indexer(existing_keys)
+    replacements = np.where(found >= 0, keyed[found], -1)
+    added = ~new_keys.isin(existing_keys) | (new_keys == MISSING)
+
+    order = np.concatenate([
+        np.where(replacements >= 0, len(existing) + replacements, np.arange(len(existing))),
+        len(existing) + np.flatnonzero(added),
+    ])
+    # Shallow copies, so evening out the categories doesn't change the caller's frames
+    frames = [existing.copy(deep=False), new.copy(deep=False)]
+    statcast_schema.union_categories(frames)
+    combined = pd.concat(frames, axis=0, ignore_index=True)
+    return combined.take(order).reset_index(drop=True)
@@ -0,0 +1,187 @@
+'''
+Derived Statcast features, computed over whole columns at once.
+
+add_features adds any of them to a Statcast frame in one pass: each input column is read once (as float64), every
+feature is worked out with NumPy over the whole column, and the new columns are added to the frame without copying the columns it already has. With chunk_size, the work is done
+that many rows at a time, which bounds the memory the intermediate arrays take on a multi-million-row frame.
+add_features_iter does the same for each frame of a stream, e.g. statcast_iter.
+
+The features:
+    spray_angle: the left-right angle of a batted ball, from its hit coordinates
+    adj_spray_angle: spray_angle with the sign flipped for left-handed batters, making it a push/pull angle
+    possible_imputation: whether a batted ball has one of the launch speed, launch angle and batted ball type
+        combinations TrackMan filled in for balls it didn't track (see https://tht.fangraphs.com/43416-2/)
+    spin: the movement due to the Magnus effect alone (Mx, Mz), and the spin axis (phi, theta), after Alan Nathan's
+        http://baseball.physics.illinois.edu/trackman/SpinAxis.pdf (see statcast_pitcher_spin)
+'''
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
+
+import numpy as np
+import pandas as pd
+
+K = .005383  # Environmental Constant
+DISTANCE_FROM_HOME_TO_MOUND = 60.5
+DISTANCE_TO_PLATE_AT_VELOCITY_CAPTURE = 50
+Y_VALUE_AT_FINAL_MEASUREMENT = 17/12
+GRAVITATIONAL_ACCELERATION = 32.174
+
+SPIN_COLUMNS = ('Mx', 'Mz', 'phi', 'theta')
+
+# The columns each feature adds
+FEATURES: Dict[str, Tuple[str, ...]] = {
+    'spray_angle': ('spray_angle',),
+    'adj_spray_angle': ('adj_spray_angle',),
+    'possible_imputation': ('possible_imputation',),
+    'spin': SPIN_COLUMNS,
+}
+
+# The columns each feature is worked out from
+_INPUTS: Dict[str, Tuple[str, ...]] = {
+    'spray_angle': ('hc_x', 'hc_y'),
+    'adj_spray_angle': ('hc_x', 'hc_y', 'stand'),
+    'possible_imputation': ('launch_speed', 'launch_angle', 'bb_type'),
+    'spin': ('release_extension', 'vx0', 'vy0', 'vz0', 'ax', 'ay', 'az', 'release_spin_rate'),
+}
+
+# (launch_speed, launch_angle, bb_type) TrackMan put in for batted balls it didn't track. For their derivation, see
+# pybaseball/EXAMPLES/imputed_derivation.ipynb. Hawk-Eye (from 2020) doesn't impute.
+_IMPUTED_BATTED_BALLS = [
+    (80.0, 69.0, 'popup'),
+    (89.2, 39.0, 'fly_ball'),
+    (102.8, 30.0, 'fly_ball'),
+    (90.4, 15.0, 'line_drive'),
+    (91.1, 18.0, 'line_drive'),
+    (82.9, -21.0, 'ground_ball'),
+    (90.3, -17.0, 'ground_ball'),
+]
+
+Features = Union[str, Iterable[str]]
+
+
+def _feature_names(features: Features) -> List[str]:
+    names = [features] if isinstance(features, str) else list(features)
+    unknown = [name for name in names if name not in FEATURES]
+    if unknown:
+        raise ValueError(f"Unknown features {', '.join(unknown)}. Choose from {', '.join(FEATURES)}")
+    return list(dict.fromkeys(names))
+
+
+def _floats(data: pd.DataFrame, column: str) -> np.ndarray:
+    return cast(np.ndarray, data[column].to_numpy(dtype='float64', na_value=np.nan))
+
+
+def _equals(values: pd.Series, value: str) -> np.ndarray:
+    # Compares codes, not strings, for a categorical
+    return cast(np.ndarray, (values == value).to_numpy(dtype=bool, na_value=False))
+
+
+def _spray_angle(hc_x: np.ndarray, hc_y: np.ndarray) -> np.ndarray:
+    return cast(np.ndarray, np.degrees(np.arctan((hc_x - 125.42) / (198.27 - hc_y))) * .75)
+
+
+def _possible_imputation(data: pd.DataFrame) -> np.ndarray:
+    # Rounded, so launch speeds that have been through float32 (e.g. 89.2 as 89.19999694) still match
+    launch_speed = np.round(_floats(data, 'launch_speed'), 1)
+    launch_angle = np.round(_floats(data, 'launch_angle'), 1)
+    bb_types = {bb_type: _equals(data['bb_type'], bb_type) for _, _, bb_type in _IMPUTED_BATTED_BALLS}
+    flags = np.zeros(len(data), dtype=bool)
+    for speed, angle, bb_type in _IMPUTED_BATTED_BALLS:
+        flags |= (launch_speed == speed) & (launch_angle == angle) & bb_types[bb_type]
+    return flags
+
+
+def _time_duration(s: np.ndarray, v: np.ndarray, acc: np.ndarray, adj: float, forward: bool) -> np.ndarray:
+    return cast(np.ndarray, (-v - np.sqrt(v**2 - 2*acc*((1 if forward else -1) * (s-adj)))) / acc)
+
+
+def _spin(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    ''' Mx, Mz, phi and theta, as statcast_pitcher_spin.find_intermediate_values works them out '''
+    extension, vx0, vy0, vz0, ax, ay, az, spin_rate = (_floats(data, column) for column in _INPUTS['spin'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        y_release = DISTANCE_FROM_HOME_TO_MOUND - extension
+        t_release = _time_duration(y_release, vy0, ay, DISTANCE_TO_PLATE_AT_VELOCITY_CAPTURE, False)
+        vx_release, vy_release, vz_release = vx0 + ax*t_release, vy0 + ay*t_release, vz0 + az*t_release
+        flight_time = _time_duration(y_release, vy_release, ay, Y_VALUE_AT_FINAL_MEASUREMENT, True)
+
+        vxbar = (2*vx_release + ax*flight_time)/2
+        vybar = (2*vy_release + ay*flight_time)/2
+        vzbar = (2*vz_release + az*flight_time)/2
+        vbar = np.sqrt(vxbar**2 + vybar**2 + vzbar**2)
+        adrag = -(ax*vxbar + ay*vybar + (az + GRAVITATIONAL_ACCELERATION)*vzbar) / vbar
+
+        amagx = ax + adrag*vxbar/vbar
+        amagy = ay + adrag*vybar/vbar
+        amagz = az + adrag*vzbar/vbar + GRAVITATIONAL_ACCELERATION
+        amag = np.sqrt(amagx**2 + amagy**2 + amagz**2)
+
+        angle = np.degrees(np.arctan2(amagz, amagx))
+        phi = np.round(np.where(amagz > 0, angle, 360 + angle) + 90)
+
+        lift_coefficient = amag / (K*vbar**2)
+        spin_factor = 0.166*np.log(0.336/(0.336 - lift_coefficient))
+        spin_efficiency = 78.92*spin_factor*vbar / spin_rate
+        in_range = (spin_efficiency >= -1.0) & (spin_efficiency <= 1.0)
+        theta = np.where(in_range, np.round(np.degrees(np.arccos(np.where(in_range, spin_efficiency, 0)))), np.nan)
+
+    return {'Mx': 6*amagx*flight_time**2, 'Mz': 6*amagz*flight_time**2, 'phi': phi, 'theta': theta}
+
+
+def _compute(data: pd.DataFrame, names: List[str]) -> Dict[str, np.ndarray]:
+    values: Dict[str, np.ndarray] = {}
+    if 'spray_angle' in names or 'adj_spray_angle' in names:
+        spray_angle = _spray_angle(_floats(data, 'hc_x'), _floats(data, 'hc_y'))
+        if 'spray_angle' in names:
+            values['spray_angle'] = spray_angle
+        if 'adj_spray_angle' in names:
+            values['adj_spray_angle'] = np.where(_equals(data['stand'], 'L'), -spray_angle, spray_angle)
+    if 'possible_imputation' in names:
+        values['possible_imputation'] = _possible_imputation(data)
+    if 'spin' in names:
+        values.update(_spin(data))
+    return values
+
+
+def _column(name: str, values: np.ndarray) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    if name == 'phi':
+        # Whole degrees, and null where there's no pitch to work it out from
+        missing = np.isnan(values)
+        return pd.arrays.IntegerArray(np.where(missing, 0, values).astype('int16'), missing)
+    return values
+
+
+def add_features(data: pd.DataFrame, features: Features = tuple(FEATURES), chunk_size: Optional[int] = None,
+                 inplace: bool = False) -> pd.DataFrame:
+    '''
+    data with the columns of features added (all of them by default): any of 'spray_angle', 'adj_spray_angle',
+    'possible_imputation' and 'spin' (Mx, Mz, phi and theta). Columns they add that data already has are replaced.
+
+    The columns data has aren't copied: the result shares them with data, or with inplace=True, the columns are
+    added to data itself. With chunk_size, the features are worked out chunk_size rows at a time.
+    '''
+    names = _feature_names(features)
+    missing = [column for name in names for column in _INPUTS[name] if column not in data.columns]
+    if missing:
+        raise ValueError(f"Missing the columns {', '.join(dict.fromkeys(missing))} needed for {', '.join(names)}")
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+    if chunk_size is None or len(data) <= chunk_size:
+        values = _compute(data, names)
+    else:
+        chunks = [_compute(data.iloc[start:start + chunk_size], names) for start in range(0, len(data), chunk_size)]
+        values = {column: np.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0]}
+
+    result = data if inplace else data.copy(deep=False)
+    for name in names:
+        for column in FEATURES[name]:
+            result[column] = _column(column, values[column])
+    return result
+
+
+def add_features_iter(dataframes: Iterable[pd.DataFrame], features: Features = tuple(FEATURES),
+                      chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    ''' add_features for each frame of a stream (e.g. statcast_iter), as it comes '''
+    names = _feature_names(features)
+    for data in dataframes:
+        # An empty chunk may not have any columns to work from
+        yield data if data.empty else add_features(data, names, chunk_size=chunk_size, inplace=True)
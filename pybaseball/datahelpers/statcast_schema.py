@@ -0,0 +1,174 @@
+'''
+The declared schema of Baseball Savant's pitch-level Statcast data.
+
+Parsed as-is, a season of Statcast is several GB in pandas: every string is a Python object, and every number is
+64 bits wide. apply_schema stores the low-cardinality strings as categoricals with stable categories, integers in the
+narrowest nullable integer type that holds them, and game_date as datetime64. Measurements stay float64 (see FLOAT64),
+since they can't be narrowed without losing precision. Columns not declared here (e.g. ones Savant adds later) are
+left as they are.
+
+to_raw_dtypes converts a typed frame back to the dtypes the CSV parser returns.
+'''
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+TEAMS = [
+    'ARI', 'ATH', 'ATL', 'AZ', 'BAL', 'BOS', 'CHC', 'CIN', 'CLE', 'COL', 'CWS', 'DET', 'HOU', 'KC', 'LAA', 'LAD', 'MIA',
+    'MIL', 'MIN', 'NYM', 'NYY', 'OAK', 'PHI', 'PIT', 'SD', 'SEA', 'SF', 'STL', 'TB', 'TEX', 'TOR', 'WSH'
+]
+
+# Values outside of these are kept, as extra categories after the declared ones
+CATEGORIES: Dict[str, List[str]] = {
+    'pitch_type': [
+        'AB', 'CH', 'CS', 'CU', 'EP', 'FA', 'FC', 'FF', 'FO', 'FS', 'FT', 'IN', 'KC', 'KN', 'PO', 'SC', 'SI', 'SL',
+        'ST', 'SV', 'UN'
+    ],
+    'pitch_name': [
+        '2-Seam Fastball', '4-Seam Fastball', 'Changeup', 'Curveball', 'Cutter', 'Eephus', 'Fastball', 'Forkball',
+        'Intentional Ball', 'Knuckle Ball', 'Knuckle Curve', 'Other', 'Pitch Out', 'Screwball', 'Sinker', 'Slider',
+        'Slow Curve', 'Slurve', 'Split-Finger', 'Sweeper'
+    ],
+    'events': [
+        'batter_interference', 'catcher_interf', 'caught_stealing_2b', 'caught_stealing_3b', 'caught_stealing_home',
+        'double', 'double_play', 'ejection', 'fan_interference', 'field_error', 'field_out', 'fielders_choice',
+        'fielders_choice_out', 'force_out', 'game_advisory', 'grounded_into_double_play', 'hit_by_pitch', 'home_run',
+        'intent_walk', 'other_advance', 'other_out', 'passed_ball', 'pickoff_1b', 'pickoff_2b', 'pickoff_3b',
+        'pickoff_caught_stealing_2b', 'pickoff_caught_stealing_3b', 'pickoff_caught_stealing_home',
+        'runner_double_play', 'sac_bunt', 'sac_bunt_double_play', 'sac_fly', 'sac_fly_double_play', 'single',
+        'stolen_base_2b', 'stolen_base_3b', 'stolen_base_home', 'strikeout', 'strikeout_double_play', 'triple',
+        'triple_play', 'truncated_pa', 'walk', 'wild_pitch'
+    ],
+    'description': [
+        'automatic_ball', 'automatic_strike', 'ball', 'blocked_ball', 'bunt_foul_tip', 'called_strike', 'foul',
+        'foul_bunt', 'foul_pitchout', 'foul_tip', 'hit_by_pitch', 'hit_into_play', 'hit_into_play_no_out',
+        'hit_into_play_score', 'intent_ball', 'missed_bunt', 'pitchout', 'swinging_pitchout', 'swinging_strike',
+        'swinging_strike_blocked'
+    ],
+    'bb_type': ['fly_ball', 'ground_ball', 'line_drive', 'popup'],
+    'game_type': ['A', 'D', 'E', 'F', 'L', 'R', 'S', 'W'],
+    'stand': ['L', 'R'],
+    'p_throws': ['L', 'R'],
+    'type': ['B', 'S', 'X'],
+    'inning_topbot': ['Bot', 'Top'],
+    'home_team': TEAMS,
+    'away_team': TEAMS,
+    'if_fielding_alignment': ['Infield shade', 'Infield shift', 'Standard', 'Strategic'],
+    'of_fielding_alignment': ['4th outfielder', 'Extreme outfield shift', 'Standard', 'Strategic'],
+}
+
+INTEGERS: Dict[str, str] = {
+    **{column: 'Int8' for column in [
+        'balls', 'strikes', 'outs_when_up', 'inning', 'pitch_number', 'zone', 'hit_location', 'launch_speed_angle',
+        'woba_denom', 'babip_value', 'iso_value', 'home_score', 'away_score', 'bat_score', 'fld_score',
+        'post_home_score', 'post_away_score', 'post_bat_score', 'post_fld_score', 'home_score_diff', 'bat_score_diff',
+        'n_thruorder_pitcher', 'n_priorpa_thisgame_player_at_bat', 'age_pit', 'age_bat', 'age_pit_legacy',
+        'age_bat_legacy', 'strikes_after', 'balls_after', 'outs_after',
+    ]},
+    **{column: 'Int16' for column in [
+        'game_year', 'at_bat_number', 'hit_distance_sc', 'launch_angle', 'release_spin_rate', 'spin_axis',
+        'pitcher_days_since_prev_game', 'batter_days_since_prev_game', 'pitcher_days_until_next_game',
+        'batter_days_until_next_game',
+    ]},
+    **{column: 'Int32' for column in [
+        'game_pk', 'batter', 'pitcher', 'on_1b', 'on_2b', 'on_3b', 'fielder_2', 'fielder_3', 'fielder_4', 'fielder_5',
+        'fielder_6', 'fielder_7', 'fielder_8', 'fielder_9', 'pitcher.1', 'fielder_2.1',
+    ]},
+}
+
+# Measurements Savant reports with a couple of decimals. float32 can't hold those exactly (95.1 would be 95.0999985,
+# which isin, merges and comparisons against an untyped parse miss), so they're kept as float64. A float32 column
+# (e.g. in a day stored by an earlier version) goes back to float64 through its shortest decimal representation.
+FLOAT64: List[str] = [
+    'release_speed', 'release_pos_x', 'release_pos_y', 'release_pos_z', 'pfx_x', 'pfx_z', 'plate_x', 'plate_z',
+    'hc_x', 'hc_y', 'sz_top', 'sz_bot', 'launch_speed', 'effective_speed', 'release_extension', 'woba_value',
+    'bat_speed', 'swing_length', 'arm_angle', 'api_break_z_with_gravity', 'api_break_x_arm', 'api_break_x_batter_in',
+    'hyper_speed',
+]
+
+DATES: List[str] = ['game_date']
+
+
+def apply_schema(data: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Convert the declared columns of a Statcast frame to their compact dtypes, in place, and return it.
+    A column whose values don't fit its declared dtype is left as it is, and one that already has it isn't copied.
+    '''
+    for column in data.columns.intersection(list(CATEGORIES)):
+        data[column] = _categorical(data[column], CATEGORIES[column])
+    for column in data.columns.intersection(list(INTEGERS)):
+        if str(data[column].dtype) == INTEGERS[column]:
+            continue
+        try:
+            data[column] = data[column].astype(INTEGERS[column])
+        except:  # pylint: disable=bare-except
+            continue
+    for column in data.columns.intersection(FLOAT64):
+        if data[column].dtype == np.float64:
+            continue
+        try:
+            values = data[column].astype(str) if data[column].dtype == np.float32 else data[column]
+            data[column] = values.astype(np.float64)
+        except:  # pylint: disable=bare-except
+            continue
+    for column in data.columns.intersection(DATES):
+        if pd.api.types.is_datetime64_dtype(data[column].dtype):
+            continue
+        try:
+            data[column] = pd.to_datetime(data[column], format='%Y-%m-%d')
+        except:  # pylint: disable=bare-except
+            continue
+    return data
+
+
+def _categorical(values: pd.Series, categories: List[str]) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        extra = set(values.cat.categories) - set(categories)
+        if list(values.cat.categories) == categories + sorted(extra):
+            return values
+        return values.cat.set_categories(categories + sorted(extra))
+    extra = set(values.dropna().unique()) - set(categories)
+    return pd.Categorical(values, categories=categories + sorted(extra, key=str))
+
+
+def union_categories(dataframes: Iterable[pd.DataFrame]) -> None:
+    '''
+    Give every categorical column the same categories across all of dataframes, in place, so they concatenate into
+    a categorical instead of falling back to object.
+    '''
+    dataframes = list(dataframes)
+    columns = {
+        column for data in dataframes
+        for column, dtype in data.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)
+    }
+    for column in columns:
+        series = [data[column] for data in dataframes if column in data.columns]
+        if not all(isinstance(values.dtype, pd.CategoricalDtype) for values in series):
+            continue
+        categories = list(series[0].cat.categories)
+        seen = set(categories)
+        for values in series[1:]:
+            extra = [category for category in values.cat.categories if category not in seen]
+            categories += extra
+            seen.update(extra)
+        for data in dataframes:
+            if column in data.columns and list(data[column].cat.categories) != categories:
+                data[column] = data[column].cat.set_categories(categories)
+
+
+def to_raw_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Convert a frame with the compact schema back to the dtypes the CSV parser returns: objects for strings,
+    int64 (or float64 if there are nulls) for integers and float64 for floats. float32 columns go through their
+    shortest decimal representation, so 82.1 comes back as 82.1 rather than 82.0999984.
+    '''
+    data = data.copy()
+    for column, dtype in data.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            data[column] = data[column].astype(object).where(data[column].notna(), np.nan)
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_integer_dtype(dtype):
+            data[column] = data[column].astype('float64' if data[column].hasnans else 'int64')
+        elif dtype == np.float32:
+            data[column] = data[column].astype(str).astype(np.float64)
+    return data
@@ -1,6 +1,7 @@
-import numpy as np
 import pandas as pd
 
+from . import statcast_features
+
 
 def add_spray_angle(raw_df: pd.DataFrame, adjusted: bool = False) -> pd.DataFrame:
     """Adds spray angle and adjusted spray angle to StatCast DataFrames
@@ -13,13 +14,6 @@ def add_spray_angle(raw_df: pd.DataFrame, adjusted: bool = False) -> pd.DataFram
         pd.DataFrame: Input dataframe with spray angle columns appended
     """
 
-    df = raw_df.copy()
-
-    df["spray_angle"] = np.arctan((df["hc_x"] - 125.42) / (198.27 - df["hc_y"])) * 180 / np.pi * .75
     if adjusted:
-        df["adj_spray_angle"] = df.apply(
-            lambda row: -row["spray_angle"] if row["stand"] == "L" else row["spray_angle"],
-            axis=1
-        )
-        df = df.drop(["spray_angle"], axis=1)
-    return df
+        return statcast_features.add_features(raw_df, 'adj_spray_angle')
+    return statcast_features.add_features(raw_df, 'spray_angle')
@@ -0,0 +1,158 @@
+import asyncio
+import concurrent.futures
+import random
+import threading
+from types import TracebackType
+from typing import Any, Awaitable, Coroutine, Dict, Optional, Type, TypeVar, cast
+from urllib.parse import urlparse
+
+from curl_cffi import requests
+
+from . import rate_limit
+
+T = TypeVar('T')
+
+# Baseball Savant starts dropping connections well before this, but it keeps a full season pull busy
+DEFAULT_MAX_CONCURRENCY_PER_HOST = 8
+# A week of league-wide Statcast can take Savant a minute to build
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 30.0
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class AsyncHTTPError(Exception):
+    pass
+
+
+def backoff_delay(attempt: int, backoff: float = DEFAULT_BACKOFF, max_backoff: float = MAX_BACKOFF) -> float:
+    '''
+    Exponential backoff with full jitter: a random delay between 0 and backoff * 2 ** attempt, capped at max_backoff.
+    The jitter keeps a batch of requests that failed together from retrying together.
+    '''
+    return random.uniform(0, min(max_backoff, backoff * 2 ** attempt))
+
+
+class AsyncFetcher:
+    '''
+    An asyncio HTTP client for bulk downloads: one pooled session for every request, at most max_concurrency requests
+    in flight per host, a timeout on every request, and retries with jittered exponential backoff on connection
+    errors, timeouts and 429/5xx responses.
+
+    Use it as an async context manager, so the session is opened and closed on the running event loop:
+
+        async with AsyncFetcher() as fetcher:
+            content = await fetcher.get(url)
+    '''
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY_PER_HOST, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, backoff: float = DEFAULT_BACKOFF):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if retries < 0:
+            raise ValueError(f"retries must be zero or more, got {retries}")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._session: Optional[requests.AsyncSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def __aenter__(self) -> 'AsyncFetcher':
+        self._session = requests.AsyncSession(max_clients=self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                        traceback: Optional[TracebackType]) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[host]
+
+    async def get(self, url: str, **kwargs: Any) -> bytes:
+        ''' GET url and return the response body, retrying transient failures '''
+        assert self._session is not None, "AsyncFetcher must be used as an async context manager"
+        bucket = rate_limit.limiter(url)
+        attempt = 0
+        while True:
+            # Every attempt counts against the host's rate limit, retries included
+            if bucket is not None:
+                await bucket.acquire_async()
+            try:
+                async with self._semaphore(url):
+                    response = await self._session.get(url, timeout=self.timeout, **kwargs)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return cast(bytes, response.content)
+                error: Exception = AsyncHTTPError(f"HTTP {response.status_code} from {url}")
+            except requests.exceptions.HTTPError:
+                raise
+            except requests.exceptions.RequestException as ex:
+                error = ex
+
+            if attempt >= self.retries:
+                raise AsyncHTTPError(f"Failed to get {url} after {attempt + 1} attempts") from error
+            await asyncio.sleep(backoff_delay(attempt, self.backoff))
+            attempt += 1
+
+
+def run(coroutine: Awaitable[T]) -> T:
+    '''
+    Run a coroutine to completion from synchronous code.
+
+    If this thread already has a running event loop (e.g. in a Jupyter notebook), the coroutine runs on a new loop in
+    a worker thread instead, since a running loop can't be re-entered.
+    '''
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)  # type: ignore
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()  # type: ignore
+
+
+class EventLoopThread:
+    '''
+    An event loop running in a daemon thread, so synchronous code (e.g. a generator) can keep coroutines running
+    between its own steps:
+
+        with EventLoopThread() as loop_thread:
+            future = loop_thread.submit(fetcher.get(url))
+            ...
+            content = future.result()
+
+    Anything still running on exit is cancelled.
+    '''
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='pybaseball-event-loop', daemon=True)
+
+    def __enter__(self) -> 'EventLoopThread':
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        self.submit(self._cancel_pending()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def submit(self, coroutine: Coroutine[Any, Any, T]) -> 'concurrent.futures.Future[T]':
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    async def _cancel_pending(self) -> None:
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
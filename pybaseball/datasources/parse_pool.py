@@ -0,0 +1,124 @@
+'''
+An optional pool of worker processes for parsing Statcast responses.
+
+By default a response is parsed (and typed) in a thread next to the downloads, which is plenty until the network is
+fast enough that a big pull waits on parsing, which holds the GIL for much of its time. With the pool configured,
+each response's bytes go to a worker process instead, and its frame comes back as an Arrow IPC buffer, which is one
+contiguous copy per column instead of a pickled DataFrame.
+
+Workers are spawned, so they import the __main__ module. A notebook, the interactive interpreter or `python -c` has
+no __main__ file to import, so there the pool stays off and responses are parsed in threads as before. A script
+using the pool should start it under `if __name__ == '__main__':`, as for any process pool.
+'''
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+import sys
+import threading
+import warnings
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+_NO_MAIN_WARNING = '''Parsing in worker processes needs a __main__ module they can import, which notebooks, the \
+interactive interpreter and `python -c` don't have. Responses will be parsed in threads instead.'''
+
+_BROKEN_WARNING = '''A parsing worker process died, so responses will be parsed in threads from now on. If this is a \
+script, start the query under `if __name__ == '__main__':`.'''
+
+_lock = threading.Lock()
+# How many workers to parse with, or None to parse in threads
+_processes: Optional[int] = None
+_executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def processes_available() -> bool:
+    ''' Whether worker processes can be spawned: only if __main__ is a file they can import '''
+    main = sys.modules.get('__main__')
+    return main is not None and getattr(main, '__file__', None) is not None
+
+
+def configure(processes: Optional[int] = None) -> bool:
+    '''
+    Parse Statcast responses in processes worker processes (defaults to one per CPU), started on the first response.
+    Returns whether the pool is on: without a __main__ module to import it warns, and responses are still parsed
+    in threads.
+    '''
+    global _processes
+    if processes is not None and processes < 1:
+        raise ValueError(f"processes must be at least 1, got {processes}")
+    disable()
+    if not processes_available():
+        warnings.warn(_NO_MAIN_WARNING)
+        return False
+    with _lock:
+        _processes = processes or os.cpu_count() or 1
+    return True
+
+
+def disable() -> None:
+    ''' Go back to parsing in threads, shutting down the workers '''
+    global _processes, _executor
+    with _lock:
+        executor, _executor, _processes = _executor, None, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def enabled() -> bool:
+    return _processes is not None
+
+
+def _get_executor() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    global _executor
+    with _lock:
+        if _processes is not None and _executor is None:
+            _executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=_processes, mp_context=multiprocessing.get_context('spawn')
+            )
+        return _executor
+
+
+def to_arrow(data: Optional[pd.DataFrame]) -> Optional[pa.Buffer]:
+    ''' A frame as an Arrow IPC stream, with the pandas metadata that gives its dtypes back '''
+    if data is None:
+        return None
+    table = pa.Table.from_pandas(data)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def from_arrow(buffer: Optional[pa.Buffer]) -> Optional[pd.DataFrame]:
+    if buffer is None:
+        return None
+    return pa.ipc.open_stream(buffer).read_all().to_pandas()
+
+
+def _parse_to_arrow(parse: Callable[..., Optional[pd.DataFrame]], *args: Any) -> Optional[pa.Buffer]:
+    # Runs in a worker
+    return to_arrow(parse(*args))
+
+
+async def run_async(parse: Callable[..., Optional[pd.DataFrame]], *args: Any) -> Optional[pd.DataFrame]:
+    '''
+    parse(*args) off the event loop: in a worker process if the pool is configured, otherwise in a thread of the
+    loop's default executor. parse has to be a module level function, so a worker can import it, and whatever it
+    raises is raised here.
+    '''
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    if executor is not None:
+        try:
+            buffer = await loop.run_in_executor(executor, _parse_to_arrow, parse, *args)
+            # Turning the buffer back into a frame is cheap, but not so cheap it should hold up the downloads
+            return await loop.run_in_executor(None, from_arrow, buffer)
+        except BrokenProcessPool:
+            if enabled():
+                warnings.warn(_BROKEN_WARNING)
+                disable()
+    return await loop.run_in_executor(None, parse, *args)
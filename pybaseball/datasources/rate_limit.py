@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from .. import cache
+from ..cache import single_flight
+
+SAVANT_HOST = 'baseballsavant.mlb.com'
+# Well inside what Savant tolerates, and more than a full speed statcast() of 8 concurrent requests needs
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+
+
+class RateLimitStats:
+    ''' How many requests went through a rate limiter, and how long they waited for it '''
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        self.requests += 1
+        if wait > 0:
+            self.waited += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+    def __repr__(self) -> str:
+        return (f'RateLimitStats(requests={self.requests}, waited={self.waited}, total_wait={self.total_wait:.3f}, '
+                f'mean_wait={self.mean_wait:.3f}, max_wait={self.max_wait:.3f})')
+
+
+class TokenBucket:
+    '''
+    A token bucket rate limiter: each request takes a token, and tokens come back at rate per second, up to burst.
+    A request that finds the bucket empty reserves the next token and waits for it, so requests queue up in the
+    order they asked instead of failing.
+
+    With a directory, the bucket lives in a file there, under a file lock, so every process given the same directory
+    shares one bucket (and one rate). Otherwise it's shared by the threads and event loops of this process.
+    '''
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, directory: Optional[str] = None,
+                 name: str = 'savant'):
+        if rate <= 0:
+            raise ValueError(f"rate must be more than zero, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.directory = directory
+        self.name = name
+        self.stats = RateLimitStats()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def _key(self) -> str:
+        return f'rate_limit-{self.name}'
+
+    def _take(self, tokens: float, elapsed: float) -> Tuple[float, float]:
+        ''' Refill for elapsed seconds and take a token. Returns the tokens left (negative if reserved) and the wait '''
+        tokens = min(float(self.burst), tokens + max(elapsed, 0.0) * self.rate) - 1
+        return tokens, max(0.0, -tokens / self.rate)
+
+    def _reserve(self) -> float:
+        ''' Take a token, or reserve the next free one. Returns how long to wait before using it '''
+        with self._lock:
+            if self.directory is None:
+                now = time.monotonic()
+                self._tokens, wait = self._take(self._tokens, now - self._updated)
+                self._updated = now
+                return wait
+
+            # Across processes, so the clock has to be the wall clock
+            with single_flight.file_lock(self.directory, self._key):
+                state_filename = os.path.join(self.directory, single_flight.LOCK_DIRECTORY, f'{self._key}.json')
+                now = time.time()
+                try:
+                    with open(state_filename) as state_file:
+                        state = json.load(state_file)
+                    tokens, updated = float(state['tokens']), float(state['updated'])
+                except (OSError, ValueError, KeyError):
+                    tokens, updated = float(self.burst), now
+                tokens, wait = self._take(tokens, now - updated)
+                with open(state_filename, 'w') as state_file:
+                    json.dump({'tokens': tokens, 'updated': now}, state_file)
+                return wait
+
+    def _record(self, wait: float) -> None:
+        with self._lock:
+            self.stats.record(wait)
+
+    def acquire(self) -> float:
+        ''' Wait for a token. Returns how long that took '''
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        self._record(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        ''' Wait for a token without blocking the event loop. Returns how long that took '''
+        if self.directory is None:
+            wait = self._reserve()
+        else:
+            # Taking the file lock can block on another process
+            wait = await asyncio.get_running_loop().run_in_executor(None, self._reserve)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(wait)
+        return wait
+
+
+_limiters: Dict[str, TokenBucket] = {SAVANT_HOST: TokenBucket()}
+
+
+def configure(rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, shared: bool = False,
+              directory: Optional[str] = None, host: str = SAVANT_HOST) -> TokenBucket:
+    '''
+    Set the rate limit for every request to a host (Baseball Savant by default).
+
+    rate : float : sustained requests per second
+    burst : int : how many requests can go at once after a quiet spell
+    shared : bool : share the limit with every other process doing the same, through a file lock in directory
+        (the cache directory by default)
+    '''
+    if shared and directory is None:
+        directory = cache.config.cache_directory
+    _limiters[host] = TokenBucket(rate, burst, directory=directory if shared else None, name=host.replace('.', '_'))
+    return _limiters[host]
+
+
+def disable(host: str = SAVANT_HOST) -> None:
+    ''' Stop rate limiting requests to a host '''
+    _limiters.pop(host, None)
+
+
+def limiter(url: str) -> Optional[TokenBucket]:
+    ''' The rate limiter for url's host, if it has one '''
+    return _limiters.get(urlparse(url).netloc)
+
+
+def stats(host: str = SAVANT_HOST) -> Optional[RateLimitStats]:
+    ''' How long requests to host have waited for the rate limit, since it was configured '''
+    bucket = _limiters.get(host)
+    return bucket.stats if bucket is not None else None
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    ''' requests.get, waiting for the rate limit of url's host first '''
+    bucket = limiter(url)
+    if bucket is not None:
+        bucket.acquire()
+    return requests.get(url, **kwargs)
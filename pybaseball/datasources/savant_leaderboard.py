@@ -0,0 +1,106 @@
+import concurrent.futures
+import io
+import numbers
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import attr
+import pandas as pd
+
+from .. import cache
+from ..utils import sanitize_statcast_columns
+from . import rate_limit
+from .statcast import ROOT_URL
+
+# Enough to have a decade of a leaderboard in flight at once; the rate limiter keeps it polite
+DEFAULT_MAX_WORKERS = 8
+
+# Columns Savant's leaderboards share, typed the same way on every board that has them
+LEADERBOARD_DTYPES: Dict[str, str] = {
+    'year': 'Int16',
+    'player_id': 'Int32',
+    'entity_id': 'Int32',
+    'team_id': 'Int16',
+}
+
+# A season (as an int or a string, like the year argument always took), or several
+Years = Union[int, str, Iterable[int]]
+
+
+@cache.df_cache()
+def _leaderboard_csv(url: str) -> pd.DataFrame:
+    ''' One season of a leaderboard, as Baseball Savant sends it '''
+    content = rate_limit.get(url, timeout=None).content.decode('utf-8')
+    if '<html' in content[:1000].lower():
+        # Savant sends a web page instead of a CSV for a season the leaderboard doesn't have
+        return pd.DataFrame()
+    return pd.read_csv(io.StringIO(content))
+
+
+@attr.s(frozen=True, kw_only=True)
+class SavantLeaderboard:
+    '''
+    A Baseball Savant leaderboard that downloads as CSV, one season at a time.
+
+    path: the CSV download's path, with {year} and the leaderboard's own parameters as format fields
+    sanitize: whether to strip the column names (see sanitize_statcast_columns)
+    drop_null: a column that's only null on rows that aren't players (e.g. a league average row), which are dropped
+    '''
+    path: str = attr.ib()
+    sanitize: bool = attr.ib(default=True)
+    drop_null: Optional[str] = attr.ib(default=None)
+
+    def url(self, year: int, **params: Any) -> str:
+        return f'{ROOT_URL}/{self.path.format(year=year, **params)}'
+
+    def _postprocess(self, data: pd.DataFrame) -> pd.DataFrame:
+        if data.empty:
+            return data
+        if self.sanitize:
+            data = sanitize_statcast_columns(data)
+        if self.drop_null is not None:
+            data = data.loc[data[self.drop_null].notna()].reset_index(drop=True)
+        for column, dtype in LEADERBOARD_DTYPES.items():
+            if column in data.columns and pd.api.types.is_numeric_dtype(data[column]):
+                data[column] = data[column].astype(dtype)
+        return data
+
+    def fetch_years(self, years: Iterable[int], max_workers: int = DEFAULT_MAX_WORKERS,
+                    **params: Any) -> Dict[int, pd.DataFrame]:
+        '''
+        Each of years' leaderboard, fetched concurrently. Every season is cached on its own, so a later query for
+        an overlapping range only fetches the seasons it doesn't have yet.
+        '''
+        years = list(dict.fromkeys(int(year) for year in years))
+        if not years:
+            return {}
+        urls = [self.url(year, **params) for year in years]
+        if len(years) == 1:
+            frames = [_leaderboard_csv(urls[0])]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(years))) as executor:
+                frames = list(executor.map(_leaderboard_csv, urls))
+        return {year: self._postprocess(data) for year, data in zip(years, frames)}
+
+    def fetch(self, years: Years, max_workers: int = DEFAULT_MAX_WORKERS, **params: Any) -> pd.DataFrame:
+        '''
+        The leaderboard for a season, or for several (a list or range of years) in one frame with a year column,
+        in the order given.
+        '''
+        if isinstance(years, (int, str, numbers.Integral)):
+            return self.fetch_years([int(years)], max_workers, **params)[int(years)]
+        return combine_years(self.fetch_years(years, max_workers, **params))
+
+
+def combine_years(frames: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+    ''' Several seasons of a leaderboard in one frame, each row labeled with its season '''
+    labeled: List[pd.DataFrame] = []
+    for year, data in frames.items():
+        if data.empty:
+            continue
+        if 'year' not in data.columns:
+            data = data.copy()
+            data.insert(0, 'year', pd.Series(year, index=data.index, dtype=LEADERBOARD_DTYPES['year']))
+        labeled.append(data)
+    if not labeled:
+        return pd.DataFrame()
+    return pd.concat(labeled, axis=0, ignore_index=True)
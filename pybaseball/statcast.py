@@ -1,105 +1,400 @@
-import concurrent.futures
+import asyncio
 import warnings
-from datetime import date
-from typing import Optional, Union
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 from tqdm import tqdm
 
 import pybaseball.datasources.statcast as statcast_ds
 
-from . import cache
-from .utils import sanitize_date_range, statcast_date_range
+from . import cache, statcast_calendar, statcast_job, statcast_planner, statcast_store
+from .datahelpers import pitch_key, statcast_schema
+from .datasources import async_http, parse_pool
+from .statcast_filters import StatcastFilter
+from .utils import sanitize_date_range
 
 _SC_SINGLE_GAME_REQUEST = "/statcast_search/csv?all=true&type=details&game_pk={game_pk}"
 # pylint: disable=line-too-long
 _SC_SMALL_REQUEST = "/statcast_search/csv?all=true&hfPT=&hfAB=&hfBBT=&hfPR=&hfZ=&stadium=&hfBBL=&hfNewZones=&hfGT=R%7CPO%7CS%7C=&hfSea=&hfSit=&player_type=pitcher&hfOuts=&opponent=&pitcher_throws=&batter_stands=&hfSA=&game_date_gt={start_dt}&game_date_lt={end_dt}&team={team}&position=&hfRO=&home_road=&hfFlag=&metric_1=&hfInn=&min_pitches=0&min_results=0&group_by=name&sort_col=pitches&player_event_sort=h_launch_speed&sort_order=desc&min_abs=0&type=details&"
-# _MAX_SC_RESULTS = 40000
+
+_SORT_COLUMNS = ['game_date', 'game_pk', 'at_bat_number', 'pitch_number']
+
+_TRUNCATED_WARNING = "Statcast data for {day} hit Baseball Savant's row limit and may be incomplete"
+
+# Learned pitches per day, kept for the life of the process so later queries plan better windows
+_planners: Dict[Optional[str], statcast_planner.ChunkPlanner] = {}
 
 class StatcastException(Exception):
     pass
 
-@cache.df_cache(expires=365)
-def _small_request(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
-    data = statcast_ds.get_statcast_data_from_csv_url(
-        _SC_SMALL_REQUEST.format(start_dt=str(start_dt), end_dt=str(end_dt), team=team if team else '')
-    )
+
+def _small_request_url(start_dt: date, end_dt: date, team: Optional[str] = None,
+                       filters: Optional[StatcastFilter] = None) -> str:
+    url = filters.apply(_SC_SMALL_REQUEST) if filters is not None else _SC_SMALL_REQUEST
+    return url.format(start_dt=str(start_dt), end_dt=str(end_dt), team=team if team else '')
+
+
+def _partition(team: Optional[str] = None, filters: Optional[StatcastFilter] = None) -> Optional[str]:
+    '''
+    What a query's data is stored and planned under: the team (or None for the whole league), plus the filter for
+    a filtered query, since its days hold only part of the pitches
+    '''
+    if filters is None or not filters.key:
+        return team
+    return f'{team or statcast_store.ALL_TEAMS}-{filters.key}'
+
+
+def _partition_kind(team: Optional[str] = None, filters: Optional[StatcastFilter] = None) -> str:
+    ''' What a query's partition holds, see statcast_store.PARTITION_KINDS '''
+    if filters is not None and filters.key:
+        return statcast_store.FILTERED
+    return statcast_store.TEAM if team else statcast_store.LEAGUE
+
+
+def _read_columns(columns: Optional[List[str]], *required: str) -> Optional[List[str]]:
+    '''
+    The columns to read for a query that only wants columns: those, plus the ones needed to order the pitches and to
+    tell an error response, plus any others required. None (every column) if the query wants every column.
+    '''
+    if columns is None:
+        return None
+    return list(dict.fromkeys([*columns, *_SORT_COLUMNS, 'error', *required]))
+
+
+def _project(data: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    ''' Only the columns asked for that data has, in the order they were asked for '''
+    if columns is None or data is None or data.empty:
+        return data
+    return data.reindex(columns=[column for column in columns if column in data.columns])
+
+
+def _process_small_request(data: pd.DataFrame) -> pd.DataFrame:
     if data is not None and not data.empty:
         if 'error' in data.columns:
             raise StatcastException(data['error'].values[0])
 
         data = data.sort_values(
-            ['game_date', 'game_pk', 'at_bat_number', 'pitch_number'],
+            _SORT_COLUMNS,
             ascending=False
         )
 
     return data
 
 
+def _parse_small_request(content: bytes, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    return _process_small_request(statcast_ds.get_statcast_data_from_csv_bytes(content, columns=columns))
+
+
+async def _fetch_small_request_async(fetcher: async_http.AsyncFetcher, start_dt: date, end_dt: date,
+                                     team: Optional[str] = None, filters: Optional[StatcastFilter] = None,
+                                     columns: Optional[List[str]] = None) -> pd.DataFrame:
+    content = await fetcher.get(statcast_ds.ROOT_URL + _small_request_url(start_dt, end_dt, team, filters))
+    # Parse off the event loop (in a worker process, if the parse pool is on), so the other downloads keep streaming
+    # in the meantime
+    return await parse_pool.run_async(_parse_small_request, content, columns)
+
+
 _OVERSIZE_WARNING = '''
 That's a nice request you got there. It'd be a shame if something were to happen to it.
 We strongly recommend that you enable caching before running this. It's as simple as `pybaseball.cache.enable()`.
 Since the Statcast requests can take a *really* long time to run, if something were to happen, like: a disconnect;
 gremlins; computer repair by associates of Rudy Giuliani; electromagnetic interference from metal trash cans; etc.;
 you could lose a lot of progress. Enabling caching will allow you to immediately recover all the successful
-subqueries if that happens.'''
+subqueries if that happens. So will passing a job_dir, which checkpoints the query so it can be resumed.'''
 
 
-def _check_warning(start_dt: date, end_dt: date) -> None:
-    if not cache.config.enabled and (end_dt - start_dt).days >= 42:
+def _check_warning(start_dt: date, end_dt: date, job_dir: Optional[str] = None) -> None:
+    if not cache.config.enabled and job_dir is None and (end_dt - start_dt).days >= 42:
         warnings.warn(_OVERSIZE_WARNING)
 
 
-def _handle_request(start_dt: date, end_dt: date, step: int, verbose: bool,
-                    team: Optional[str] = None, parallel: bool = True) -> pd.DataFrame:
+def _fetcher(parallel: bool = True) -> async_http.AsyncFetcher:
+    return async_http.AsyncFetcher(max_concurrency=async_http.DEFAULT_MAX_CONCURRENCY_PER_HOST if parallel else 1)
+
+
+def _planner(team: Optional[str] = None, filters: Optional[StatcastFilter] = None) -> statcast_planner.ChunkPlanner:
+    partition = _partition(team, filters)
+    if partition not in _planners:
+        _planners[partition] = statcast_planner.ChunkPlanner.for_team(team)
+    return _planners[partition]
+
+
+def _plan(days: List[date], team: Optional[str] = None, step: Optional[int] = None,
+          store: Optional[statcast_store.StatcastStore] = None,
+          filters: Optional[StatcastFilter] = None) -> List[Tuple[date, date]]:
+    """
+    Plan the request windows for days: step days each if step is given, otherwise sized from the pitches per day
+    seen in earlier responses and in the store manifest. With a store, days its game calendar knows had no games
+    (for the team, if there is one) aren't requested.
+    """
+    if not days:
+        return []
+    if step is not None:
+        return statcast_store.contiguous_ranges(days, step)
+
+    planner = _planner(team, filters)
+    if store is None:
+        return planner.plan(days)
+    margin = timedelta(days=statcast_planner.NEIGHBORHOOD_DAYS)
+    planner.observe_days(store.row_counts(
+        statcast_store.date_span(min(days) - margin, max(days) + margin), _partition(team, filters)
+    ))
+    return planner.plan(days, empty_days=statcast_calendar.GameCalendar.from_store(store, team).empty_days)
+
+
+async def _fetch_window(fetcher: async_http.AsyncFetcher, subq_start: date, subq_end: date,
+                        team: Optional[str] = None,
+                        on_result: Optional[Callable[[date, date, pd.DataFrame], None]] = None,
+                        filters: Optional[StatcastFilter] = None,
+                        columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Fetch one window. If the response hits Savant's row limit, the window is split in half and fetched again,
+    until every part fits.
+    on_result is called with each part and its data as it arrives, off the event loop.
+    Only columns are parsed, if given.
+    """
+    planner = _planner(team, filters)
+    data = await _fetch_small_request_async(fetcher, subq_start, subq_end, team=team, filters=filters,
+                                            columns=columns)
+    rows = 0 if data is None else len(data)
+    if statcast_planner.is_truncated(rows, planner.row_cap):
+        if subq_start < subq_end:
+            halves = await asyncio.gather(
+                *[_fetch_window(fetcher, *half, team=team, on_result=on_result, filters=filters, columns=columns)
+                  for half in statcast_planner.split_window(subq_start, subq_end)]
+            )
+            # Each half is sorted latest first, like every response
+            return pd.concat(reversed(halves), axis=0)
+        warnings.warn(_TRUNCATED_WARNING.format(day=subq_start))
+
+    planner.observe(subq_start, subq_end, rows)
+    if on_result is not None:
+        await asyncio.get_running_loop().run_in_executor(None, on_result, subq_start, subq_end, data)
+    return data
+
+
+async def _fetch_date_range(fetcher: async_http.AsyncFetcher, date_range: List[Tuple[date, date]],
+                            team: Optional[str] = None,
+                            on_result: Optional[Callable[[date, date, pd.DataFrame], None]] = None,
+                            filters: Optional[StatcastFilter] = None,
+                            columns: Optional[List[str]] = None) -> List[pd.DataFrame]:
+    """
+    Fetch every window in date_range concurrently, as far as the fetcher allows.
+    """
+    dataframe_list = []
+    with tqdm(total=len(date_range)) as progress:
+        for future in asyncio.as_completed([
+            _fetch_window(fetcher, subq_start, subq_end, team=team, on_result=on_result, filters=filters,
+                          columns=columns)
+            for subq_start, subq_end in date_range
+        ]):
+            dataframe_list.append(await future)
+            progress.update(1)
+
+    return dataframe_list
+
+
+async def _fetch_into_store_async(fetcher: async_http.AsyncFetcher, store: statcast_store.StatcastStore,
+                                  date_range: List[Tuple[date, date]], team: Optional[str] = None,
+                                  filters: Optional[StatcastFilter] = None) -> List[pd.DataFrame]:
+    """
+    Fetch each range in date_range from Baseball Savant and save it to the store, day by day.
+    A day that hits the row limit on its own is returned, but not saved, so it's fetched again next time.
+    """
+    row_cap = _planner(team, filters).row_cap
+
+    def _save(subq_start: date, subq_end: date, data: pd.DataFrame) -> None:
+        store.save_fetched(subq_start, subq_end, data, _partition(team, filters), row_cap,
+                           kind=_partition_kind(team, filters))
+
+    return await _fetch_date_range(fetcher, date_range, team, on_result=_save, filters=filters)
+
+
+def _fetch_into_store(store: statcast_store.StatcastStore, date_range: List[Tuple[date, date]],
+                      team: Optional[str] = None, parallel: bool = True) -> List[pd.DataFrame]:
+    async def _fetch() -> List[pd.DataFrame]:
+        async with _fetcher(parallel) as fetcher:
+            return await _fetch_into_store_async(fetcher, store, date_range, team)
+
+    return async_http.run(_fetch())
+
+
+async def _handle_store_request(fetcher: async_http.AsyncFetcher, days: List[date], step: Optional[int] = None,
+                                team: Optional[str] = None, filters: Optional[StatcastFilter] = None,
+                                columns: Optional[List[str]] = None) -> List[pd.DataFrame]:
     """
-    Fulfill the request in sensible increments.
+    Serve days from the local Statcast store, only fetching the days that are missing or stale.
+    Stored days are only read for columns, if given. Fetched days are parsed whole, since the store keeps every
+    column, and cut down to columns once they're saved.
     """
+    store = statcast_store.StatcastStore.from_config(cache.config)
+    partition = _partition(team, filters)
+    missing = store.missing_days(days, partition)
+    stored = sorted(set(days) - set(missing))
+    read_columns = _read_columns(columns)
 
-    _check_warning(start_dt, end_dt)
+    fetched = await _fetch_into_store_async(fetcher, store, _plan(missing, team, step, store, filters), team, filters)
+    return store.load_days(stored, partition, read_columns) + [_project(data, read_columns) for data in fetched]
+
+
+def _open_job(job_dir: str, start_dt: date, end_dt: date, team: Optional[str] = None,
+              filters: Optional[StatcastFilter] = None,
+              columns: Optional[List[str]] = None) -> statcast_job.StatcastJob:
+    query = {
+        'start_dt': str(start_dt), 'end_dt': str(end_dt), 'team': team, 'filters': filters.query if filters else '',
+        'columns': columns,
+    }
+    return statcast_job.StatcastJob(job_dir, query)
+
+
+async def _handle_job_request(fetcher: async_http.AsyncFetcher, job: statcast_job.StatcastJob, days: List[date],
+                              team: Optional[str] = None, filters: Optional[StatcastFilter] = None,
+                              columns: Optional[List[str]] = None) -> List[pd.DataFrame]:
+    """
+    Fetch what's left of a job, writing each chunk to the job's directory as it arrives instead of holding on to
+    it, then read all of its chunks back.
+    """
+    read_columns = _read_columns(columns)
+    if not job.planned:
+        store = statcast_store.StatcastStore.from_config(cache.config) if cache.config.enabled else None
+        job.plan(_plan(days, team, store=store, filters=filters))
+    pending = job.pending()
+
+    with tqdm(total=len(pending)) as progress:
+        for future in asyncio.as_completed([
+            _fetch_window(fetcher, subq_start, subq_end, team=team, on_result=job.save_chunk, filters=filters,
+                          columns=read_columns)
+            for subq_start, subq_end in pending
+        ]):
+            await future
+            progress.update(1)
+
+    return job.load(read_columns)
+
+
+def _pitch_key(data: pd.DataFrame, row: int) -> Tuple[pd.Timestamp, int, int, int]:
+    game_date, game_pk, at_bat_number, pitch_number = (data[column].iat[row] for column in _SORT_COLUMNS)
+    return pd.Timestamp(game_date), game_pk, at_bat_number, pitch_number
+
+
+def _combine(dataframe_list: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Assemble the chunks of a request into one frame, latest pitch first.
+
+    Every chunk is already sorted latest first, and chunks cover disjoint date ranges, so putting the chunks in order
+    of their latest pitch orders the whole frame. This skips sorting (and copying) the concatenated frame again,
+    which is most of the cost of assembling a season. Chunks that overlap fall back to a stable sort, and each pitch
+    they both have is only kept once.
+    """
+    chunks = [df for df in dataframe_list if df is not None and not df.empty]
+    # Let go of the chunks as soon as they're concatenated
+    dataframe_list.clear()
+    if not chunks:
+        return pd.DataFrame()
+
+    # Chunks can come across extra categories, and concatenating categoricals needs the same categories everywhere
+    statcast_schema.union_categories(chunks)
+    chunks.sort(key=lambda chunk: _pitch_key(chunk, 0), reverse=True)
+    try:
+        ordered = all(_pitch_key(earlier, -1) > _pitch_key(later, 0) for earlier, later in zip(chunks, chunks[1:]))
+    except TypeError:
+        ordered = False
+
+    final_data = pd.concat(chunks, axis=0)
+    del chunks
+    if not ordered:
+        final_data = pitch_key.dedupe(
+            final_data.sort_values(_SORT_COLUMNS, ascending=False, kind='mergesort'), keep='first'
+        )
+
+    return final_data
+
+
+async def _handle_request_async(fetcher: async_http.AsyncFetcher, start_dt: date, end_dt: date,
+                                step: Optional[int], verbose: bool, team: Optional[str] = None,
+                                filters: Optional[StatcastFilter] = None, columns: Optional[List[str]] = None,
+                                job_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Fulfill the request in sensible increments: step days at a time, or as many days as fit in a request if step
+    is None. With a job_dir, the request is checkpointed there, and resumed from there if it was started before.
+    """
+
+    _check_warning(start_dt, end_dt, job_dir)
+    # Open the job before anything is fetched, so a job_dir holding another query fails fast
+    job = _open_job(job_dir, start_dt, end_dt, team, filters, columns) if job_dir is not None else None
 
     if verbose:
         print("This is a large query, it may take a moment to complete", flush=True)
 
-    dataframe_list = []
-    date_range = list(statcast_date_range(start_dt, end_dt, step, verbose))
+    statcast_calendar.update_valid_dates()
+    days = statcast_store.days_in_range(start_dt, end_dt, verbose)
 
-    with tqdm(total=len(date_range)) as progress:
-        if parallel:
-            # Use ThreadPoolExecutor over ProcessPoolExecutor because ProcessPoolExecutor doesn't work with
-            # notebooks and python command line due to the fact it won't have a `__main__` module.
-            # See https://docs.python.org/3.7/library/concurrent.futures.html#processpoolexecutor
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = {executor.submit(_small_request, subq_start, subq_end, team=team)
-                        for subq_start, subq_end in date_range}
-                for future in concurrent.futures.as_completed(futures):
-                    dataframe_list.append(future.result())
-                    progress.update(1)
-        else:
-            for subq_start, subq_end in date_range:
-                dataframe_list.append(_small_request(subq_start, subq_end, team=team))
-                progress.update(1)
-
-    # If there's no dataframe_list, return an empty DataFrame
-    if not dataframe_list:
-        final_data = pd.DataFrame()
+    if job is not None:
+        dataframe_list = await _handle_job_request(fetcher, job, days, team, filters, columns)
+    elif cache.config.enabled:
+        dataframe_list = await _handle_store_request(fetcher, days, step, team, filters, columns)
     else:
-        # If we have non-empty DataFrames, concatenate and sort them
-        if non_empty_dataframes := [df for df in dataframe_list if not df.empty]:
-            final_data = pd.concat(non_empty_dataframes, axis=0)
-            final_data = final_data.convert_dtypes(convert_string=False)
-            final_data = final_data.sort_values(
-                ['game_date', 'game_pk', 'at_bat_number', 'pitch_number'],
-                ascending=False
-            )
-        else:
-            final_data = pd.DataFrame()
+        dataframe_list = await _fetch_date_range(fetcher, _plan(days, team, step, filters=filters), team,
+                                                 filters=filters, columns=_read_columns(columns))
 
-    return final_data
+    return _project(_combine(dataframe_list), columns)
+
+
+def _handle_request(start_dt: date, end_dt: date, step: Optional[int], verbose: bool,
+                    team: Optional[str] = None, parallel: bool = True,
+                    filters: Optional[StatcastFilter] = None, columns: Optional[List[str]] = None,
+                    job_dir: Optional[str] = None) -> pd.DataFrame:
+    async def _request() -> pd.DataFrame:
+        async with _fetcher(parallel) as fetcher:
+            return await _handle_request_async(fetcher, start_dt, end_dt, step, verbose, team=team, filters=filters,
+                                               columns=columns, job_dir=job_dir)
 
+    return async_http.run(_request())
 
-def statcast(start_dt: str = None, end_dt: str = None, team: str = None,
-             verbose: bool = True, parallel: bool = True) -> pd.DataFrame:
+
+async def statcast_async(start_dt: Optional[str] = None, end_dt: Optional[str] = None, team: Optional[str] = None,
+                         verbose: bool = True, max_concurrency: int = async_http.DEFAULT_MAX_CONCURRENCY_PER_HOST,
+                         timeout: float = async_http.DEFAULT_TIMEOUT,
+                         retries: int = async_http.DEFAULT_RETRIES, typed: bool = True,
+                         filters: Optional[StatcastFilter] = None, columns: Optional[List[str]] = None,
+                         job_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    The coroutine version of statcast(), for use from an event loop (e.g. `await statcast_async(...)` in a notebook).
+
+    All requests share one pooled connection and are made concurrently from the event loop, instead of a thread per
+    request.
+
+    INPUTS:
+    start_dt: YYYY-MM-DD : the first date for which you want statcast data
+    end_dt: YYYY-MM-DD : the last date for which you want statcast data
+    team: optional (defaults to None) : city abbreviation of the team you want data for (e.g. SEA or BOS)
+    verbose: bool (defaults to True) : whether to print updates on query progress
+    max_concurrency: int (defaults to 8) : the most requests to have in flight to Baseball Savant at once
+    timeout: float (defaults to 120) : seconds to wait on each request
+    retries: int (defaults to 3) : how many times to retry a request that times out or fails with a server error
+    typed: bool (defaults to True) : as for statcast()
+    filters: StatcastFilter (defaults to None) : as for statcast()
+    columns: list of str (defaults to None) : as for statcast()
+    job_dir: str (defaults to None) : as for statcast()
+
+    If no arguments are provided, this will return yesterday's statcast data.
+    If one date is provided, it will return that date's statcast data.
+    """
+
+    start_dt_date, end_dt_date = sanitize_date_range(start_dt, end_dt)
+
+    async with async_http.AsyncFetcher(max_concurrency=max_concurrency, timeout=timeout, retries=retries) as fetcher:
+        data = await _handle_request_async(fetcher, start_dt_date, end_dt_date, None, verbose=verbose, team=team,
+                                           filters=filters, columns=columns, job_dir=job_dir)
+
+    return data if typed else statcast_schema.to_raw_dtypes(data)
+
+
+def statcast(start_dt: Optional[str] = None, end_dt: Optional[str] = None, team: Optional[str] = None,
+             verbose: bool = True, parallel: bool = True, typed: bool = True,
+             filters: Optional[StatcastFilter] = None, columns: Optional[List[str]] = None,
+             job_dir: Optional[str] = None) -> pd.DataFrame:
     """
     Pulls statcast play-level data from Baseball Savant for a given date range.
 
@@ -109,6 +404,15 @@ def statcast(start_dt: str = None, end_dt: str = None, team: str = None,
     team: optional (defaults to None) : city abbreviation of the team you want data for (e.g. SEA or BOS)
     verbose: bool (defaults to True) : whether to print updates on query progress
     parallel: bool (defaults to True) : whether to parallelize HTTP requests in large queries
+    typed: bool (defaults to True) : whether to use the compact Statcast schema (categoricals, narrow integers and
+        floats, parsed dates). Set to False for the dtypes the CSV parser returns
+    filters: StatcastFilter (defaults to None) : only get the pitches matching these filters, e.g.
+        StatcastFilter(pitch_types='SL', pitcher_throws='R'). Savant applies them, so only those pitches are downloaded
+    columns: list of str (defaults to None) : only get these columns, e.g. ['game_date', 'pitch_type', 'release_speed'].
+        Only they are parsed from the response, and only they are read from the cache
+    job_dir: str (defaults to None) : a directory to checkpoint the query in. Each chunk is written there as it
+        arrives, with a journal of the chunks planned and completed, so if the query is interrupted, running it again
+        with the same job_dir only fetches what's left. Use a new directory for each query
 
     If no arguments are provided, this will return yesterday's statcast data.
     If one date is provided, it will return that date's statcast data.
@@ -116,21 +420,28 @@ def statcast(start_dt: str = None, end_dt: str = None, team: str = None,
 
     start_dt_date, end_dt_date = sanitize_date_range(start_dt, end_dt)
 
-    return _handle_request(start_dt_date, end_dt_date, 1, verbose=verbose,
-                           team=team, parallel=parallel)
+    data = _handle_request(start_dt_date, end_dt_date, None, verbose=verbose,
+                           team=team, parallel=parallel, filters=filters, columns=columns, job_dir=job_dir)
+
+    return data if typed else statcast_schema.to_raw_dtypes(data)
 
 
-def statcast_single_game(game_pk: Union[str, int]) -> pd.DataFrame:
+def statcast_single_game(game_pk: Union[str, int], typed: bool = True,
+                         columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Pulls statcast play-level data from Baseball Savant for a single game,
     identified by its MLB game ID (game_pk in statcast data)
 
     INPUTS:
     game_pk : 6-digit integer MLB game ID to retrieve
+    typed: bool (defaults to True) : as for statcast()
+    columns: list of str (defaults to None) : as for statcast()
     """
 
     data = statcast_ds.get_statcast_data_from_csv_url(
-        _SC_SINGLE_GAME_REQUEST.format(game_pk=game_pk)
+        _SC_SINGLE_GAME_REQUEST.format(game_pk=game_pk),
+        typed=typed,
+        columns=_read_columns(columns)
     )
 
     if data is None or data.empty:
@@ -139,7 +450,7 @@ def statcast_single_game(game_pk: Union[str, int]) -> pd.DataFrame:
     if 'error' in data.columns:
         raise StatcastException(data['error'].values[0])
 
-    return data.sort_values(
-        ['game_date', 'game_pk', 'at_bat_number', 'pitch_number'],
+    return _project(data.sort_values(
+        _SORT_COLUMNS,
         ascending=False
-    )
+    ), columns)
@@ -0,0 +1,182 @@
+import concurrent.futures
+import io
+import warnings
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from tqdm import tqdm
+
+import pybaseball.datasources.statcast as statcast_ds
+
+from . import cache
+from .datasources import rate_limit
+from .datasources.savant_leaderboard import DEFAULT_MAX_WORKERS
+from .statcast import _SC_SMALL_REQUEST, StatcastException
+from .statcast_filters import StatcastFilter
+from .utils import sanitize_date_range, statcast_season_span
+
+# The pitch-level search, asking for Savant's summary rows (one per group) instead of every pitch
+_SC_AGGREGATE_REQUEST = _SC_SMALL_REQUEST.replace(
+    'player_type=pitcher', 'player_type={player_type}'
+).replace('group_by=name', 'group_by={group_by}').replace('type=details&', '')
+
+# Savant's group_by values, by what they group by. Any other value is passed on to Savant as is.
+GROUP_BY: Dict[str, str] = {
+    'player': 'name',
+    'player_date': 'name-date',
+    'player_event': 'name-event',
+    'player_year': 'name-year',
+    'team': 'team',
+    'team_year': 'team-year',
+    'venue': 'venue',
+    'league': 'league',
+    'league_year': 'league-year',
+}
+PLAYER_TYPES = ('pitcher', 'batter')
+
+# Numeric columns that identify a group rather than measure it
+_KEY_COLUMNS = ('player_id', 'game_year', 'game_pk')
+# Counts, which add up across seasons
+_COUNT_COLUMNS = (
+    'pitches', 'total_pitches', 'hits', 'abs', 'whiffs', 'swings', 'takes', 'pa', 'bip', 'woba_denom', 'singles',
+    'doubles', 'triples', 'hrs', 'so', 'bb', 'barrels_total',
+)
+# Rates, by the count column they're a rate over. A merged rate is its seasons' rates weighted by that count.
+_RATE_DENOMINATORS: Dict[str, str] = {
+    'pitch_percent': 'total_pitches',
+    'ba': 'abs',
+    'slg': 'abs',
+    'iso': 'abs',
+    'xba': 'abs',
+    'xslg': 'abs',
+    'woba': 'woba_denom',
+    'xwoba': 'woba_denom',
+    'launch_speed': 'bip',
+    'launch_angle': 'bip',
+    'hardhit_percent': 'bip',
+    'barrels_per_bbe_percent': 'bip',
+    'barrels_per_pa_percent': 'pa',
+    'k_percent': 'pa',
+    'bb_percent': 'pa',
+    'swing_miss_percent': 'swings',
+    # Measured on every pitch
+    'velocity': 'pitches',
+    'effective_speed': 'pitches',
+    'eff_min_vel': 'pitches',
+    'spin_rate': 'pitches',
+    'release_extension': 'pitches',
+}
+
+_UNMERGED_WARNING = (
+    "Can't merge {columns} across seasons without what they're rates of, so they're left out. "
+    "Group by a year (e.g. group_by='player_year') to get each season's values."
+)
+
+
+def _season_windows(start_dt: date, end_dt: date) -> List[Tuple[date, date]]:
+    ''' The part of each season between start_dt and end_dt, skipping the offseason '''
+    windows = []
+    for year in range(start_dt.year, end_dt.year + 1):
+        season_start, season_end = statcast_season_span(year)
+        start, end = max(start_dt, season_start), min(end_dt, season_end)
+        if start <= end:
+            windows.append((start, end))
+    return windows
+
+
+def _aggregate_url(start_dt: date, end_dt: date, group_by: str, player_type: str, team: Optional[str] = None,
+                   filters: Optional[StatcastFilter] = None) -> str:
+    url = filters.apply(_SC_AGGREGATE_REQUEST) if filters is not None else _SC_AGGREGATE_REQUEST
+    return statcast_ds.ROOT_URL + url.format(
+        start_dt=str(start_dt), end_dt=str(end_dt), team=team if team else '', group_by=group_by,
+        player_type=player_type
+    )
+
+
+@cache.df_cache()
+def _aggregate_request(url: str) -> pd.DataFrame:
+    ''' One window of a Statcast search's summary rows, as Baseball Savant sends them '''
+    content = rate_limit.get(url, timeout=None).content.decode('utf-8')
+    data = pd.read_csv(io.StringIO(content)) if content.strip() else pd.DataFrame()
+    if 'error' in data.columns:
+        raise StatcastException(data['error'].values[0])
+    return data
+
+
+def _merge(windows: List[pd.DataFrame]) -> pd.DataFrame:
+    '''
+    Merge the summary rows of several windows into one row per group: counts are added up, each rate is averaged
+    over its own count (see _RATE_DENOMINATORS). Measures with no count to average them over in the data are left
+    out, with a warning.
+    '''
+    data = pd.concat(windows, axis=0, ignore_index=True)
+    keys = [
+        column for column in data.columns
+        if column in _KEY_COLUMNS or not pd.api.types.is_numeric_dtype(data[column])
+    ]
+    counts = [column for column in data.columns if column in _COUNT_COLUMNS]
+    measures = [column for column in data.columns if column not in keys and column not in counts]
+    unmerged = [column for column in measures if _RATE_DENOMINATORS.get(column) not in data.columns]
+    if unmerged:
+        warnings.warn(_UNMERGED_WARNING.format(columns=', '.join(unmerged)))
+    measures = [column for column in measures if column not in unmerged]
+
+    sums = data[keys + counts].copy()
+    for column in measures:
+        weights = data[_RATE_DENOMINATORS[column]].where(data[column].notna())
+        sums[column] = data[column] * weights
+        sums[f'_weight_{column}'] = weights
+
+    merged = sums.groupby(keys, dropna=False, sort=False).sum(min_count=1).reset_index()
+    for column in measures:
+        merged[column] = merged[column] / merged.pop(f'_weight_{column}')
+
+    merged = merged[[column for column in data.columns if column in merged.columns]]
+    if 'pitches' in merged.columns:
+        merged = merged.sort_values('pitches', ascending=False, kind='stable').reset_index(drop=True)
+    return merged
+
+
+def statcast_aggregate(start_dt: Optional[str] = None, end_dt: Optional[str] = None, group_by: str = 'player',
+                       player_type: str = 'pitcher', team: Optional[str] = None,
+                       filters: Optional[StatcastFilter] = None, verbose: bool = True) -> pd.DataFrame:
+    """
+    Pulls Baseball Savant's Statcast search results summarized by group (e.g. one row per pitcher: pitches, batting
+    average against, velocity, spin rate, ...) instead of pitch by pitch, for a fraction of the download.
+
+    Each season in the date range is one request, and the seasons are requested concurrently. With several seasons,
+    each group's rows are merged into one: counts are added up and each rate is averaged over what it's a rate of
+    (batting average over at bats, exit velocity over batted balls, wOBA over its denominator, velocity over
+    pitches, ...). Rates that can't be merged that way are left out, with a warning; group by a year (e.g.
+    'player_year') to keep the seasons apart and get them.
+    With the cache enabled, each season's summary is cached on its own, apart from pitch-level data.
+
+    ARGUMENTS
+        start_dt : YYYY-MM-DD : the first date for which you want data
+        end_dt : YYYY-MM-DD : the final date for which you want data (defaults to start_dt)
+        group_by : str : what to summarize by: 'player', 'player_year', 'player_date', 'player_event', 'team',
+            'team_year', 'venue', 'league' or 'league_year' (defaults to 'player'). Other values are passed to
+            Savant as its group_by parameter.
+        player_type : str : 'pitcher' or 'batter', whose side the players (and their teams) are on
+        team : str : optional, only pitches involving this team (see statcast)
+        filters : StatcastFilter : optional, only summarize the pitches matching these filters (see statcast)
+        verbose : bool : whether to show a progress bar
+    """
+    if player_type not in PLAYER_TYPES:
+        raise ValueError(f"player_type must be one of {', '.join(PLAYER_TYPES)}, not {player_type}")
+    start_dt_date, end_dt_date = sanitize_date_range(start_dt, end_dt)
+    savant_group_by = GROUP_BY.get(group_by, group_by)
+    urls = [
+        _aggregate_url(start, end, savant_group_by, player_type, team=team, filters=filters)
+        for start, end in _season_windows(start_dt_date, end_dt_date)
+    ]
+    if not urls:
+        return pd.DataFrame()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(DEFAULT_MAX_WORKERS, len(urls))) as executor:
+        windows = list(tqdm(executor.map(_aggregate_request, urls), total=len(urls), disable=not verbose))
+    windows = [data for data in windows if not data.empty]
+    if not windows:
+        return pd.DataFrame()
+    return windows[0] if len(windows) == 1 else _merge(windows)
@@ -1,18 +1,20 @@
-import io
-from http.client import HTTPException
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 import pandas as pd
-import requests
 
-from . import cache
-from .utils import sanitize_input, split_request, sanitize_statcast_columns
+from .datasources.savant_leaderboard import SavantLeaderboard, Years
+from .statcast_filters import StatcastFilter
+from .statcast_players import statcast_players
+from .utils import sanitize_input
 
 
 def statcast_batter(
     start_dt: Optional[str] = None,
     end_dt: Optional[str] = None,
     player_id: Optional[int] = None,
+    filters: Optional[StatcastFilter] = None,
+    typed: bool = True,
+    columns: Optional[List[str]] = None,
 ) -> pd.DataFrame:
     """
     Pulls statcast pitch-level data from Baseball Savant for a given batter.
@@ -22,131 +24,128 @@ def statcast_batter(
         end_dt : YYYY-MM-DD : the final date for which you want data
         player_id : INT : the player's MLBAM ID. Find this by calling pybaseball.playerid_lookup(last_name, first_name),
             finding the correct player, and selecting their key_mlbam.
+        filters : StatcastFilter : optional, only get the pitches matching these filters (see statcast)
+        typed : bool : whether to use the compact Statcast schema, as for statcast (defaults to True)
+        columns : list of str : optional, only get these columns (see statcast)
+
+    This is statcast_players for one player, so it shares its cache: with the cache enabled, days already fetched for
+    the player (by either) aren't fetched again.
     """
     start_dt, end_dt, _ = sanitize_input(start_dt, end_dt, player_id)
 
-    # sanitize_input will guarantee these are not None
-    assert start_dt
-    assert end_dt
+    # sanitize_input will guarantee this is not None
     assert player_id
 
-    url = "https://baseballsavant.mlb.com/statcast_search/csv?all=true&hfPT=&hfAB=&hfBBT=&hfPR=&hfZ=&stadium=&hfBBL=&hfNewZones=&hfGT=R%7CPO%7CS%7C=&hfSea=&hfSit=&player_type=batter&hfOuts=&opponent=&pitcher_throws=&batter_stands=&hfSA=&game_date_gt={}&game_date_lt={}&batters_lookup%5B%5D={}&team=&position=&hfRO=&home_road=&hfFlag=&metric_1=&hfInn=&min_pitches=0&min_results=0&group_by=name&sort_col=pitches&player_event_sort=h_launch_speed&sort_order=desc&min_abs=0&type=details&"
-    df = split_request(start_dt, end_dt, player_id, url)
-    return df
+    return statcast_players([player_id], start_dt, end_dt, role='batter', filters=filters, typed=typed,
+                            columns=columns)
+
+
+_EXITVELO_BARRELS = SavantLeaderboard(
+    path="leaderboard/statcast?type=batter&year={year}&position=&team=&min={minBBE}&csv=true"
+)
+_EXPECTED_STATS = SavantLeaderboard(
+    path="leaderboard/expected_statistics?type=batter&year={year}&position=&team=&filterType=pa&min={minPA}&csv=true"
+)
+# The CSV includes a null player with player id 999999
+_PERCENTILE_RANKS = SavantLeaderboard(
+    path="leaderboard/percentile-rankings?type=batter&year={year}&position=&team=&csv=true",
+    sanitize=False,
+    drop_null="player_name",
+)
+_PITCH_ARSENAL = SavantLeaderboard(
+    path="leaderboard/pitch-arsenal-stats?type=batter&pitchType=&year={year}&team=&min={minPA}&csv=true"
+)
+_BAT_TRACKING = SavantLeaderboard(
+    path="leaderboard/bat-tracking/swing-path-attack-angle?dateStart={year}-01-01&dateEnd={year}-12-31"
+    "&gameType=Regular&minSwings={minSwings}&minGroupSwings=1&seasonStart={year}&seasonEnd={year}&type=batter&csv=true"
+)
+_RUN_VALUE = SavantLeaderboard(
+    path="leaderboard/swing-take?year={year}&team=&leverage=Neutral&group=Batter&type=All&sub_type=null&min=q&csv=True"
+)
 
 
-@cache.df_cache()
 def statcast_batter_exitvelo_barrels(
-    year: int, minBBE: Union[int, str] = "q"
+    year: Years, minBBE: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves batted ball data for all batters in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve batted ball data. Format: YYYY.
+        year: The year for which you wish to retrieve batted ball data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minBBE: The minimum number of batted ball events for each player. If a player falls
             below this threshold, they will be excluded from the results. If no value is specified,
             only qualified batters will be returned.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/statcast?type=batter&year={year}&position=&team=&min={minBBE}&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _EXITVELO_BARRELS.fetch(year, minBBE=minBBE)
 
 
-@cache.df_cache()
 def statcast_batter_expected_stats(
-    year: int, minPA: Union[int, str] = "q"
+    year: Years, minPA: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves expected stats based on quality of batted ball contact in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve expected stats data. Format: YYYY.
+        year: The year for which you wish to retrieve expected stats data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minPA: The minimum number of plate appearances for each player. If a player falls below this threshold,
             they will be excluded from the results. If no value is specified, only qualified batters will be returned.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/expected_statistics?type=batter&year={year}&position=&team=&filterType=pa&min={minPA}&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _EXPECTED_STATS.fetch(year, minPA=minPA)
 
 
-@cache.df_cache()
-def statcast_batter_percentile_ranks(year: int) -> pd.DataFrame:
+def statcast_batter_percentile_ranks(year: Years) -> pd.DataFrame:
     """
     Retrieves percentile ranks for each player in a given year, including batters with at least 2.1 PA per team
     game and 1.25 for pitchers.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve percentile data. Format: YYYY.
+        year: The year for which you wish to retrieve percentile data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/percentile-rankings?type=batter&year={year}&position=&team=&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    # URL returns a null player with player id 999999, which we want to drop
-    return data.loc[data.player_name.notna()].reset_index(drop=True)
+    return _PERCENTILE_RANKS.fetch(year)
 
 
-@cache.df_cache()
-def statcast_batter_pitch_arsenal(year: int, minPA: int = 25) -> pd.DataFrame:
+def statcast_batter_pitch_arsenal(year: Years, minPA: int = 25) -> pd.DataFrame:
     """
     Retrieves outcome data for batters split by the pitch type in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve pitch arsenal data. Format: YYYY.
+        year: The year for which you wish to retrieve pitch arsenal data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minPA: The minimum number of plate appearances for each player. If a player falls below this threshold,
             they will be excluded from the results. If no value is specified, the default number of plate appearances is 25.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/pitch-arsenal-stats?type=batter&pitchType=&year={year}&team=&min={minPA}&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _PITCH_ARSENAL.fetch(year, minPA=minPA)
 
 
-@cache.df_cache()
 def statcast_batter_bat_tracking(
-    year: int, minSwings: Union[int, str] = "q"
+    year: Years, minSwings: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves a player's bat tracking data for a given year.
 
     ARGUMENTS
-        year: The year for which you which to retrieve the bat tracking data. Format: YYYY.
+        year: The year for which you which to retrieve the bat tracking data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minSwings: The minimum number of competitive swings for wach player. If a player falls below this threshold,
             they will be excluded from the results. If no value is specified, the default number of competitive swings
             is qualified.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/bat-tracking/swing-path-attack-angle?dateStart={year}-01-01&dateEnd={year}-12-31&gameType=Regular&minSwings={minSwings}&minGroupSwings=1&seasonStart={year}&seasonEnd={year}&type=batter&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _BAT_TRACKING.fetch(year, minSwings=minSwings)
 
 
-@cache.df_cache()
-def statcast_batter_run_value(year: int) -> pd.DataFrame():
+def statcast_batter_run_value(year: Years) -> pd.DataFrame:
     """
     Retrieve a Batter's Run Value from Baseball Savant's URL
 
     ARGUMENTS:
-        year(int): year data is retrieved for.
-        Data can only be retrieved for a single year at a time
+        year(int): year data is retrieved for. A list or range of years returns them all in one frame, with a
+        year column.
 
     Returns:
         data(pd.DataFrame): clean dataframe from Savant Return
 
     """
-    try:
-        url = f"https://baseballsavant.mlb.com/leaderboard/swing-take?year={year}&team=&leverage=Neutral&group=Batter&type=All&sub_type=null&min=q&csv=True"
-        res = requests.get(url, timeout=None).content
-        data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-        data = sanitize_statcast_columns(data)
-        return data
-    except HTTPException as error:
-        raise ConnectionError(f"URL {error} is unreachable")
-    finally:
-        raise KeyError(f"An Error Occurred in Acquiring the Data")
+    return _RUN_VALUE.fetch(year)
@@ -0,0 +1,65 @@
+from datetime import date
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple
+
+from . import cache, statcast_store
+from .utils import STATCAST_VALID_DATES, statcast_season_span
+
+
+class GameCalendar:
+    '''
+    Which days had games, as far as the local Statcast store has seen: a day with pitches had games, and a day
+    that came back without any once it had settled had none (an off day, the All-Star break, a day of rainouts).
+    Days the store hasn't seen are unknown, and have to be requested.
+    '''
+
+    def __init__(self, game_days: Optional[Mapping[date, bool]] = None):
+        self.game_days: Dict[date, bool] = dict(game_days or {})
+
+    @classmethod
+    def from_store(cls, store: statcast_store.StatcastStore, team: Optional[str] = None) -> 'GameCalendar':
+        '''
+        The league's calendar from the store manifest, or one team's: the team had no games on the days the league
+        had none, or on the days its own queries came back empty.
+        '''
+        game_days = store.game_days()
+        if team:
+            game_days.update(store.game_days(team))
+        return cls(game_days)
+
+    def has_games(self, day: date) -> Optional[bool]:
+        ''' Whether day had games, or None if it isn't known '''
+        return self.game_days.get(day)
+
+    @property
+    def empty_days(self) -> FrozenSet[date]:
+        ''' The days known to have had no games '''
+        return frozenset(day for day, has_games in self.game_days.items() if not has_games)
+
+    def season_span(self, year: int) -> Optional[Tuple[date, date]]:
+        '''
+        The first and last days of a season's games, once every day of the span statcast_season_span assumes for
+        it is known. None until then.
+        '''
+        start, end = statcast_season_span(year)
+        days = list(statcast_store.date_span(start, end))
+        if any(day not in self.game_days for day in days):
+            return None
+        played = [day for day in days if self.game_days[day]]
+        return (played[0], played[-1]) if played else None
+
+
+def update_valid_dates(store: Optional[statcast_store.StatcastStore] = None) -> None:
+    '''
+    Fill in STATCAST_VALID_DATES for the seasons that aren't in it yet, once the store has seen the whole of them,
+    so later queries skip their offseason days. Uses the store in the cache directory if none is given and the cache
+    is enabled.
+    '''
+    if store is None:
+        if not cache.config.enabled:
+            return
+        store = statcast_store.StatcastStore.from_config(cache.config)
+    calendar = GameCalendar.from_store(store)
+    for year in sorted({day.year for day in calendar.game_days} - set(STATCAST_VALID_DATES)):
+        span = calendar.season_span(year)
+        if span is not None:
+            STATCAST_VALID_DATES[year] = span
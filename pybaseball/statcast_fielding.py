@@ -1,16 +1,42 @@
-import io
 from typing import Union
 
 import pandas as pd
-import requests
 
-from . import cache
-from .utils import norm_positions, sanitize_statcast_columns
+from .datasources.savant_leaderboard import SavantLeaderboard, Years
+from .utils import norm_positions
+
+_OUTS_ABOVE_AVERAGE = SavantLeaderboard(
+    path="leaderboard/outs_above_average?type={view}&startYear={year}&endYear={year}&split=no&team=&range=year"
+    "&min={min_att}&pos={pos}&roles=&viz=hide&csv=true"
+)
+_FIELDING_RUN_VALUE = SavantLeaderboard(
+    path="leaderboard/fielding-run-value?gameType=Regular&seasonStart={year}&seasonEnd={year}&type=fielder"
+    "&position={pos}&minInnings={min_inn}&minResults=1&csv=true"
+)
+_OUTFIELD_DIRECTIONAL_OAA = SavantLeaderboard(
+    path="directional_outs_above_average?year={year}&min={min_opp}&team=&csv=true"
+)
+_OUTFIELD_CATCH_PROB = SavantLeaderboard(
+    path="leaderboard/catch_probability?type=player&min={min_opp}&year={year}&total=&csv=true"
+)
+_OUTFIELDER_JUMP = SavantLeaderboard(
+    path="leaderboard/outfield_jump?year={year}&min={min_att}&csv=true"
+)
+# currently no 2020 data
+_CATCHER_POPTIME = SavantLeaderboard(
+    path="leaderboard/poptime?year={year}&team=&min2b={min_2b_att}&min3b={min_3b_att}&csv=true",
+    sanitize=False,
+)
+# The CSV includes a league average player
+_CATCHER_FRAMING = SavantLeaderboard(
+    path="leaderboard/catcher-framing?type=catcher&seasonStart={year}&seasonEnd={year}&team=&min={min_called_p}"
+    "&sortColumn=rv_tot&sortDirection=desc&csv=true",
+    drop_null="name",
+)
 
 
-@cache.df_cache()
 def statcast_outs_above_average(
-    year: int,
+    year: Years,
     pos: Union[int, str],
     min_att: Union[int, str] = "q",
     view: str = "Fielder",
@@ -18,7 +44,8 @@ def statcast_outs_above_average(
     """Scrapes outs above average from baseball savant for a given year and position
 
     Args:
-            year (int): Season to pull
+            year (Union[int, Iterable[int]]): Season to pull. A list or range of seasons returns them all in one
+                    frame, with a year column.
             pos (Union[int, str]): Numerical position (e.g. 3 for 1B, 4 for 2B). Catchers not supported
             min_att (Union[int, str], optional): Integer number of attempts required or "q" for qualified.
                     Defaults to "q".
@@ -36,21 +63,17 @@ def statcast_outs_above_average(
     # catcher is not included in this leaderboard
     if pos == "2":
         raise ValueError("This particular leaderboard does not include catchers!")
-    url = f"https://baseballsavant.mlb.com/leaderboard/outs_above_average?type={view}&startYear={year}&endYear={year}&split=no&team=&range=year&min={min_att}&pos={pos}&roles=&viz=hide&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _OUTS_ABOVE_AVERAGE.fetch(year, view=view, min_att=min_att, pos=pos)
 
 
-@cache.df_cache()
 def statcast_fielding_run_value(
-    year: int, pos: Union[int, str], min_inn: int = 100
+    year: Years, pos: Union[int, str], min_inn: int = 100
 ) -> pd.DataFrame:
     """Scrapes fielding run value from baseball savant for a given year and position
 
     Args:
-            year (int): Season to pull, if 0 returns merged data for all available years.
+            year (Union[int, Iterable[int]]): Season to pull, if 0 returns merged data for all available years. A list
+                    or range of seasons returns them all in one frame, with a year column.
             pos (Union[int, str]): Numerical position (e.g. 3 for 1B, 4 for 2B). Catchers ARE supported
             min_inn (int, optional): Integer number of attempts required.
                     Defaults to 100.
@@ -63,74 +86,57 @@ def statcast_fielding_run_value(
                     the given threshold
     """
     pos = norm_positions(pos)
-    url = f"https://baseballsavant.mlb.com/leaderboard/fielding-run-value?gameType=Regular&seasonStart={year}&seasonEnd={year}&type=fielder&position={pos}&minInnings={min_inn}&minResults=1&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _FIELDING_RUN_VALUE.fetch(year, pos=pos, min_inn=min_inn)
 
 
-@cache.df_cache()
 def statcast_outfield_directional_oaa(
-    year: int, min_opp: Union[int, str] = "q"
+    year: Years, min_opp: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves outfielders' directional OAA data for the given year and number of opportunities. The directions are
     Back Left, Back, Back Right, In Left, In, and In Right.
 
     ARGUMENTS
-            year: The year for which you wish to retrieve batted ball against data. Format: YYYY.
+            year: The year for which you wish to retrieve batted ball against data. Format: YYYY. A list or range of
+            years returns them all in one frame, with a year column.
             min_opp: The minimum number of opportunities for the player to be included in the result. Statcast's
             default is players with at least 1 fielding attempt per game.
     """
-    url = f"https://baseballsavant.mlb.com/directional_outs_above_average?year={year}&min={min_opp}&team=&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _OUTFIELD_DIRECTIONAL_OAA.fetch(year, min_opp=min_opp)
 
 
-@cache.df_cache()
 def statcast_outfield_catch_prob(
-    year: int, min_opp: Union[int, str] = "q"
+    year: Years, min_opp: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves aggregated data for outfielder performance on fielding attempt types, binned into five star categories,
     for the given year and number of opportunities.
 
     ARGUMENTS
-            year: The year for which you wish to retrieve batted ball against data. Format: YYYY.
+            year: The year for which you wish to retrieve batted ball against data. Format: YYYY. A list or range of
+            years returns them all in one frame, with a year column.
             min_opp: The minimum number of opportunities for the player to be included in the result. Statcast's
             default is players with at least 1 fielding attempt per game.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/catch_probability?type=player&min={min_opp}&year={year}&total=&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _OUTFIELD_CATCH_PROB.fetch(year, min_opp=min_opp)
 
 
-@cache.df_cache()
-def statcast_outfielder_jump(year: int, min_att: Union[int, str] = "q") -> pd.DataFrame:
+def statcast_outfielder_jump(year: Years, min_att: Union[int, str] = "q") -> pd.DataFrame:
     """
     Retrieves data on outfielder's jump to the ball for the given year and number of attempts. Jump is calculated
     only for two star or harder plays (90% or less catch probabiility).
 
     ARGUMENTS
-            year: The year for which you wish to retrieve batted ball against data. Format: YYYY.
+            year: The year for which you wish to retrieve batted ball against data. Format: YYYY. A list or range of
+            years returns them all in one frame, with a year column.
             min_att: The minimum number of attempts for the player to be included in the result. Statcast's default
                     is players with at least 2 two star or harder fielding attempts per team game / 5.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/outfield_jump?year={year}&min={min_att}&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _OUTFIELDER_JUMP.fetch(year, min_att=min_att)
 
 
-@cache.df_cache()
 def statcast_catcher_poptime(
-    year: int, min_2b_att: int = 5, min_3b_att: int = 0
+    year: Years, min_2b_att: int = 5, min_3b_att: int = 0
 ) -> pd.DataFrame:
     """
     Retrieves pop time data for catchers given year and minimum stolen base attempts for second and third base.
@@ -138,34 +144,25 @@ def statcast_catcher_poptime(
     receiving point at the center of the fielder's base.
 
     ARGUMENTS
-            year: The year for which you wish to retrieve batted ball against data. Format: YYYY.
+            year: The year for which you wish to retrieve batted ball against data. Format: YYYY. A list or range of
+            years returns them all in one frame, with a year column.
             min_2b_att: The minimum number of stolen base attempts for second base against the catcher. Statcast's default is 5.
             min_3b_att: The minimum number of stolen base attempts for third base against the catcher. Statcast's default is 0.
     """
-    # currently no 2020 data
-    url = f"https://baseballsavant.mlb.com/leaderboard/poptime?year={year}&team=&min2b={min_2b_att}&min3b={min_3b_att}&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    return data
+    return _CATCHER_POPTIME.fetch(year, min_2b_att=min_2b_att, min_3b_att=min_3b_att)
 
 
-@cache.df_cache()
 def statcast_catcher_framing(
-    year: int, min_called_p: Union[int, str] = "q"
+    year: Years, min_called_p: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves the catcher's framing results for the given year and minimum called pitches. It uses eight zones around
     the strike zone (aka "shadow zone") and gives the percentage of time the catcher gets the strike called in each zone.
 
     ARGUMENTS
-            year: The year for which you wish to retrieve batted ball against data. Format: YYYY.
+            year: The year for which you wish to retrieve batted ball against data. Format: YYYY. A list or range of
+            years returns them all in one frame, with a year column.
             min_called_p: The minimum number of called pitches for the catcher in the shadow zone. Statcast's default
             is players with at least 6 called pitches in the shadow zone per team game.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/catcher-framing?type=catcher&seasonStart={year}&seasonEnd={year}&team=&min={min_called_p}&sortColumn=rv_tot&sortDirection=desc&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    print(data)
-    # CSV includes league average player, which we drop from the result
-    return data.loc[data.name.notna()].reset_index(drop=True)
+    return _CATCHER_FRAMING.fetch(year, min_called_p=min_called_p)
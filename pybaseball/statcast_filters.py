@@ -0,0 +1,145 @@
+import hashlib
+import re
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import quote
+
+import attr
+
+from .utils import norm_pitch_code, norm_positions
+
+_Values = Union[None, str, int, Iterable[Union[str, int]]]
+
+HANDS = ('L', 'R')
+ZONES = tuple(range(1, 15))
+COUNTS = tuple(f'{balls}-{strikes}' for balls in range(4) for strikes in range(3))
+
+
+def _each(values: _Values) -> Tuple[Union[str, int], ...]:
+    if values is None:
+        return ()
+    if isinstance(values, (str, int)):
+        return (values,)
+    return tuple(values)
+
+
+def _normalized(values: _Values, normalize: Callable[[str], str]) -> Tuple[str, ...]:
+    # Sorted and deduplicated, so equivalent filters build the same query (and hit the same cache entries)
+    return tuple(sorted({normalize(str(value)) for value in _each(values)}))
+
+
+def _one_of(allowed: Iterable[Union[str, int]], name: str) -> Callable[[str], str]:
+    allowed_values = {str(value) for value in allowed}
+
+    def _check(value: str) -> str:
+        if value.upper() not in allowed_values:
+            raise ValueError(f'{value} is not a valid {name}!')
+        return value.upper()
+
+    return _check
+
+
+def _pitch_types(values: _Values) -> Tuple[str, ...]:
+    return _normalized(values, norm_pitch_code)
+
+
+def _events(values: _Values) -> Tuple[str, ...]:
+    # Savant's own escaping of the underscores in event names, e.g. home\.\.run
+    return _normalized(values, lambda value: value.lower().replace('_', '\\.\\.'))
+
+
+def _zones(values: _Values) -> Tuple[str, ...]:
+    return _normalized(values, _one_of(ZONES, 'zone'))
+
+
+def _counts(values: _Values) -> Tuple[str, ...]:
+    return _normalized(values, _one_of(COUNTS, 'count'))
+
+
+def _outs(values: _Values) -> Tuple[str, ...]:
+    return _normalized(values, _one_of(range(3), 'number of outs'))
+
+
+def _innings(values: _Values) -> Tuple[str, ...]:
+    return _normalized(values, _one_of(range(1, 31), 'inning'))
+
+
+def _hand(value: Optional[str]) -> str:
+    return _one_of(HANDS, 'hand')(value) if value else ''
+
+
+def _position(value: Union[None, str, int]) -> str:
+    return norm_positions(value) if value is not None else ''
+
+
+@attr.s(frozen=True, kw_only=True)
+class StatcastFilter:
+    '''
+    Filters for a Baseball Savant Statcast search, applied by Savant so only the matching pitches are downloaded.
+    Each filter takes one value or a list of them, and matches any of them. Filters left empty match everything.
+
+        StatcastFilter(pitch_types='SL', counts=['0-2', '1-2', '2-2', '3-2'], pitcher_throws='R')
+
+    pitch_types : pitch codes or names, e.g. 'SL' or 'Slider' (see utils.norm_pitch_code)
+    events : plate appearance results, e.g. 'home_run', as in the events column
+    batted_ball_types : 'fly_ball', 'ground_ball', 'line_drive' or 'popup'
+    zones : Gameday zones, 1 to 14
+    counts : balls-strikes counts, e.g. '0-2'
+    outs : 0, 1 or 2
+    innings : inning numbers
+    pitcher_throws : 'L' or 'R'
+    batter_stands : 'L' or 'R'
+    position : the position of the player being searched for, e.g. 'SS' or 6 (see utils.norm_positions)
+    '''
+    pitch_types: Tuple[str, ...] = attr.ib(default=None, converter=_pitch_types)
+    events: Tuple[str, ...] = attr.ib(default=None, converter=_events)
+    batted_ball_types: Tuple[str, ...] = attr.ib(default=None, converter=_events)
+    zones: Tuple[str, ...] = attr.ib(default=None, converter=_zones)
+    counts: Tuple[str, ...] = attr.ib(default=None, converter=_counts)
+    outs: Tuple[str, ...] = attr.ib(default=None, converter=_outs)
+    innings: Tuple[str, ...] = attr.ib(default=None, converter=_innings)
+    pitcher_throws: str = attr.ib(default=None, converter=_hand)
+    batter_stands: str = attr.ib(default=None, converter=_hand)
+    position: str = attr.ib(default=None, converter=_position)
+
+    def params(self) -> Dict[str, str]:
+        ''' The Savant query parameters this filter sets, unencoded '''
+        def _multiple(values: Iterable[str]) -> str:
+            return ''.join(f'{value}|' for value in values)
+
+        params = {
+            'hfPT': _multiple(self.pitch_types),
+            'hfAB': _multiple(self.events),
+            'hfBBT': _multiple(self.batted_ball_types),
+            'hfZ': _multiple(self.zones),
+            'hfC': _multiple(value.replace('-', '') for value in self.counts),
+            'hfOuts': _multiple(self.outs),
+            'hfInn': _multiple(self.innings),
+            'pitcher_throws': self.pitcher_throws,
+            'batter_stands': self.batter_stands,
+            'position': self.position,
+        }
+        return {name: value for name, value in params.items() if value}
+
+    @property
+    def query(self) -> str:
+        ''' The parameters as a query string, in a stable order '''
+        return '&'.join(f'{name}={quote(value, safe="")}' for name, value in sorted(self.params().items()))
+
+    @property
+    def key(self) -> str:
+        ''' A short, stable name for this filter, for cache keys and paths. Empty if it doesn't filter anything '''
+        return hashlib.sha256(self.query.encode('utf-8')).hexdigest()[:16] if self.query else ''
+
+    def apply(self, url: str) -> str:
+        ''' Fill this filter's parameters into a Savant search url, replacing whatever they were set to '''
+        for name, value in self.params().items():
+            pattern = re.compile(rf'([?&]){re.escape(name)}=[^&]*')
+            replacement = f'{name}={quote(value, safe="")}'
+            if pattern.search(url):
+                url = pattern.sub(lambda match: match.group(1) + replacement, url, count=1)
+            else:
+                url = f'{url}{"" if url.endswith(("&", "?")) else "&"}{replacement}'
+        return url
+
+    def __str__(self) -> str:
+        return self.query
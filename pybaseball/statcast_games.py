@@ -0,0 +1,143 @@
+import asyncio
+import collections
+import concurrent.futures
+from datetime import date
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from tqdm import tqdm
+
+import pybaseball.datasources.statcast as statcast_ds
+
+from . import cache, statcast_store
+from .datahelpers import statcast_schema
+from .datasources import async_http, parse_pool
+from .statcast import _SC_SINGLE_GAME_REQUEST, _parse_small_request, _project, _read_columns
+
+
+def _game_partition(game_pk: int) -> str:
+    ''' Where a game fetched on its own is kept in the Statcast store '''
+    return f'game-{game_pk}'
+
+
+def _stored_days(store: statcast_store.StatcastStore, game_pks: List[int]) -> Dict[int, Tuple[str, date]]:
+    ''' For each of game_pks kept whole in the store, and not stale, the partition and day it can be loaded from '''
+    stored: Dict[int, Tuple[str, date]] = {}
+    for game_pk, locations in store.find_games(game_pks).items():
+        for partition, game_date in locations:
+            if store.is_whole_game_partition(partition) and not store.missing_days([game_date], partition):
+                stored[game_pk] = (partition, game_date)
+                break
+    return stored
+
+
+def _load_game(store: statcast_store.StatcastStore, game_pk: int, partition: str, game_date: date,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+    data = store.load_days([game_date], partition, columns)
+    if not data:
+        return pd.DataFrame()
+    return data[0][data[0]['game_pk'] == game_pk]
+
+
+def _update_stored(store: statcast_store.StatcastStore, game_pk: int, data: pd.DataFrame) -> None:
+    ''' Replace a game's rows with a newer fetch in the other partitions that hold it whole, where they are '''
+    for partition, _ in store.find_games([game_pk]).get(game_pk, []):
+        if partition != _game_partition(game_pk) and store.is_whole_game_partition(partition):
+            store.upsert_pitches(data, None if partition == statcast_store.ALL_TEAMS else partition)
+
+
+async def _fetch_game(fetcher: async_http.AsyncFetcher, game_pk: int,
+                      store: Optional[statcast_store.StatcastStore] = None,
+                      columns: Optional[List[str]] = None) -> pd.DataFrame:
+    '''
+    Fetch one game, and save it to the store if there is one, correcting its rows in any stored day that has it. A
+    game that's going into the store is parsed whole, since the store keeps every column, and only cut down to columns
+    after.
+    '''
+    content = await fetcher.get(statcast_ds.ROOT_URL + _SC_SINGLE_GAME_REQUEST.format(game_pk=game_pk))
+    data = await parse_pool.run_async(_parse_small_request, content, columns if store is None else None)
+    if data is None or data.empty:
+        return pd.DataFrame()
+    if store is not None:
+        loop = asyncio.get_running_loop()
+        game_date = pd.Timestamp(data['game_date'].iat[0]).date()
+        await loop.run_in_executor(None, store.save_days, game_date, game_date, data, _game_partition(game_pk),
+                                   statcast_store.GAME)
+        await loop.run_in_executor(None, _update_stored, store, game_pk, data)
+    return _project(data, columns)
+
+
+def statcast_games_iter(game_pks: Iterable[int], max_concurrency: int = async_http.DEFAULT_MAX_CONCURRENCY_PER_HOST,
+                        verbose: bool = True, typed: bool = True,
+                        columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Pulls statcast pitch-level data from Baseball Savant for a list of games, one game at a time.
+
+    Games are yielded in the order given, each sorted like statcast_single_game, while the next ones are fetched
+    concurrently over one pooled connection. Games without any data are skipped. With the cache enabled, games
+    whose days are already in the local Statcast store (from statcast(), or from an earlier call) are read from it,
+    and the games that are fetched are kept in it.
+
+    INPUTS:
+    game_pks: list of INT : the MLB game IDs (game_pk in statcast data) to retrieve
+    max_concurrency: int (defaults to 8) : the most requests to have in flight to Baseball Savant at once
+    verbose: bool (defaults to True) : whether to show a progress bar
+    typed: bool (defaults to True) : as for statcast()
+    columns: list of str (defaults to None) : as for statcast()
+    """
+    game_pks = list(dict.fromkeys(int(game_pk) for game_pk in game_pks))
+    store = statcast_store.StatcastStore.from_config(cache.config) if cache.config.enabled else None
+    stored = _stored_days(store, game_pks) if store is not None else {}
+    read_columns = _read_columns(columns)
+    games = collections.deque(game_pks)
+
+    with async_http.EventLoopThread() as loop_thread, tqdm(total=len(game_pks), disable=not verbose) as progress:
+        fetcher = async_http.AsyncFetcher(max_concurrency=max_concurrency)
+        loop_thread.submit(fetcher.__aenter__()).result()
+        queue: Deque[Tuple[int, Optional[concurrent.futures.Future]]] = collections.deque()
+
+        def _fill() -> None:
+            while games and sum(future is not None for _, future in queue) < max_concurrency:
+                game_pk = games.popleft()
+                future = None if game_pk in stored else loop_thread.submit(
+                    _fetch_game(fetcher, game_pk, store, read_columns)
+                )
+                queue.append((game_pk, future))
+
+        try:
+            _fill()
+            while queue:
+                game_pk, future = queue.popleft()
+                if future is None:
+                    assert store is not None
+                    data = _load_game(store, game_pk, *stored[game_pk], read_columns)
+                    if data.empty:
+                        # The game moved to another day since it was stored
+                        data = loop_thread.submit(_fetch_game(fetcher, game_pk, store, read_columns)).result()
+                else:
+                    data = future.result()
+                _fill()
+                progress.update(1)
+                if not data.empty:
+                    data = _project(data, columns)
+                    yield data if typed else statcast_schema.to_raw_dtypes(data)
+        finally:
+            for _, future in queue:
+                if future is not None:
+                    future.cancel()
+            loop_thread.submit(fetcher.__aexit__(None, None, None)).result()
+
+
+def statcast_games(game_pks: Iterable[int], max_concurrency: int = async_http.DEFAULT_MAX_CONCURRENCY_PER_HOST,
+                   verbose: bool = True, typed: bool = True, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Pulls statcast pitch-level data from Baseball Savant for a list of games, in one frame: the games in the order
+    given, each sorted like statcast_single_game. See statcast_games_iter for the inputs.
+    """
+    games = list(statcast_games_iter(game_pks, max_concurrency=max_concurrency, verbose=verbose, typed=typed,
+                                     columns=columns))
+    if not games:
+        return pd.DataFrame()
+    if typed:
+        statcast_schema.union_categories(games)
+    return pd.concat(games, axis=0)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from .cache import dataframe_utils, file_utils
+from .datahelpers import statcast_schema
+from .statcast_store import contiguous_ranges, date_span
+
+JOURNAL_FILENAME = 'journal.jsonl'
+CHUNK_DIRECTORY = 'chunks'
+# Keeps the Statcast schema's dtypes, and is memory mapped when the chunks are read back
+CHUNK_TYPE = 'feather'
+
+_Window = Tuple[date, date]
+
+
+def file_checksum(filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as chunk_file:
+        for block in iter(lambda: chunk_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class StatcastJob:
+    '''
+    A checkpointed statcast() query, kept in a directory so a run that crashes or is killed can pick up where it
+    left off.
+
+    The directory holds a journal (one JSON entry per line: the query, the planned request windows, then each
+    completed chunk with its row count and checksum) and the completed chunks, each written to its own file as soon
+    as it arrives. Resuming verifies every completed chunk against its checksum, and only fetches the days that
+    aren't covered by a good one.
+    '''
+
+    def __init__(self, directory: str, query: Dict[str, Any]):
+        self.directory = directory
+        self.query = query
+        self.planned: List[_Window] = []
+        self.completed: Dict[_Window, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        file_utils.mkdir(os.path.join(directory, CHUNK_DIRECTORY))
+        self._load()
+
+    @property
+    def journal_filename(self) -> str:
+        return os.path.join(self.directory, JOURNAL_FILENAME)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.journal_filename):
+            self._append({'event': 'job', 'query': self.query})
+            return
+
+        with open(self.journal_filename) as journal:
+            entries = []
+            for line in journal:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # The last line of a journal that was killed mid-write
+                    continue
+
+        if not entries or entries[0].get('event') != 'job' or entries[0].get('query') != self.query:
+            raise ValueError(
+                f"{self.directory} holds a job for a different query. Use another job_dir, or remove it to start over."
+            )
+        for entry in entries[1:]:
+            if entry['event'] == 'plan':
+                self.planned = [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in entry['windows']]
+            elif entry['event'] == 'chunk' and self._verify(entry):
+                self.completed[(date.fromisoformat(entry['start']), date.fromisoformat(entry['end']))] = entry
+
+    def _verify(self, entry: Dict[str, Any]) -> bool:
+        ''' Whether a completed chunk's file is still there, as it was written '''
+        if not entry['rows']:
+            return True
+        filename = os.path.join(self.directory, entry['file'])
+        return os.path.exists(filename) and file_checksum(filename) == entry['sha256']
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self._lock, open(self.journal_filename, 'a') as journal:
+            journal.write(json.dumps(entry) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def plan(self, windows: List[_Window]) -> None:
+        ''' Record the request windows for the job, unless it was planned on an earlier run '''
+        if not self.planned:
+            self.planned = list(windows)
+            self._append({'event': 'plan', 'windows': [[str(start), str(end)] for start, end in self.planned]})
+
+    def pending(self) -> List[_Window]:
+        '''
+        The windows still to fetch: the planned windows that no completed chunk covers, and what's left of any that
+        were only partly completed (e.g. split in half for hitting the row limit, with one half lost)
+        '''
+        covered: Set[date] = {day for start, end in self.completed for day in date_span(start, end)}
+        pending: List[_Window] = []
+        for start, end in self.planned:
+            missing = [day for day in date_span(start, end) if day not in covered]
+            if len(missing) == (end - start).days + 1:
+                pending.append((start, end))
+            elif missing:
+                pending += contiguous_ranges(missing)
+        return pending
+
+    def save_chunk(self, start: date, end: date, data: Optional[pd.DataFrame]) -> None:
+        ''' Write a completed chunk to disk, then journal it '''
+        rows = 0 if data is None else len(data)
+        entry: Dict[str, Any] = {'event': 'chunk', 'start': str(start), 'end': str(end), 'rows': rows}
+        if rows:
+            assert data is not None
+            relative = os.path.join(CHUNK_DIRECTORY, f'{start}_{end}.{CHUNK_TYPE}')
+            filename = os.path.join(self.directory, relative)
+            dataframe_utils.save_df(data.reset_index(drop=True), filename)
+            entry.update(file=relative, sha256=file_checksum(filename))
+        self._append(entry)
+        self.completed[(start, end)] = entry
+
+    def load(self, columns: Optional[List[str]] = None) -> List[pd.DataFrame]:
+        ''' The completed chunks that have any pitches, in date order '''
+        return [
+            statcast_schema.apply_schema(
+                dataframe_utils.load_df(os.path.join(self.directory, entry['file']), columns)
+            )
+            for _, entry in sorted(self.completed.items()) if entry['rows']
+        ]
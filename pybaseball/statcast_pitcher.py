@@ -1,17 +1,53 @@
-import io
-from http.client import HTTPException
-from typing import Optional, Union
+import numbers
+from typing import List, Optional, Union
 import warnings
 
 import pandas as pd
-import requests
 
-from .cache import cache
+from .datasources.savant_leaderboard import SavantLeaderboard, Years, combine_years
+from .statcast_filters import StatcastFilter
+from .statcast_players import statcast_players
 from .utils import (
     norm_pitch_code,
     sanitize_input,
-    split_request,
-    sanitize_statcast_columns,
+)
+
+
+_EXITVELO_BARRELS = SavantLeaderboard(
+    path="leaderboard/statcast?type=pitcher&year={year}&position=&team=&min={minBBE}&csv=true"
+)
+_EXPECTED_STATS = SavantLeaderboard(
+    path="leaderboard/expected_statistics?type=pitcher&year={year}&position=&team=&filterType=pa&min={minPA}&csv=true"
+)
+_PITCH_ARSENAL = SavantLeaderboard(
+    path="leaderboard/pitch-arsenals?year={year}&min={minP}&type={arsenal_type}&hand=&csv=true"
+)
+_ARSENAL_STATS = SavantLeaderboard(
+    path="leaderboard/pitch-arsenal-stats?type=pitcher&pitchType=&year={year}&team=&min={minPA}&csv=true"
+)
+_PITCH_MOVEMENT = SavantLeaderboard(
+    path="leaderboard/pitch-movement?year={year}&team=&min={minP}&pitch_type={pitch_type}&hand="
+    "&x=pitcher_break_x_hidden&z=pitcher_break_z_hidden&csv=true"
+)
+_ACTIVE_SPIN = SavantLeaderboard(
+    path="leaderboard/active-spin?year={year}_{_type}&min={minP}&hand=&csv=true"
+)
+# The CSV includes a null player with player id 999999
+_PERCENTILE_RANKS = SavantLeaderboard(
+    path="leaderboard/percentile-rankings?type=pitcher&year={year}&position=&team=&csv=true",
+    sanitize=False,
+    drop_null="player_name",
+)
+_SPIN_DIR_COMP = SavantLeaderboard(
+    path="leaderboard/spin-direction-comparison?year={year}&type={pitch_a} / {pitch_b}&min={minP}&team=&pov={pov}"
+    "&sort=11&sortDir=asc&csv=true"
+)
+_BAT_TRACKING = SavantLeaderboard(
+    path="leaderboard/bat-tracking/swing-path-attack-angle?dateStart={year}-01-01&dateEnd={year}-12-31"
+    "&gameType=Regular&minSwings={minSwings}&minGroupSwings=1&seasonStart={year}&seasonEnd={year}&type=pitcher&csv=true"
+)
+_RUN_VALUE = SavantLeaderboard(
+    path="leaderboard/swing-take?year={year}&team=&leverage=Neutral&group=Pitcher&type=All&sub_type=null&min=q&csv=True"
 )
 
 
@@ -19,6 +55,9 @@ def statcast_pitcher(
     start_dt: Optional[str] = None,
     end_dt: Optional[str] = None,
     player_id: Optional[int] = None,
+    filters: Optional[StatcastFilter] = None,
+    typed: bool = True,
+    columns: Optional[List[str]] = None,
 ) -> pd.DataFrame:
     """
     Pulls statcast pitch-level data from Baseball Savant for a given pitcher.
@@ -28,72 +67,62 @@ def statcast_pitcher(
         end_dt : YYYY-MM-DD : the final date for which you want data
         player_id : INT : the player's MLBAM ID. Find this by calling pybaseball.playerid_lookup(last_name, first_name),
         finding the correct player, and selecting their key_mlbam.
+        filters : StatcastFilter : optional, only get the pitches matching these filters (see statcast)
+        typed : bool : whether to use the compact Statcast schema, as for statcast (defaults to True)
+        columns : list of str : optional, only get these columns (see statcast)
+
+    This is statcast_players for one player, so it shares its cache: with the cache enabled, days already fetched for
+    the player (by either) aren't fetched again.
     """
-    sanitize_input(start_dt, end_dt, player_id)
+    start_dt, end_dt, _ = sanitize_input(start_dt, end_dt, player_id)
 
-    # sanitize_input will guarantee these are not None
-    assert start_dt
-    assert end_dt
+    # sanitize_input will guarantee this is not None
     assert player_id
 
-    url = "https://baseballsavant.mlb.com/statcast_search/csv?all=true&hfPT=&hfAB=&hfBBT=&hfPR=&hfZ=&stadium=&hfBBL=&hfNewZones=&hfGT=R%7CPO%7CS%7C=&hfSea=&hfSit=&player_type=pitcher&hfOuts=&opponent=&pitcher_throws=&batter_stands=&hfSA=&game_date_gt={}&game_date_lt={}&pitchers_lookup%5B%5D={}&team=&position=&hfRO=&home_road=&hfFlag=&metric_1=&hfInn=&min_pitches=0&min_results=0&group_by=name&sort_col=pitches&player_event_sort=h_launch_speed&sort_order=desc&min_abs=0&type=details&"
-    df = split_request(start_dt, end_dt, player_id, url)
+    return statcast_players([player_id], start_dt, end_dt, role='pitcher', filters=filters, typed=typed,
+                            columns=columns)
 
-    return df
 
-
-@cache.df_cache()
 def statcast_pitcher_exitvelo_barrels(
-    year: int, minBBE: Union[int, str] = "q"
+    year: Years, minBBE: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves batted ball against data for all qualified pitchers in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve batted ball against data. Format: YYYY.
+        year: The year for which you wish to retrieve batted ball against data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minBBE: The minimum number of batted ball against events for each pitcher. If a player falls below this
             threshold, they will be excluded from the results. If no value is specified, only qualified pitchers
             will be returned.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/statcast?type=pitcher&year={year}&position=&team=&min={minBBE}&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _EXITVELO_BARRELS.fetch(year, minBBE=minBBE)
 
 
-@cache.df_cache()
 def statcast_pitcher_expected_stats(
-    year: int, minPA: Union[int, str] = "q"
+    year: Years, minPA: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves expected stats based on quality of batted ball contact against in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve expected stats data. Format: YYYY.
+        year: The year for which you wish to retrieve expected stats data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minPA: The minimum number of plate appearances against for each player. If a player falls below this threshold,
             they will be excluded from the results. If no value is specified, only qualified pitchers will be returned.
     """
-
-    try:
-        url = f"https://baseballsavant.mlb.com/leaderboard/expected_statistics?type=pitcher&year={year}&position=&team=&filterType=pa&min={minPA}&csv=true"
-        res = requests.get(url, timeout=None).content
-        data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-        data = sanitize_statcast_columns(data)
-        return data
-    except Exception as e:
-        raise KeyError(f"URL {e} is unreachable")
+    return _EXPECTED_STATS.fetch(year, minPA=minPA)
 
 
-@cache.df_cache()
 def statcast_pitcher_pitch_arsenal(
-    year: int, minP: int = 250, arsenal_type: str = "avg_speed"
+    year: Years, minP: int = 250, arsenal_type: str = "avg_speed"
 ) -> pd.DataFrame:
     """
     Retrieves high level stats on each pitcher's arsenal in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve expected stats data. Format: YYYY.
+        year: The year for which you wish to retrieve expected stats data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minP: The minimum number of pitches thrown. If a player falls below this threshold, they will be excluded
             from the results. If no value is specified, only qualified pitchers will be returned.
         arsenal_type: The type of stat to retrieve for the pitchers' arsenals. Options include ["average_speed",
@@ -105,63 +134,51 @@ def statcast_pitcher_pitch_arsenal(
         raise ValueError(
             f"Not a valid arsenal_type. Must be one of {', '.join(arsenals)}."
         )
-    url = f"https://baseballsavant.mlb.com/leaderboard/pitch-arsenals?year={year}&min={minP}&type={arsenal_type}&hand=&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _PITCH_ARSENAL.fetch(year, minP=minP, arsenal_type=arsenal_type)
 
 
-@cache.df_cache()
-def statcast_pitcher_arsenal_stats(year: int, minPA: int = 25) -> pd.DataFrame:
+def statcast_pitcher_arsenal_stats(year: Years, minPA: int = 25) -> pd.DataFrame:
     """
     Retrieves assorted basic and advanced outcome stats for pitchers' arsenals in a given year. Run value and
         whiff % are defined on a per pitch basis, while all others are on a per PA basis.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve expected stats data. Format: YYYY.
+        year: The year for which you wish to retrieve expected stats data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minPA: The minimum number of plate appearances against. If a player falls below this threshold, they will be
             excluded from the results. If no value is specified, it will default to 25 plate appearances against.
     """
     # test to see if pitch types needs to be implemented or if user can subset on their own
-    url = f"https://baseballsavant.mlb.com/leaderboard/pitch-arsenal-stats?type=pitcher&pitchType=&year={year}&team=&min={minPA}&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _ARSENAL_STATS.fetch(year, minPA=minPA)
 
 
-@cache.df_cache()
 def statcast_pitcher_pitch_movement(
-    year: int, minP: Union[int, str] = "q", pitch_type: str = "FF"
+    year: Years, minP: Union[int, str] = "q", pitch_type: str = "FF"
 ) -> pd.DataFrame:
     """
     Retrieves pitch movement stats for all qualified pitchers with a specified pitch type for a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve expected stats data. Format: YYYY.
+        year: The year for which you wish to retrieve expected stats data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minP: The minimum number of pitches thrown. If a player falls below this threshold, they will be excluded
             from the results. If no value is specified, only qualified pitchers will be returned.
         pitch_type: The type of pitch to retrieve movement data on. Options include ["FF", "SIFT", "CH", "CUKC", "FC",
             "SL", "FS", "ALL"]. Pitch names also allowed. If no value is specified, it will default to "FF".
     """
     pitch_type = norm_pitch_code(pitch_type)
-    url = f"https://baseballsavant.mlb.com/leaderboard/pitch-movement?year={year}&team=&min={minP}&pitch_type={pitch_type}&hand=&x=pitcher_break_x_hidden&z=pitcher_break_z_hidden&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _PITCH_MOVEMENT.fetch(year, minP=minP, pitch_type=pitch_type)
 
 
-@cache.df_cache()
 def statcast_pitcher_active_spin(
-    year: int, minP: int = 250, _type: str = "spin-based"
+    year: Years, minP: int = 250, _type: str = "spin-based"
 ) -> pd.DataFrame:
     """
     Retrieves active spin stats on all of a pitchers' pitches in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve expected stats data. Format: YYYY.
+        year: The year for which you wish to retrieve expected stats data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minP: The minimum number of pitches thrown. If a player falls below this threshold, they will be excluded from
             the results. If no value is specified, only pitchers who threw 250 or more pitches will be returned.
 
@@ -176,48 +193,38 @@ def statcast_pitcher_active_spin(
       if we presumed only magnus was at play; this is a legacy method that can be useful in certain circumstances.
       (Label is "2020 - Observed" and can be read as "Active Spin using the Total Observed Movement method".)
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/active-spin?year={year}_{_type}&min={minP}&hand=&csv=true"
-    res = requests.get(url, timeout=None).content
-    if res and "<html" in res.decode("utf-8"):
-        # This did no go as planned. Statcast redirected us back to HTML :(
-        if _type == "spin-based":
-            warnings.warn(
-                f'Could not get active spin results for year {year} that are "spin-based". Trying to get the older "observed" results.'
-            )
-            return statcast_pitcher_active_spin(year, minP, "observed")
+    # One season, as SavantLeaderboard.fetch takes it, or several
+    seasons = [int(year)] if isinstance(year, (int, str, numbers.Integral)) else list(year)
+    frames = _ACTIVE_SPIN.fetch_years(seasons, minP=minP, _type=_type)
+    missing = [season for season, data in frames.items() if data.empty]
+    if missing and _type == "spin-based":
+        warnings.warn(
+            f'Could not get active spin results for {", ".join(map(str, missing))} that are "spin-based". '
+            'Trying to get the older "observed" results.'
+        )
+        frames.update(_ACTIVE_SPIN.fetch_years(missing, minP=minP, _type="observed"))
 
+    if all(data.empty for data in frames.values()):
         warnings.warn(
             "Statcast did not return any active spin results for the query provided."
         )
-        return pd.DataFrame()
-
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    if _type == "spin-based" and (data is None or data.empty):
-        return statcast_pitcher_active_spin(year, minP, "observed")
-
-    data = sanitize_statcast_columns(data)
-    return data
+    return frames[seasons[0]] if isinstance(year, (int, str, numbers.Integral)) else combine_years(frames)
 
 
-@cache.df_cache()
-def statcast_pitcher_percentile_ranks(year: int) -> pd.DataFrame:
+def statcast_pitcher_percentile_ranks(year: Years) -> pd.DataFrame:
     """
     Retrieves percentile ranks for each player in a given year, including batters with 2.1 PA per team game and 1.25
     for pitchers. It includes percentiles on expected stats, batted ball data, and spin rates, among others.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve percentile data. Format: YYYY.
+        year: The year for which you wish to retrieve percentile data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/percentile-rankings?type=pitcher&year={year}&position=&team=&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    # URL returns a null player with player id 999999, which we want to drop
-    return data.loc[data.player_name.notna()].reset_index(drop=True)
+    return _PERCENTILE_RANKS.fetch(year)
 
 
-@cache.df_cache()
 def statcast_pitcher_spin_dir_comp(
-    year: int,
+    year: Years,
     pitch_a: str = "FF",
     pitch_b: str = "CH",
     minP: int = 100,
@@ -227,7 +234,8 @@ def statcast_pitcher_spin_dir_comp(
     Retrieves spin comparisons between two pitches for qualifying pitchers in a given year.
 
     ARGUMENTS
-        year: The year for which you wish to retrieve percentile data. Format: YYYY.
+        year: The year for which you wish to retrieve percentile data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         pitch_a: The first pitch in the comparison. Valid pitches include "4-Seamer", "Sinker", "Changeup", "Curveball",
             "Cutter", "Slider", and "Sinker". Defaults to "4-Seamer". Pitch codes also accepted.
         pitch_b: The second pitch in the comparison and must be different from pitch_a. Valid pitches include "4-Seamer",
@@ -240,52 +248,34 @@ def statcast_pitcher_spin_dir_comp(
     pitch_a = norm_pitch_code(pitch_a, to_word=True)
     pitch_b = norm_pitch_code(pitch_b, to_word=True)
     pov = "Pit" if pitcher_pov else "Bat"
-    url = f"https://baseballsavant.mlb.com/leaderboard/spin-direction-comparison?year={year}&type={pitch_a} / {pitch_b}&min={minP}&team=&pov={pov}&sort=11&sortDir=asc&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _SPIN_DIR_COMP.fetch(year, pitch_a=pitch_a, pitch_b=pitch_b, minP=minP, pov=pov)
 
 
-@cache.df_cache()
 def statcast_pitcher_bat_tracking(
-    year: int, minSwings: Union[int, str] = "q"
+    year: Years, minSwings: Union[int, str] = "q"
 ) -> pd.DataFrame:
     """
     Retrieves the bat tracking data against for pitchers.
 
     ARGUMENTS
-        year: The year for which you wish to retreive bat tracking data. Format: YYYY
+        year: The year for which you wish to retreive bat tracking data. Format: YYYY. A list or range of years
+            returns them all in one frame, with a year column.
         minSwings: The minimum number of swings batters have taken against a pitcher. If a pitcher falls
         below the threshold, they will be excluded from the results. The default value is qualified.
     """
-    url = f"https://baseballsavant.mlb.com/leaderboard/bat-tracking/swing-path-attack-angle?dateStart={year}-01-01&dateEnd={year}-12-31&gameType=Regular&minSwings={minSwings}&minGroupSwings=1&seasonStart={year}&seasonEnd={year}&type=pitcher&csv=true"
-    res = requests.get(url, timeout=None).content
-    data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-    data = sanitize_statcast_columns(data)
-    return data
+    return _BAT_TRACKING.fetch(year, minSwings=minSwings)
 
 
-@cache.df_cache()
-def statcast_pitcher_run_value(year: int) -> pd.DataFrame():
+def statcast_pitcher_run_value(year: Years) -> pd.DataFrame:
     """
     Retrieve a Pitcher's Run Value from Baseball Savant's URL
 
     ARGUMENTS:
-        year(int): year data is retrieved for.
-        Data can only be retrieved for a single year at a time
+        year(int): year data is retrieved for. A list or range of years returns them all in one frame, with a
+        year column.
 
     Returns:
         data(pd.DataFrame): clean dataframe from Savant Return
 
     """
-    try:
-        url = f"https://baseballsavant.mlb.com/leaderboard/swing-take?year={year}&team=&leverage=Neutral&group=Pitcher&type=All&sub_type=null&min=q&csv=True"
-        res = requests.get(url, timeout=None).content
-        data = pd.read_csv(io.StringIO(res.decode("utf-8")))
-        data = sanitize_statcast_columns(data)
-        return data
-    except HTTPException as error:
-        raise ConnectionError(f"URL {error} is unreachable")
-    finally:
-        raise KeyError(f"An Error Occurred in Acquiring the Data")
+    return _RUN_VALUE.fetch(year)
@@ -8,15 +8,14 @@ Excel Workbook: http://baseball.physics.illinois.edu/trackman/MovementSpinEffici
 """
 
 from pybaseball import statcast_pitcher
+from pybaseball.datahelpers import statcast_features
+from pybaseball.datahelpers.statcast_features import (
+    DISTANCE_FROM_HOME_TO_MOUND, DISTANCE_TO_PLATE_AT_VELOCITY_CAPTURE, GRAVITATIONAL_ACCELERATION, K,
+    Y_VALUE_AT_FINAL_MEASUREMENT
+)
 import pandas as pd
 import numpy as np
 
-K = .005383  # Environmental Constant
-DISTANCE_FROM_HOME_TO_MOUND = 60.5
-DISTANCE_TO_PLATE_AT_VELOCITY_CAPTURE = 50
-Y_VALUE_AT_FINAL_MEASUREMENT = 17/12
-GRAVITATIONAL_ACCELERATION = 32.174
-
 
 def statcast_pitcher_spin(start_dt=None, end_dt=None, player_id=None):
     """
@@ -34,18 +33,10 @@ def statcast_pitcher_spin(start_dt=None, end_dt=None, player_id=None):
         A dataframe containing pitch-level statcast data for the given dates, along with four colummns added: Mx, Mz, phi, 
         and theta, as described in the docs: https://github.com/jldbc/pybaseball/blob/master/docs/statcast_pitcher_spin.md.
     """
-    pitcher_data = statcast_pitcher(start_dt, end_dt, player_id)
-
-    spin_df = pitcher_data[[
-        'release_extension', 'vx0', 'vy0', 'vz0', 'ax',
-        'ay', 'az', 'release_spin_rate']].copy()
-
-    spin_df = find_intermediate_values(spin_df)
-
-    pitcher_data[['Mx', 'Mz', 'phi', 'theta']] = spin_df[[
-        'Mx', 'Mz', 'phi', 'theta']].copy()
+    pitcher_data = statcast_pitcher(start_dt, end_dt, player_id, typed=False)
 
-    return pitcher_data
+    # The same calculations as find_intermediate_values, over whole columns without the intermediate ones
+    return statcast_features.add_features(pitcher_data, 'spin', inplace=True)
 
 # def get_statcast_pither_test_data():
 # 	df = pd.read_csv("tests/statcast_pitching_test_data.csv")
@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+from typing import AbstractSet, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Baseball Savant's search silently stops at this many rows, so a response this long may be missing pitches
+STATCAST_ROW_CAP = 25000
+# A full slate of 15 games is around 4,400 pitches
+DEFAULT_PITCHES_PER_DAY = 4500
+TEAMS_PER_LEAGUE_DAY = 15
+# Aim well under the cap, so a busier than expected window still fits
+DEFAULT_TARGET_FILL = 0.5
+# Savant gets slow to answer very long windows even when they're light
+DEFAULT_MAX_DAYS = 31
+# How far away an observed day can be and still inform the estimate for a day we haven't seen
+NEIGHBORHOOD_DAYS = 14
+
+
+def split_window(start: date, end: date) -> Tuple[Tuple[date, date], Tuple[date, date]]:
+    ''' Split a window of two or more days into two halves '''
+    if start >= end:
+        raise ValueError(f"Can't split the single day window {start}")
+    middle = start + timedelta(days=(end - start).days // 2)
+    return (start, middle), (middle + timedelta(days=1), end)
+
+
+def is_truncated(rows: int, row_cap: int = STATCAST_ROW_CAP) -> bool:
+    return rows >= row_cap
+
+
+class ChunkPlanner:
+    '''
+    Plans the request windows for a Statcast range query, so each request returns as many pitches as it safely can.
+
+    Windows are sized from the expected number of pitches on each day: the observed count if we've seen the day
+    (from an earlier response or the Statcast store manifest), the average of observed days nearby otherwise,
+    or a league-wide default. A window whose response still hits the row cap should be split with split_window
+    and fetched again, see is_truncated.
+    '''
+
+    def __init__(self, row_cap: int = STATCAST_ROW_CAP, target_fill: float = DEFAULT_TARGET_FILL,
+                 max_days: int = DEFAULT_MAX_DAYS, default_rows_per_day: float = DEFAULT_PITCHES_PER_DAY):
+        if not 0 < target_fill <= 1:
+            raise ValueError(f"target_fill must be in (0, 1], got {target_fill}")
+        self.row_cap = row_cap
+        self.target_fill = target_fill
+        self.max_days = max_days
+        self.default_rows_per_day = default_rows_per_day
+        self.rows_per_day: Dict[date, float] = {}
+
+    @classmethod
+    def for_team(cls, team: Optional[str] = None) -> 'ChunkPlanner':
+        ''' A planner with the default pitches per day for the whole league, or for one team '''
+        rows_per_day = DEFAULT_PITCHES_PER_DAY / TEAMS_PER_LEAGUE_DAY if team else DEFAULT_PITCHES_PER_DAY
+        return cls(default_rows_per_day=rows_per_day)
+
+    def observe(self, start: date, end: date, rows: int) -> None:
+        ''' Learn from a response covering start to end, inclusive, spreading its rows evenly over the days '''
+        days = (end - start).days + 1
+        for offset in range(days):
+            self.rows_per_day[start + timedelta(days=offset)] = rows / days
+
+    def observe_days(self, rows_per_day: Mapping[date, int]) -> None:
+        ''' Learn exact pitch counts per day, e.g. from the Statcast store manifest '''
+        self.rows_per_day.update(rows_per_day)
+
+    def expected_rows(self, day: date) -> float:
+        if day in self.rows_per_day:
+            return self.rows_per_day[day]
+        nearby = [
+            rows for offset in range(-NEIGHBORHOOD_DAYS, NEIGHBORHOOD_DAYS + 1)
+            for rows in [self.rows_per_day.get(day + timedelta(days=offset))] if rows
+        ]
+        return sum(nearby) / len(nearby) if nearby else self.default_rows_per_day
+
+    def plan(self, days: Iterable[date], max_days: Optional[int] = None,
+             empty_days: AbstractSet[date] = frozenset()) -> List[Tuple[date, date]]:
+        '''
+        Group days into request windows of consecutive days, each expected to come in under the row cap
+        (times target_fill), and at most max_days long.
+
+        Days in empty_days are known to have no games (see statcast_calendar), so they aren't requested for
+        themselves, but a window can run through them, since they don't add any rows.
+        '''
+        max_days = min(max_days or self.max_days, self.max_days)
+        budget = self.row_cap * self.target_fill
+        windows: List[Tuple[date, date]] = []
+        window_rows = 0.0
+        for day in sorted(set(days) - empty_days):
+            expected = self.expected_rows(day)
+            if windows:
+                start, end = windows[-1]
+                between = (end + timedelta(days=offset) for offset in range(1, (day - end).days))
+                if (all(gap in empty_days for gap in between) and (day - start).days < max_days and
+                        window_rows + expected <= budget):
+                    windows[-1] = (start, day)
+                    window_rows += expected
+                    continue
+            windows.append((day, day))
+            window_rows = expected
+        return windows
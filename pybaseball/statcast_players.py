@@ -0,0 +1,184 @@
+import asyncio
+import warnings
+from datetime import date
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from tqdm import tqdm
+
+import pybaseball.datasources.statcast as statcast_ds
+
+from . import cache, statcast_calendar, statcast_planner, statcast_store
+from .datahelpers import statcast_schema
+from .datasources import async_http, parse_pool
+from .statcast import (_TRUNCATED_WARNING, _combine, _fetcher, _parse_small_request, _partition, _project,
+                       _read_columns)
+from .statcast_filters import StatcastFilter
+from .utils import sanitize_date_range
+
+# pylint: disable=line-too-long
+_SC_PLAYERS_REQUEST = "/statcast_search/csv?all=true&hfPT=&hfAB=&hfBBT=&hfPR=&hfZ=&stadium=&hfBBL=&hfNewZones=&hfGT=R%7CPO%7CS%7C=&hfSea=&hfSit=&player_type={role}&hfOuts=&opponent=&pitcher_throws=&batter_stands=&hfSA=&game_date_gt={start_dt}&game_date_lt={end_dt}&{lookups}&team=&position=&hfRO=&home_road=&hfFlag=&metric_1=&hfInn=&min_pitches=0&min_results=0&group_by=name&sort_col=pitches&player_event_sort=h_launch_speed&sort_order=desc&min_abs=0&type=details&"
+
+ROLES = ('pitcher', 'batter')
+# Savant takes a list of players in one search, but a very long url gets rejected
+MAX_PLAYERS_PER_REQUEST = 20
+# Pitches per player per day, averaged over a season: a starter throws ~100 every fifth day, a regular sees ~16 a day
+PITCHES_PER_PLAYER_DAY = {'pitcher': 20, 'batter': 16}
+# A player's requests are light, so a window can span a season before it gets near the row limit
+MAX_WINDOW_DAYS = 366
+
+_Batch = Tuple[int, ...]
+
+
+def _players_request_url(role: str, player_ids: _Batch, start_dt: date, end_dt: date,
+                         filters: Optional[StatcastFilter] = None) -> str:
+    url = filters.apply(_SC_PLAYERS_REQUEST) if filters is not None else _SC_PLAYERS_REQUEST
+    lookups = '&'.join(f'{role}s_lookup%5B%5D={player_id}' for player_id in player_ids)
+    return url.format(role=role, start_dt=str(start_dt), end_dt=str(end_dt), lookups=lookups)
+
+
+def _player_partition(role: str, player_id: int, filters: Optional[StatcastFilter] = None) -> str:
+    ''' Where a player's days are kept in the Statcast store, apart from the league's and every other player's '''
+    partition = _partition(f'{role}-{player_id}', filters)
+    assert partition is not None
+    return partition
+
+
+def _batches(missing: Dict[int, List[date]]) -> List[Tuple[_Batch, List[date]]]:
+    '''
+    Group the players that are missing the same days, at most MAX_PLAYERS_PER_REQUEST to a group, so each group can
+    be fetched with one request per window.
+    '''
+    by_days: Dict[FrozenSet[date], List[int]] = {}
+    for player_id, days in missing.items():
+        if days:
+            by_days.setdefault(frozenset(days), []).append(player_id)
+    return [
+        (tuple(player_ids[index:index + MAX_PLAYERS_PER_REQUEST]), sorted(days))
+        for days, player_ids in by_days.items()
+        for index in range(0, len(player_ids), MAX_PLAYERS_PER_REQUEST)
+    ]
+
+
+async def _fetch_players_window(fetcher: async_http.AsyncFetcher, role: str, player_ids: _Batch, subq_start: date,
+                                subq_end: date,
+                                filters: Optional[StatcastFilter] = None,
+                                columns: Optional[List[str]] = None) -> List[Tuple[date, date, pd.DataFrame]]:
+    '''
+    Fetch one window for a batch of players, splitting it in half and fetching again while it hits the row limit.
+    Returns each window that was fetched, with its data (only columns of it, if given).
+    '''
+    content = await fetcher.get(statcast_ds.ROOT_URL + _players_request_url(role, player_ids, subq_start, subq_end,
+                                                                            filters))
+    data = await parse_pool.run_async(_parse_small_request, content, columns)
+    if statcast_planner.is_truncated(0 if data is None else len(data)):
+        if subq_start < subq_end:
+            halves = await asyncio.gather(*[
+                _fetch_players_window(fetcher, role, player_ids, *half, filters=filters, columns=columns)
+                for half in statcast_planner.split_window(subq_start, subq_end)
+            ])
+            return [window for half in halves for window in half]
+        warnings.warn(_TRUNCATED_WARNING.format(day=subq_start))
+    return [(subq_start, subq_end, data)]
+
+
+def _by_player(data: Optional[pd.DataFrame], role: str, player_ids: _Batch) -> Dict[int, pd.DataFrame]:
+    if data is None or data.empty:
+        return {player_id: pd.DataFrame() for player_id in player_ids}
+    return {player_id: data[data[role] == player_id] for player_id in player_ids}
+
+
+async def _handle_players_request(fetcher: async_http.AsyncFetcher, role: str, player_ids: List[int],
+                                  days: List[date], filters: Optional[StatcastFilter] = None,
+                                  verbose: bool = True, columns: Optional[List[str]] = None) -> List[pd.DataFrame]:
+    store = statcast_store.StatcastStore.from_config(cache.config) if cache.config.enabled else None
+    read_columns = _read_columns(columns, role)
+    partitions = {player_id: _player_partition(role, player_id, filters) for player_id in player_ids}
+    missing = {
+        player_id: store.missing_days(days, partitions[player_id]) if store is not None else days
+        for player_id in player_ids
+    }
+    dataframe_list: List[pd.DataFrame] = []
+    if store is not None:
+        for player_id in player_ids:
+            stored = sorted(set(days) - set(missing[player_id]))
+            dataframe_list += store.load_days(stored, partitions[player_id], read_columns)
+
+    def _save(batch: _Batch, windows: List[Tuple[date, date, pd.DataFrame]]) -> None:
+        for subq_start, subq_end, data in windows:
+            for player_id, player_data in _by_player(data, role, batch).items():
+                if store is not None:
+                    # Whether the search was cut off is down to every player's rows, not just this one's
+                    store.save_fetched(subq_start, subq_end, player_data, partitions[player_id],
+                                       response_rows=0 if data is None else len(data), kind=statcast_store.PLAYER)
+                dataframe_list.append(_project(player_data, read_columns))
+
+    async def _fetch(batch: _Batch, subq_start: date,
+                     subq_end: date) -> Tuple[_Batch, List[Tuple[date, date, pd.DataFrame]]]:
+        # The store keeps every column, so only a query that isn't stored can parse just the columns it wants
+        return batch, await _fetch_players_window(fetcher, role, batch, subq_start, subq_end, filters=filters,
+                                                  columns=read_columns if store is None else None)
+
+    # Days the league had no games on don't need asking about
+    empty_days = statcast_calendar.GameCalendar.from_store(store).empty_days if store is not None else frozenset()
+    requests = []
+    for batch, batch_days in _batches(missing):
+        planner = statcast_planner.ChunkPlanner(default_rows_per_day=len(batch) * PITCHES_PER_PLAYER_DAY[role],
+                                                max_days=MAX_WINDOW_DAYS)
+        requests += [
+            _fetch(batch, subq_start, subq_end)
+            for subq_start, subq_end in planner.plan(batch_days, empty_days=empty_days)
+        ]
+
+    with tqdm(total=len(requests), disable=not verbose) as progress:
+        for future in asyncio.as_completed(requests):
+            batch, windows = await future
+            await asyncio.get_running_loop().run_in_executor(None, _save, batch, windows)
+            progress.update(1)
+
+    return dataframe_list
+
+
+def statcast_players(player_ids: Iterable[int], start_dt: Optional[str] = None, end_dt: Optional[str] = None,
+                     role: str = 'pitcher', filters: Optional[StatcastFilter] = None, verbose: bool = True,
+                     parallel: bool = True, typed: bool = True, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Pulls statcast pitch-level data from Baseball Savant for several pitchers (or batters) at once.
+
+    Up to 20 players go in each request, and the requests are made concurrently. With the cache enabled, each
+    player's days are kept in the local Statcast store, so a later query for any of them (including statcast_pitcher
+    and statcast_batter) only fetches the days it doesn't have yet.
+
+    INPUTS:
+    player_ids: list of INT : the players' MLBAM IDs (see pybaseball.playerid_lookup)
+    start_dt: YYYY-MM-DD : the first date for which you want the players' statcast data
+    end_dt: YYYY-MM-DD : the last date for which you want the players' statcast data
+    role: 'pitcher' or 'batter' (defaults to 'pitcher') : whether to get the pitches thrown by the players,
+        or the pitches thrown to them
+    filters: StatcastFilter (defaults to None) : as for statcast()
+    verbose: bool (defaults to True) : whether to show a progress bar
+    parallel: bool (defaults to True) : whether to make the requests concurrently
+    typed: bool (defaults to True) : as for statcast()
+    columns: list of str (defaults to None) : as for statcast()
+    """
+    if role not in ROLES:
+        raise ValueError(f"role must be one of {', '.join(ROLES)}, got {role}")
+    player_ids = list(dict.fromkeys(int(player_id) for player_id in player_ids))
+    if not player_ids:
+        raise ValueError(
+            "At least one player ID is required. If you need to find a player's id, try "
+            "pybaseball.playerid_lookup(last_name, first_name) and use their key_mlbam."
+        )
+    start, end = sanitize_date_range(start_dt, end_dt)
+    statcast_calendar.update_valid_dates()
+    days = statcast_store.days_in_range(start, end, verbose)
+
+    async def _request() -> pd.DataFrame:
+        async with _fetcher(parallel) as fetcher:
+            return _project(
+                _combine(await _handle_players_request(fetcher, role, player_ids, days, filters, verbose, columns)),
+                columns
+            )
+
+    data = async_http.run(_request())
+    return data if typed else statcast_schema.to_raw_dtypes(data)
@@ -0,0 +1,446 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from . import cache, statcast_planner
+from .cache import cache_index, dataframe_utils, file_utils
+from .datahelpers import pitch_key, statcast_schema
+from .utils import statcast_date_range
+
+STORE_DIRECTORY = 'statcast'
+MANIFEST_FILENAME = 'manifest.sqlite3'
+MANIFEST_VERSION = 1
+ALL_TEAMS = 'all'
+
+# What a partition holds, recorded when its days are saved. The league's, a team's and a single game's partitions
+# hold every pitch of their games; a filtered query's or a player's only hold some of them.
+LEAGUE = 'league'
+TEAM = 'team'
+GAME = 'game'
+FILTERED = 'filtered'
+PLAYER = 'player'
+PARTITION_KINDS = (LEAGUE, TEAM, GAME, FILTERED, PLAYER)
+WHOLE_GAME_KINDS = frozenset({LEAGUE, TEAM, GAME})
+
+# Savant keeps correcting a game for a few days after it's played (pitch classifications, scoring changes, etc.)
+DEFAULT_SETTLE_DAYS = 3
+# How long a day fetched before it settled is trusted before it is fetched again
+DEFAULT_UNSETTLED_TTL = timedelta(hours=12)
+
+# The stores from_config opened, by directory and cache type
+_stores: Dict[Tuple[str, str], 'StatcastStore'] = {}
+_stores_lock = threading.Lock()
+
+
+def date_span(start: date, end: date) -> Iterator[date]:
+    ''' Every day from start to end, inclusive '''
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def days_in_range(start: date, end: date, verbose: bool = True) -> List[date]:
+    ''' Every day from start to end, inclusive, that's in a Statcast season '''
+    return [
+        day for subq_start, subq_end in statcast_date_range(start, end, 1, verbose)
+        for day in date_span(subq_start, subq_end)
+    ]
+
+
+def contiguous_ranges(days: Iterable[date], max_days: Optional[int] = None) -> List[Tuple[date, date]]:
+    '''
+    Collapse days into (start, end) ranges of consecutive days, each at most max_days long.
+    '''
+    ranges: List[Tuple[date, date]] = []
+    for day in sorted(set(days)):
+        if ranges:
+            start, end = ranges[-1]
+            if day == end + timedelta(days=1) and (max_days is None or (day - start).days < max_days):
+                ranges[-1] = (start, day)
+                continue
+        ranges.append((day, day))
+    return ranges
+
+
+class StatcastStore(cache.CacheStore):
+    '''
+    A local store of pitch-level Statcast data partitioned by game_date (and optionally team),
+    with a manifest of when each day was fetched and how many pitches it had.
+
+    Range queries are planned against the manifest, so only days that are missing or stale need to go to
+    Baseball Savant, no matter how the requested range overlaps what was fetched before.
+    Days with no games are recorded in the manifest with zero rows and no file.
+
+    The store in the cache directory is looked after with the cache records: it's cleared by cache.purge(), its stale
+    days are removed by cache.flush(), and its days count towards config.max_bytes and are evicted by cache.compact().
+    '''
+
+    def __init__(self, directory: str, cache_type: str = cache.CacheConfig.DEFAULT_CACHE_TYPE,
+                 settle_days: int = DEFAULT_SETTLE_DAYS, unsettled_ttl: timedelta = DEFAULT_UNSETTLED_TTL):
+        self.directory = directory
+        self.cache_type = cache_type
+        self.settle_days = settle_days
+        self.unsettled_ttl = unsettled_ttl
+        self.manifest_filename = os.path.join(directory, MANIFEST_FILENAME)
+        file_utils.mkdir(directory)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.manifest_filename, timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS days ('
+                'game_date TEXT NOT NULL, team TEXT NOT NULL, rows INTEGER NOT NULL, fetched_at REAL NOT NULL, '
+                'filename TEXT, PRIMARY KEY (game_date, team))'
+            )
+            # Which day each stored game is kept under, so a game can be served without knowing its date
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS games ('
+                'game_pk INTEGER NOT NULL, team TEXT NOT NULL, game_date TEXT NOT NULL, PRIMARY KEY (game_pk, team))'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS partitions (team TEXT NOT NULL PRIMARY KEY, kind TEXT NOT NULL)'
+            )
+        version = self._connection.execute('PRAGMA user_version').fetchone()[0]
+        if version < 1:
+            self._add_usage_columns()
+        if version < MANIFEST_VERSION:
+            with self._connection:
+                self._connection.execute(f'PRAGMA user_version = {MANIFEST_VERSION}')
+
+    def _add_usage_columns(self) -> None:
+        ''' Track the size, last access time and hit count of each day, so days can be evicted with cache records '''
+        with self._connection:
+            self._connection.execute('ALTER TABLE days ADD COLUMN size INTEGER NOT NULL DEFAULT 0')
+            self._connection.execute('ALTER TABLE days ADD COLUMN last_access REAL NOT NULL DEFAULT 0')
+            self._connection.execute('ALTER TABLE days ADD COLUMN hits INTEGER NOT NULL DEFAULT 0')
+
+        usage = []
+        for game_date, team, filename in self._connection.execute(
+                'SELECT game_date, team, filename FROM days WHERE filename IS NOT NULL').fetchall():
+            try:
+                day_file = os.path.join(self.directory, filename)
+                usage.append((os.path.getsize(day_file), os.path.getmtime(day_file), game_date, team))
+            except OSError:
+                continue
+        with self._connection:
+            self._connection.executemany(
+                'UPDATE days SET size = ?, last_access = ? WHERE game_date = ? AND team = ?', usage
+            )
+
+    @classmethod
+    def from_config(cls, config: Optional[cache.CacheConfig] = None) -> 'StatcastStore':
+        '''
+        The store that lives in the cache directory. It's opened once per directory, and the same store (and its
+        manifest connection) is returned after that, unless the manifest has been deleted since.
+        '''
+        config = config or cache.config
+        key = (os.path.join(config.cache_directory, STORE_DIRECTORY), config.cache_type)
+        with _stores_lock:
+            store = _stores.get(key)
+            if store is None or not os.path.isfile(store.manifest_filename):
+                if store is not None:
+                    store.close()
+                store = _stores[key] = cls(*key)
+            return store
+
+    def close(self) -> None:
+        ''' Close the manifest's connection. The store can't be used after this. '''
+        with self._lock:
+            self._connection.close()
+
+    def day_filename(self, game_date: date, team: Optional[str] = None) -> str:
+        return os.path.join(
+            self.directory, team or ALL_TEAMS, str(game_date.year), f'{game_date.isoformat()}.{self.cache_type}'
+        )
+
+    def manifest(self, team: Optional[str] = None) -> pd.DataFrame:
+        ''' The manifest of stored days: game_date, rows and fetched_at '''
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT game_date, rows, fetched_at FROM days WHERE team = ? ORDER BY game_date',
+                (team or ALL_TEAMS,)
+            ).fetchall()
+        manifest = pd.DataFrame(rows, columns=['game_date', 'rows', 'fetched_at'])
+        manifest['game_date'] = pd.to_datetime(manifest['game_date']).dt.date
+        manifest['fetched_at'] = pd.to_datetime(manifest['fetched_at'], unit='s')
+        return manifest
+
+    def _entries(self, days: Iterable[date], team: Optional[str]) -> Dict[date, Tuple[int, float, Optional[str]]]:
+        wanted = {day.isoformat() for day in days}
+        if not wanted:
+            return {}
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT game_date, rows, fetched_at, filename FROM days '
+                'WHERE team = ? AND game_date BETWEEN ? AND ?',
+                (team or ALL_TEAMS, min(wanted), max(wanted))
+            ).fetchall()
+        return {
+            date.fromisoformat(game_date): (count, fetched_at, filename)
+            for game_date, count, fetched_at, filename in rows if game_date in wanted
+        }
+
+    def find_games(self, game_pks: Iterable[int]) -> Dict[int, List[Tuple[str, date]]]:
+        ''' The partitions and days each of game_pks is stored under, for those stored anywhere '''
+        wanted = sorted({int(game_pk) for game_pk in game_pks})
+        found: Dict[int, List[Tuple[str, date]]] = {}
+        # Stay under SQLite's limit on the number of parameters
+        for index in range(0, len(wanted), 500):
+            batch = wanted[index:index + 500]
+            with self._lock:
+                rows = self._connection.execute(
+                    f'SELECT game_pk, team, game_date FROM games WHERE game_pk IN ({", ".join("?" * len(batch))}) '
+                    'ORDER BY game_pk, team',
+                    batch
+                ).fetchall()
+            for game_pk, team, game_date in rows:
+                found.setdefault(game_pk, []).append((team, date.fromisoformat(game_date)))
+        return found
+
+    def partition_kind(self, team: Optional[str] = None) -> Optional[str]:
+        ''' What a partition holds (one of PARTITION_KINDS), or None if nothing has been saved to it '''
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT kind FROM partitions WHERE team = ?', (team or ALL_TEAMS,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def is_whole_game_partition(self, team: Optional[str] = None) -> bool:
+        ''' Whether a partition holds every pitch of the games it has, so a game can be served from it '''
+        return self.partition_kind(team) in WHOLE_GAME_KINDS
+
+    def row_counts(self, days: Iterable[date], team: Optional[str] = None) -> Dict[date, int]:
+        ''' The number of pitches stored for each of days that has been fetched '''
+        return {day: entry[0] for day, entry in self._entries(days, team).items()}
+
+    def is_settled(self, game_date: date, fetched_at: float) -> bool:
+        ''' Whether a day was fetched after Savant stopped correcting it '''
+        settled = datetime.combine(game_date + timedelta(days=self.settle_days), datetime.min.time())
+        return datetime.fromtimestamp(fetched_at) >= settled
+
+    def is_fresh(self, game_date: date, fetched_at: float, now: Optional[datetime] = None) -> bool:
+        '''
+        A day is fresh if it was fetched after it settled, or if it was fetched recently.
+        '''
+        now = now or datetime.now()
+        return self.is_settled(game_date, fetched_at) or now - datetime.fromtimestamp(fetched_at) < self.unsettled_ttl
+
+    def game_days(self, team: Optional[str] = None) -> Dict[date, bool]:
+        '''
+        Whether each stored day had games: True if it had pitches, False if it had none when fetched after it settled.
+        A day without pitches that was fetched before it settled (e.g. before the games were played) is left out.
+        '''
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT game_date, rows, fetched_at FROM days WHERE team = ?', (team or ALL_TEAMS,)
+            ).fetchall()
+        game_days = {}
+        for game_date, count, fetched_at in rows:
+            day = date.fromisoformat(game_date)
+            if count > 0 or self.is_settled(day, fetched_at):
+                game_days[day] = count > 0
+        return game_days
+
+    def missing_days(self, days: Iterable[date], team: Optional[str] = None,
+                     now: Optional[datetime] = None) -> List[date]:
+        ''' The days that aren't stored yet, or whose stored data is stale '''
+        days = list(days)
+        entries = self._entries(days, team)
+        return sorted(
+            day for day in set(days)
+            if day not in entries or not self.is_fresh(day, entries[day][1], now)
+        )
+
+    def load_days(self, days: Iterable[date], team: Optional[str] = None,
+                  columns: Optional[List[str]] = None) -> List[pd.DataFrame]:
+        '''
+        Load the stored data for the days that have any, in date order, with the Statcast schema
+        (a csv store doesn't keep dtypes). If columns is given, only those columns are read.
+        '''
+        entries = self._entries(days, team)
+        stored = [day for day in sorted(entries) if entries[day][0] > 0 and entries[day][2]]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'UPDATE days SET hits = hits + 1, last_access = ? WHERE game_date = ? AND team = ?',
+                [(time.time(), day.isoformat(), team or ALL_TEAMS) for day in stored]
+            )
+        return [
+            statcast_schema.apply_schema(
+                dataframe_utils.load_df(os.path.join(self.directory, entries[day][2]), columns)  # type: ignore
+            )
+            for day in stored
+        ]
+
+    def save_days(self, start: date, end: date, data: Optional[pd.DataFrame], team: Optional[str] = None,
+                  kind: Optional[str] = None) -> None:
+        '''
+        Store the result of a fetch covering start to end, inclusive.
+        The data is split by game_date, and days in the range without any data are recorded as empty.
+        kind is what the partition holds (one of PARTITION_KINDS), which defaults to the league's or a team's.
+        '''
+        kind = kind or (TEAM if team else LEAGUE)
+        if kind not in PARTITION_KINDS:
+            raise ValueError(f"Invalid partition kind: {kind}. Choose from {', '.join(PARTITION_KINDS)}")
+        by_day: Dict[date, pd.DataFrame] = {}
+        if data is not None and not data.empty:
+            game_dates = pd.to_datetime(data['game_date']).dt.date
+            by_day = {day: frame for day, frame in data.groupby(game_dates, sort=False)}
+
+        fetched_at = time.time()
+        entries = []
+        games = []
+        for day in date_span(start, end):
+            frame = by_day.get(day)
+            filename = None
+            size = 0
+            if frame is not None:
+                filename = self.day_filename(day, team)
+                file_utils.mkdir(os.path.dirname(filename))
+                dataframe_utils.save_df(frame, filename)
+                size = os.path.getsize(filename)
+                filename = os.path.relpath(filename, self.directory)
+                if 'game_pk' in frame.columns:
+                    games += [
+                        (int(game_pk), team or ALL_TEAMS, day.isoformat())
+                        for game_pk in frame['game_pk'].dropna().unique()
+                    ]
+            entries.append((day.isoformat(), team or ALL_TEAMS, 0 if frame is None else len(frame), fetched_at,
+                            filename, size, fetched_at))
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO days (game_date, team, rows, fetched_at, filename, size, last_access, hits) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, 0)',
+                entries
+            )
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO games (game_pk, team, game_date) VALUES (?, ?, ?)', games
+            )
+            self._connection.execute(
+                'INSERT OR REPLACE INTO partitions (team, kind) VALUES (?, ?)', (team or ALL_TEAMS, kind)
+            )
+        cache.enforce_max_bytes()
+
+    def save_fetched(self, start: date, end: date, data: Optional[pd.DataFrame], partition: Optional[str] = None,
+                     row_cap: int = statcast_planner.STATCAST_ROW_CAP, response_rows: Optional[int] = None,
+                     kind: Optional[str] = None) -> bool:
+        '''
+        save_days for a response from Baseball Savant, unless it hit the row limit. A window is split until it fits,
+        so only a single day can come back truncated, and that's only part of the day, so it's left to be fetched
+        again. If data is only part of the response (e.g. one player's pitches from a search for several),
+        response_rows is the size of the whole response. Returns whether data was saved.
+        '''
+        rows = response_rows if response_rows is not None else 0 if data is None else len(data)
+        if statcast_planner.is_truncated(rows, row_cap):
+            return False
+        self.save_days(start, end, data, partition, kind)
+        return True
+
+    def upsert_pitches(self, data: Optional[pd.DataFrame], team: Optional[str] = None) -> List[date]:
+        '''
+        Merge a newer fetch of some of a stored day's pitches (e.g. one game) into the day: the pitches it has again
+        replace their stored rows, new pitches are added, and the rest of the day is left as it was. Days that aren't
+        stored are skipped, since data may only be part of them. Returns the days that were updated.
+        '''
+        if data is None or data.empty:
+            return []
+        game_dates = pd.to_datetime(data['game_date']).dt.date
+        entries = self._entries(set(game_dates), team)
+
+        updated = []
+        counts = []
+        games = []
+        for day, frame in data.groupby(game_dates, sort=True):
+            count, _, filename = entries.get(day, (0, 0.0, None))
+            if not count or not filename:
+                continue
+            filename = os.path.join(self.directory, filename)
+            stored = statcast_schema.apply_schema(dataframe_utils.load_df(filename))
+            merged = pitch_key.upsert(stored, statcast_schema.apply_schema(frame.copy())).sort_values(
+                ['game_date', *pitch_key.PITCH_KEY], ascending=False, kind='mergesort'
+            )
+            dataframe_utils.save_df(merged.reset_index(drop=True), filename)
+            updated.append(day)
+            counts.append((len(merged), os.path.getsize(filename), day.isoformat(), team or ALL_TEAMS))
+            games += [
+                (int(game_pk), team or ALL_TEAMS, day.isoformat()) for game_pk in frame['game_pk'].dropna().unique()
+            ]
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'UPDATE days SET rows = ?, size = ? WHERE game_date = ? AND team = ?', counts
+            )
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO games (game_pk, team, game_date) VALUES (?, ?, ?)', games
+            )
+        return updated
+
+    def total_size(self) -> int:
+        with self._lock:
+            return int(self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM days').fetchone()[0])
+
+    def usage(self) -> List[Tuple[Any, cache_index.Usage]]:
+        ''' Every stored (game_date, team) with a file, with its usage. A day that isn't fresh counts as expired. '''
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT game_date, team, fetched_at, size, hits, last_access FROM days WHERE filename IS NOT NULL'
+            ).fetchall()
+        now = datetime.now()
+        return [
+            ((game_date, team),
+             cache_index.Usage(size, not self.is_fresh(date.fromisoformat(game_date), fetched_at, now), hits,
+                               last_access))
+            for game_date, team, fetched_at, size, hits, last_access in rows
+        ]
+
+    def evict(self, entry: Any) -> None:
+        ''' Remove a (game_date, team) from usage, so it's fetched again the next time it's needed '''
+        self._remove([entry])
+
+    def _remove(self, entries: List[Tuple[str, str]]) -> None:
+        with self._lock:
+            filenames = [
+                row[0] for game_date, team in entries for row in self._connection.execute(
+                    'SELECT filename FROM days WHERE game_date = ? AND team = ? AND filename IS NOT NULL',
+                    (game_date, team)
+                ).fetchall()
+            ]
+            with self._connection:
+                self._connection.executemany('DELETE FROM days WHERE game_date = ? AND team = ?', entries)
+                self._connection.executemany('DELETE FROM games WHERE game_date = ? AND team = ?', entries)
+        for filename in filenames:
+            try:
+                file_utils.remove(os.path.join(self.directory, filename))
+            except OSError:
+                pass  # already gone
+
+    def clear(self) -> None:
+        ''' Remove every stored day '''
+        with self._lock:
+            entries = self._connection.execute('SELECT game_date, team FROM days').fetchall()
+        self._remove(entries)
+
+    def flush(self) -> None:
+        ''' Remove the days that aren't fresh, which would be fetched again before they're used anyway '''
+        with self._lock:
+            rows = self._connection.execute('SELECT game_date, team, fetched_at FROM days').fetchall()
+        now = datetime.now()
+        self._remove([
+            (game_date, team) for game_date, team, fetched_at in rows
+            if not self.is_fresh(date.fromisoformat(game_date), fetched_at, now)
+        ])
+
+
+def _open_in_cache(config: cache.CacheConfig) -> Optional[StatcastStore]:
+    ''' The store in config's cache directory, if it has one '''
+    if not os.path.isfile(os.path.join(config.cache_directory, STORE_DIRECTORY, MANIFEST_FILENAME)):
+        return None
+    return StatcastStore.from_config(config)
+
+
+cache.register_store(_open_in_cache)
@@ -0,0 +1,209 @@
+import collections
+import concurrent.futures
+import os
+from datetime import date
+from typing import Deque, Dict, Generator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tqdm import tqdm
+
+from . import cache, statcast_calendar, statcast_store
+from .cache import file_utils
+from .datahelpers import statcast_schema
+from .datasources import async_http
+from .statcast import (_fetch_window, _fetcher, _partition, _partition_kind, _plan, _planner, _project,
+                       _read_columns)
+from .statcast_filters import StatcastFilter
+from .utils import sanitize_date_range
+
+COMMON_METADATA_FILENAME = '_common_metadata'
+
+# (start, end, whether it's served from the store)
+_Job = Tuple[date, date, bool]
+
+
+def _jobs(days: List[date], team: Optional[str], store: Optional[statcast_store.StatcastStore],
+          filters: Optional[StatcastFilter] = None) -> List[_Job]:
+    if store is None:
+        return [(start, end, False) for start, end in _plan(days, team, filters=filters)]
+    missing = store.missing_days(days, _partition(team, filters))
+    stored = sorted(set(days) - set(missing))
+    return sorted(
+        [(start, end, False) for start, end in _plan(missing, team, store=store, filters=filters)] +
+        [(start, end, True) for start, end in _planner(team, filters).plan(stored)]
+    )
+
+
+def _earliest_first(dataframes: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    # Every response, and every stored day, is sorted latest pitch first
+    non_empty = [data.iloc[::-1] for data in dataframes if data is not None and not data.empty]
+    statcast_schema.union_categories(non_empty)
+    return pd.concat(non_empty, axis=0).reset_index(drop=True) if non_empty else pd.DataFrame()
+
+
+def statcast_iter(start_dt: Optional[str] = None, end_dt: Optional[str] = None, team: Optional[str] = None,
+                  verbose: bool = True, parallel: bool = True, typed: bool = True,
+                  filters: Optional[StatcastFilter] = None,
+                  columns: Optional[List[str]] = None) -> Generator[pd.DataFrame, None, None]:
+    """
+    Pulls statcast play-level data from Baseball Savant for a given date range, one chunk at a time.
+
+    Chunks are yielded in date order, earliest pitch first, as soon as they arrive. Only the chunks being fetched
+    ahead are held in memory, so a decade of data can be processed in the memory a few days take.
+    Each chunk covers one request window (a few days, see statcast()). With the cache enabled, days already in the
+    local store are read from it instead of Baseball Savant.
+
+    INPUTS:
+    start_dt: YYYY-MM-DD : the first date for which you want statcast data
+    end_dt: YYYY-MM-DD : the last date for which you want statcast data
+    team: optional (defaults to None) : city abbreviation of the team you want data for (e.g. SEA or BOS)
+    verbose: bool (defaults to True) : whether to show a progress bar
+    parallel: bool (defaults to True) : whether to fetch the next chunks while the current one is processed
+    typed: bool (defaults to True) : as for statcast()
+    filters: StatcastFilter (defaults to None) : as for statcast()
+    columns: list of str (defaults to None) : as for statcast()
+    """
+    start, end = sanitize_date_range(start_dt, end_dt)
+    store = statcast_store.StatcastStore.from_config(cache.config) if cache.config.enabled else None
+    if store is not None:
+        statcast_calendar.update_valid_dates(store)
+    days = statcast_store.days_in_range(start, end, verbose)
+    partition = _partition(team, filters)
+    read_columns = _read_columns(columns)
+    jobs = collections.deque(_jobs(days, team, store, filters))
+    lookahead = async_http.DEFAULT_MAX_CONCURRENCY_PER_HOST if parallel else 1
+
+    row_cap = _planner(team, filters).row_cap
+
+    def _save(subq_start: date, subq_end: date, data: pd.DataFrame) -> None:
+        if store is not None:
+            store.save_fetched(subq_start, subq_end, data, partition, row_cap, kind=_partition_kind(team, filters))
+
+    with async_http.EventLoopThread() as loop_thread, tqdm(total=len(jobs), disable=not verbose) as progress:
+        fetcher = _fetcher(parallel)
+        loop_thread.submit(fetcher.__aenter__()).result()
+        queue: Deque[Tuple[_Job, Optional[concurrent.futures.Future]]] = collections.deque()
+
+        def _fill() -> None:
+            while jobs and sum(future is not None for _, future in queue) < lookahead:
+                job = jobs.popleft()
+                subq_start, subq_end, stored = job
+                future = None if stored else loop_thread.submit(
+                    # The store keeps every column, so only parse just the columns wanted if there's no store
+                    _fetch_window(fetcher, subq_start, subq_end, team=team, on_result=_save, filters=filters,
+                                  columns=read_columns if store is None else None)
+                )
+                queue.append((job, future))
+
+        try:
+            _fill()
+            while queue:
+                (subq_start, subq_end, stored), future = queue.popleft()
+                if future is None:
+                    assert store is not None
+                    data = _earliest_first(store.load_days(statcast_store.date_span(subq_start, subq_end), partition,
+                                                           read_columns))
+                else:
+                    data = _earliest_first([future.result()])
+                data = _project(data, columns)
+                # Keep the next chunks coming while the caller works on this one
+                _fill()
+                progress.update(1)
+                if not data.empty:
+                    yield data if typed else statcast_schema.to_raw_dtypes(data)
+        finally:
+            for _, future in queue:
+                if future is not None:
+                    future.cancel()
+            loop_thread.submit(fetcher.__aexit__(None, None, None)).result()
+
+
+def _unify_type(existing: pa.DataType, new: pa.DataType) -> pa.DataType:
+    if existing == new or pa.types.is_null(new):
+        return existing
+    if pa.types.is_null(existing):
+        return new
+    numeric = (pa.types.is_integer, pa.types.is_floating)
+    if any(check(existing) for check in numeric) and any(check(new) for check in numeric):
+        return pa.float64()
+    return pa.string()
+
+
+class StatcastParquetWriter:
+    '''
+    Writes chunks of Statcast data to a parquet dataset, one file per chunk, partitioned by year:
+    {path}/{year}/statcast_{first date}_{last date}.parquet
+
+    A column can come back with different types from chunk to chunk (e.g. all null in one, strings in the next),
+    so the writer keeps a schema every file can be read as in {path}/_common_metadata. Use read_statcast_parquet
+    to read the dataset back with it.
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        file_utils.mkdir(path)
+        self._types: Dict[str, pa.DataType] = {}
+        metadata = os.path.join(path, COMMON_METADATA_FILENAME)
+        if os.path.exists(metadata):
+            self._types = {field.name: field.type for field in pq.read_schema(metadata)}
+
+    @property
+    def schema(self) -> pa.Schema:
+        return pa.schema(list(self._types.items()))
+
+    def write(self, data: pd.DataFrame) -> Optional[str]:
+        ''' Write a chunk, returning the file it was written to '''
+        if data.empty:
+            return None
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        # All null columns carry no type information, so don't let them pin one
+        for index, column in enumerate(table.columns):
+            if column.null_count == len(column) and not pa.types.is_null(column.type):
+                table = table.set_column(index, pa.field(table.field(index).name, pa.null()), pa.nulls(len(column)))
+        for field in table.schema:
+            self._types[field.name] = _unify_type(self._types.get(field.name, pa.null()), field.type)
+
+        game_dates = pd.to_datetime(data['game_date'])
+        first, last = game_dates.min().date(), game_dates.max().date()
+        directory = os.path.join(self.path, str(first.year))
+        file_utils.mkdir(directory)
+        filename = os.path.join(directory, f'statcast_{first}_{last}.parquet')
+        with file_utils.atomic_write(filename) as temp_filename:
+            pq.write_table(table, temp_filename)
+        pq.write_metadata(self.schema, os.path.join(self.path, COMMON_METADATA_FILENAME))
+        return filename
+
+
+def statcast_to_parquet(path: str, start_dt: Optional[str] = None, end_dt: Optional[str] = None,
+                        team: Optional[str] = None, verbose: bool = True, parallel: bool = True,
+                        filters: Optional[StatcastFilter] = None, columns: Optional[List[str]] = None) -> int:
+    """
+    Streams statcast play-level data for a date range straight to a parquet dataset at path, one file per chunk,
+    without ever holding more than a few chunks in memory. Returns the number of pitches written.
+
+    Read the dataset back with read_statcast_parquet(path).
+
+    INPUTS:
+    path: str : the directory of the dataset. Chunks already written there are kept, and replaced if fetched again
+    start_dt, end_dt, team, verbose, parallel, filters, columns : as for statcast_iter. The dataset needs game_date
+        to be partitioned by year, so it's kept even if columns leaves it out
+    """
+    writer = StatcastParquetWriter(path)
+    rows = 0
+    if columns is not None and 'game_date' not in columns:
+        columns = list(columns) + ['game_date']
+    for chunk in statcast_iter(start_dt, end_dt, team=team, verbose=verbose, parallel=parallel, filters=filters,
+                               columns=columns):
+        writer.write(chunk)
+        rows += len(chunk)
+    return rows
+
+
+def read_statcast_parquet(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a parquet dataset written by statcast_to_parquet, optionally only some of its columns.
+    """
+    schema = pq.read_schema(os.path.join(path, COMMON_METADATA_FILENAME))
+    return pq.read_table(path, schema=schema, columns=columns).to_pandas()
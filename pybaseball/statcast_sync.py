@@ -0,0 +1,120 @@
+import argparse
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+from . import cache, statcast_calendar, statcast_store
+from .statcast import _fetch_into_store, _plan
+from .utils import statcast_season_span, validate_datestring
+
+# Baseball Savant corrects games for a few days after they're played, so the most recent days are always refetched
+DEFAULT_REFETCH_DAYS = 3
+
+
+def _season_start(day: date) -> date:
+    season_start, _ = statcast_season_span(day.year)
+    return season_start
+
+
+def statcast_sync(start_dt: Optional[str] = None, end_dt: Optional[str] = None,
+                  refetch_days: int = DEFAULT_REFETCH_DAYS, team: Optional[str] = None,
+                  verbose: bool = True, parallel: bool = True) -> pd.DataFrame:
+    """
+    Bring the local Statcast store up to date for a date range, fetching as little as possible.
+
+    Days that have never been fetched are appended. The last refetch_days game days of the range are always
+    fetched again, since Baseball Savant keeps correcting recent games. Days the store already knows had no games
+    (see GameCalendar) are skipped when counting them. If any of those days' pitch counts changed,
+    the refetch walks back another refetch_days game days, until it reaches a window with no changes.
+    Everything else is left as it is.
+
+    With the cache enabled, statcast() over the same range then reads the synced data without any requests.
+
+    INPUTS:
+    start_dt: YYYY-MM-DD : the first date to sync. Defaults to the start of end_dt's season
+    end_dt: YYYY-MM-DD : the last date to sync. Defaults to yesterday
+    refetch_days: int : how many trailing game days to always fetch again, not counting days known to have had no
+        games
+    team: optional (defaults to None) : city abbreviation of the team to sync (e.g. SEA or BOS)
+    verbose: bool (defaults to True) : whether to print a summary of the sync
+    parallel: bool (defaults to True) : whether to parallelize HTTP requests
+
+    RETURNS:
+    The manifest of the synced range: game_date, rows, fetched_at and status, which is one of
+    'new' (fetched for the first time), 'changed' (refetched with a different pitch count),
+    'refetched' (refetched with the same pitch count) or 'stored' (not fetched).
+    """
+    if refetch_days < 0:
+        raise ValueError(f"refetch_days must be zero or more, got {refetch_days}")
+    store = statcast_store.StatcastStore.from_config(cache.config)
+    statcast_calendar.update_valid_dates(store)
+    end = validate_datestring(end_dt) if end_dt else date.today() - timedelta(days=1)
+    start = validate_datestring(start_dt) if start_dt else _season_start(end)
+
+    days = statcast_store.days_in_range(start, end, verbose=False)
+    previous = store.row_counts(days, team)
+    # Days the store knows had no games aren't refetched, and don't count towards refetch_days
+    calendar = statcast_calendar.GameCalendar.from_store(store, team)
+    game_days = [day for day in days if calendar.has_games(day) is not False]
+
+    fetched: Set[date] = set()
+    window_start = max(len(game_days) - refetch_days, 0)
+    batch = set(store.missing_days(days, team)) | set(game_days[window_start:])
+    while batch:
+        _fetch_into_store(store, _plan(sorted(batch), team, store=store), team, parallel)
+        fetched |= batch
+        current = store.row_counts(batch, team)
+        window = game_days[window_start:window_start + refetch_days]
+        if window_start == 0 or not any(day in previous and previous[day] != current.get(day) for day in window):
+            break
+        window_start = max(window_start - refetch_days, 0)
+        batch = set(game_days[window_start:window_start + refetch_days]) - fetched
+
+    manifest = store.manifest(team)
+    manifest = manifest[manifest['game_date'].isin(days)].reset_index(drop=True)
+    statuses: Dict[date, str] = {}
+    for day, rows in zip(manifest['game_date'], manifest['rows']):
+        if day not in fetched:
+            statuses[day] = 'stored'
+        elif day not in previous:
+            statuses[day] = 'new'
+        else:
+            statuses[day] = 'changed' if previous[day] != rows else 'refetched'
+    manifest['status'] = manifest['game_date'].map(statuses)
+
+    if verbose:
+        counts = manifest['status'].value_counts()
+        print(
+            f"Synced {start} to {end}: {len(fetched)} days fetched "
+            f"({counts.get('new', 0)} new, {counts.get('changed', 0)} changed), "
+            f"{counts.get('stored', 0)} days already stored"
+        )
+
+    return manifest
+
+
+def _parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='pybaseball-statcast-sync',
+        description="Keep a local mirror of Statcast data up to date in the pybaseball cache directory."
+    )
+    parser.add_argument("--start-date", required=False, default=None,
+                        help="First date to sync (YYYY-MM-DD). Defaults to the start of the season.")
+    parser.add_argument("--end-date", required=False, default=None,
+                        help="Last date to sync (YYYY-MM-DD). Defaults to yesterday.")
+    parser.add_argument("--refetch-days", required=False, type=int, default=DEFAULT_REFETCH_DAYS,
+                        help="How many trailing game days to always fetch again, not counting known off days.")
+    parser.add_argument("--team", required=False, default=None)
+    parser.add_argument("--quiet", action="store_true")
+    return parser.parse_args(args)
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parsed = _parse_args(args)
+    statcast_sync(parsed.start_date, parsed.end_date, refetch_days=parsed.refetch_days, team=parsed.team,
+                  verbose=not parsed.quiet)
+
+
+if __name__ == '__main__':
+    main()
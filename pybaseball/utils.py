@@ -1,14 +1,14 @@
-from collections import namedtuple
 from datetime import date, datetime, timedelta
 import functools
 import io
 from typing import Dict, Iterator, Optional, Tuple, Union
+import warnings
 import zipfile
 
 import pandas as pd
 import requests
 
-from . import cache
+from .datahelpers import statcast_features
 
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -190,6 +190,14 @@ def date_range(start: date, stop: date, step: int = 1, verbose: bool = True) ->
 		low += timedelta(days=step)
 
 
+def statcast_season_span(year: int) -> Tuple[date, date]:
+	'''
+	The first and last days of a season's Statcast data, from STATCAST_VALID_DATES, or a span sure to cover the season
+	if it isn't there (yet). See statcast_calendar for how later seasons get filled in.
+	'''
+	return STATCAST_VALID_DATES.get(year, (date(year, 3, 15), date(year, 11, 15)))
+
+
 def statcast_date_range(start: date, stop: date, step: int, verbose: bool = True) -> Iterator[Tuple[date, date]]:
 	'''
 	Iterate over dates. Skip the offseason dates. Returns a pair of dates for beginning and end of each segment.
@@ -200,14 +208,13 @@ def statcast_date_range(start: date, stop: date, step: int, verbose: bool = True
 	low = start
 
 	while low <= stop:
-		date_span = low.replace(month=3, day=15), low.replace(month=11, day=15)
-		season_start, season_end = STATCAST_VALID_DATES.get(low.year, date_span)
+		season_start, season_end = statcast_season_span(low.year)
 		if low < season_start:
 			low = season_start
 			if verbose:
 				print('Skipping offseason dates')
 		elif low > season_end:
-			low, _ = STATCAST_VALID_DATES.get(low.year + 1, (date(month=3, day=15, year=low.year + 1), None))
+			low, _ = statcast_season_span(low.year + 1)
 			if verbose:
 				print('Skipping offseason dates')
 
@@ -272,31 +279,20 @@ def sanitize_input(start_dt: Optional[str], end_dt: Optional[str], player_id: Op
 	return str(start_dt_date), str(end_dt_date), player_id_str
 
 
-@cache.df_cache()
 def split_request(start_dt: str, end_dt: str, player_id: int, url: str) -> pd.DataFrame:
 	"""
-	Splits Statcast queries to avoid request timeouts
+	Deprecated: use statcast_players, which also splits the windows that hit Savant's row limit and keeps the days in
+	the Statcast store. Only whose pitches to get is taken from url: the batter's if it looks up batters, otherwise
+	the pitcher's.
 	"""
-	current_dt = datetime.strptime(start_dt, '%Y-%m-%d')
-	end_dt_datetime = datetime.strptime(end_dt, '%Y-%m-%d')
-	results = []  # list to hold data as it is returned
-	player_id_str = str(player_id)
-	print('Gathering Player Data')
-	# break query into multiple requests
-	while current_dt <= end_dt_datetime:
-		remaining = end_dt_datetime - current_dt
-		# increment date ranges by at most 60 days
-		delta = min(remaining, timedelta(days=2190))
-		next_dt = current_dt + delta
-		start_str = current_dt.strftime('%Y-%m-%d')
-		end_str = next_dt.strftime('%Y-%m-%d')
-		# retrieve data
-		data = requests.get(url.format(start_str, end_str, player_id_str))
-		df = pd.read_csv(io.StringIO(data.text))
-		# add data to list and increment current dates
-		results.append(df)
-		current_dt = next_dt + timedelta(days=1)
-	return pd.concat(results)
+	warnings.warn(
+		"split_request is deprecated and will be removed in the future. Use statcast_players instead.",
+		category=DeprecationWarning,
+		stacklevel=2
+	)
+	from .statcast_players import statcast_players  # pylint: disable=import-outside-toplevel
+	role = 'batter' if 'batters_lookup' in url else 'pitcher'
+	return statcast_players([player_id], start_dt, end_dt, role=role, typed=False)
 
 
 def get_zip_file(url: str) -> zipfile.ZipFile:
@@ -329,33 +325,7 @@ def flag_imputed_data(statcast_df: pd.DataFrame) -> pd.DataFrame:
 		pd.DataFrame: Copy of original dataframe with "possible_imputation" flag
 	"""
 
-	ParameterSet = namedtuple('ParameterSet', ["ev", "angle", "bb_type"])
-	impute_combinations = []
-
-	# pop-ups
-	impute_combinations.append(ParameterSet(ev=80.0, angle=69.0, bb_type="popup"))
-
-	# Flyout
-	impute_combinations.append(ParameterSet(ev=89.2, angle=39.0, bb_type="fly_ball"))
-	impute_combinations.append(ParameterSet(ev=102.8, angle=30.0, bb_type="fly_ball"))
-
-	# Line Drive
-	impute_combinations.append(ParameterSet(ev=90.4, angle=15.0, bb_type="line_drive"))
-	impute_combinations.append(ParameterSet(ev=91.1, angle=18.0, bb_type="line_drive"))
-
-	# Ground balls
-	impute_combinations.append(ParameterSet(ev=82.9, angle=-21.0, bb_type="ground_ball"))
-	impute_combinations.append(ParameterSet(ev=90.3, angle=-17.0, bb_type="ground_ball"))
-
-	df_imputations = pd.DataFrame(data=impute_combinations)
-	df_imputations["possible_imputation"] = True
-	df_return = statcast_df.merge(df_imputations, how="left",
-								  left_on=["launch_speed", "launch_angle", "bb_type"],
-								  right_on=["ev", "angle", "bb_type"])
-	# Change NaNs to false for boolean consistency
-	df_return["possible_imputation"] = df_return["possible_imputation"].fillna(False)
-	df_return = df_return.drop(["ev", "angle"], axis=1)
-	return df_return
+	return statcast_features.add_features(statcast_df, 'possible_imputation')
 
 def norm_pitch_code(pitch: str, to_word: bool = False) -> str:
 	normed = pitch_name_to_code_map.get(pitch.upper())
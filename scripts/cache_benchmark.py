@@ -0,0 +1,113 @@
+"""
+Compare the cache backends (csv, parquet, feather) on save time, load latency, file size and peak RSS of the
+loading process.
+
+By default this uses a synthetic Statcast-shaped frame, use --start-date/--end-date to benchmark real data instead.
+
+    python scripts/cache_benchmark.py --rows 2000000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pybaseball.cache import dataframe_utils
+
+BACKENDS = ['csv', 'parquet', 'feather']
+DEFAULT_ROWS = 2_000_000
+DEFAULT_ITERATIONS = 3
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", required=False, type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--iterations", "-n", required=False, type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--start-date", required=False, default=None)
+    parser.add_argument("--end-date", required=False, default=None)
+    parser.add_argument("--backends", nargs="+", required=False, default=BACKENDS, choices=BACKENDS)
+    return parser.parse_args()
+
+
+def synthetic_statcast(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    pitch_types = np.array(['FF', 'SL', 'CH', 'CU', 'SI', 'FC', 'ST'])
+    events = np.array([None, None, None, 'single', 'strikeout', 'field_out', 'walk', 'home_run'], dtype=object)
+    teams = np.array(['NYY', 'BOS', 'LAD', 'SF', 'SEA', 'HOU', 'ATL', 'CHC'])
+    data = {
+        'pitch_type': pitch_types[rng.integers(0, len(pitch_types), rows)],
+        'game_date': pd.Timestamp('2023-03-30') + pd.to_timedelta(rng.integers(0, 185, rows), unit='D'),
+        'release_speed': rng.normal(92, 5, rows),
+        'release_spin_rate': rng.normal(2300, 300, rows),
+        'plate_x': rng.normal(0, 0.8, rows),
+        'plate_z': rng.normal(2.5, 0.9, rows),
+        'batter': rng.integers(400000, 700000, rows),
+        'pitcher': rng.integers(400000, 700000, rows),
+        'events': events[rng.integers(0, len(events), rows)],
+        'home_team': teams[rng.integers(0, len(teams), rows)],
+        'balls': rng.integers(0, 4, rows),
+        'strikes': rng.integers(0, 3, rows),
+        'launch_speed': np.where(rng.random(rows) < 0.7, np.nan, rng.normal(88, 14, rows)),
+        'game_pk': rng.integers(700000, 720000, rows),
+        'at_bat_number': rng.integers(1, 80, rows),
+        'pitch_number': rng.integers(1, 12, rows),
+    }
+    return pd.DataFrame(data)
+
+
+def _load(filename: str, iterations: int, results: Dict) -> None:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        data = dataframe_utils.load_df(filename)
+        timings.append(time.perf_counter() - start)
+        del data
+    results['load_seconds'] = min(timings)
+    # ru_maxrss is in KB on Linux
+    results['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark(data: pd.DataFrame, backends: List[str], iterations: int) -> pd.DataFrame:
+    rows: List[Tuple[str, float, float, float, float]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in backends:
+            filename = os.path.join(directory, f'benchmark.{backend}')
+
+            start = time.perf_counter()
+            dataframe_utils.save_df(data, filename)
+            save_seconds = time.perf_counter() - start
+
+            # Load in a spawned process so the RSS measurement isn't polluted by the source frame: a forked one
+            # would start out sharing the parent's pages, frame included
+            context = multiprocessing.get_context('spawn')
+            with context.Manager() as manager:
+                results = manager.dict()
+                process = context.Process(target=_load, args=(filename, iterations, results))
+                process.start()
+                process.join()
+                load_seconds, peak_rss_mb = results['load_seconds'], results['peak_rss_mb']
+
+            rows.append((backend, save_seconds, load_seconds, peak_rss_mb, os.path.getsize(filename) / 1024 ** 2))
+
+    return pd.DataFrame(rows, columns=['backend', 'save_seconds', 'load_seconds', 'peak_rss_mb', 'file_mb'])
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.start_date:
+        from pybaseball import statcast  # pylint: disable=import-outside-toplevel
+        data = statcast(args.start_date, args.end_date)
+    else:
+        data = synthetic_statcast(args.rows)
+
+    print(f"Benchmarking {len(data):,} rows x {len(data.columns)} columns")
+    print(benchmark(data, args.backends, args.iterations).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
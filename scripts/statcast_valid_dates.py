@@ -1,3 +1,6 @@
+# Rebuilds the built-in STATCAST_VALID_DATES table in pybaseball/utils.py. Seasons missing from the table are
+# filled in at runtime from the local Statcast store once it has seen them whole (see pybaseball/statcast_calendar.py),
+# so this only needs running to ship new seasons in the table itself.
 import argparse
 import os
 from datetime import date
@@ -3,14 +3,21 @@ from datetime import date, timedelta
 import pandas as pd
 import pytest
 
-from pybaseball.statcast import _handle_request, _small_request, statcast, statcast_single_game
+from pybaseball.datasources import async_http
+from pybaseball.statcast import (_fetch_small_request_async, _fetcher, _handle_request, statcast,
+                                 statcast_single_game)
 from pybaseball.utils import sanitize_date_range
 from tests.conftest import CURRENT_SC_COLUMNS
 
 
 def test_small_request() -> None:
     start_dt, end_dt = sanitize_date_range('2019-06-01', None)
-    result = _small_request(start_dt, end_dt)
+
+    async def _request() -> pd.DataFrame:
+        async with _fetcher() as fetcher:
+            return await _fetch_small_request_async(fetcher, start_dt, end_dt)
+
+    result = async_http.run(_request())
 
     assert result is not None
     assert not result.empty
@@ -206,7 +206,7 @@ def test_call_cache_load_fails_silently(
 ))
 def test_call_cache_save_fails_silently(
         mock_data_1: pd.DataFrame, thrower: Callable,
-        empty_load_mock: MagicMock, save_mock: MagicMock) -> None:
+        empty_load_mock: MagicMock, save_mock: MagicMock, remove: MagicMock) -> None:
     assert cache.config.enabled
 
     df_func = MagicMock(return_value=mock_data_1)
@@ -215,15 +215,20 @@ def test_call_cache_save_fails_silently(
     df_cache = cache.cache.df_cache()
     assert df_cache.cache_config.enabled
 
-    with patch.object(cache.cache_record.CacheRecord, 'save', thrower):
+    with patch.object(cache.cache_record.CacheRecord, 'save', thrower), \
+            patch('os.path.exists', MagicMock(return_value=True)):
         wrapper = df_cache.__call__(df_func)
         result = wrapper(*(1, 2), **{'val1': 'a'})
 
     assert isinstance(result, pd.DataFrame)
 
     pd.testing.assert_frame_equal(result, mock_data_1)
-    empty_load_mock.assert_called_once()
-    save_mock.assert_not_called()
+    # Checked before the call, and again once the call's lock is held
+    assert empty_load_mock.call_count == 2
+
+    # The frame is written before the record, so a failed record save cleans up the orphaned frame
+    save_mock.assert_called_once()
+    remove.assert_called_once_with(save_mock.call_args[0][1])
 
 
 def test_purge(remove: MagicMock) -> None:
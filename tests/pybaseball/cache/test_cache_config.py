@@ -107,3 +107,24 @@ def test_autoload_cache() -> None:
     assert not cache.config.enabled
     assert cache.config.default_expiration == 363
     assert cache.config.cache_type == 'csv'
+
+
+def test_max_bytes_default() -> None:
+    config = cache.CacheConfig()
+    assert config.max_bytes is None
+    assert config.eviction_policy == cache.CacheConfig.DEFAULT_EVICTION_POLICY
+
+
+def test_max_bytes_invalid() -> None:
+    with pytest.raises(ValueError):
+        cache.CacheConfig(max_bytes=-1)
+
+
+def test_eviction_policy_invalid() -> None:
+    with pytest.raises(ValueError):
+        cache.CacheConfig(eviction_policy='random')
+
+
+def test_cache_type_feather() -> None:
+    config = cache.CacheConfig(cache_type='Feather')
+    assert config.cache_type == 'feather'
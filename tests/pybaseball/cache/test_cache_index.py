@@ -0,0 +1,210 @@
+import json
+import os
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import cache
+from pybaseball.cache import cache_index, single_flight
+
+
+def _write_record(directory: str, name: str, data: dict) -> str:
+    filename = os.path.join(directory, f'{name}.cache_record.json')
+    with open(filename, 'w') as json_file:
+        json.dump(data, json_file)
+    return filename
+
+
+def test_func_key_stable() -> None:
+    func_data = {'func': 'df_func', 'args': [1, 2], 'kwargs': {'b': 1, 'a': 2}}
+    same_data = {'func': 'df_func', 'args': [1, 2], 'kwargs': {'a': 2, 'b': 1}, 'expires': '3000-01-01'}
+    other_data = {'func': 'df_func', 'args': [1, 3], 'kwargs': {'a': 2, 'b': 1}}
+
+    assert cache_index.func_key(func_data) == cache_index.func_key(same_data)
+    assert cache_index.func_key(func_data) != cache_index.func_key(other_data)
+
+
+def test_open_index_missing_directory(cache_dir: str) -> None:
+    assert cache_index.open_index(os.path.join(cache_dir, 'missing')) is None
+
+
+def test_index_migrates_legacy_records(cache_dir: str) -> None:
+    func_data = {'func': 'df_func', 'args': [1, 2], 'kwargs': {'val1': 'a'}}
+    _write_record(cache_dir, 'df_func1', dict(func_data, expires='2000-01-01', dataframe='old.parquet'))
+    newest = _write_record(cache_dir, 'df_func2', dict(func_data, expires='3000-01-01', dataframe='new.parquet'))
+
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+
+    assert index.lookup(cache_index.func_key(func_data)) == newest
+
+
+def test_index_add_replaces(cache_dir: str) -> None:
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+
+    key = cache_index.func_key({'func': 'df_func', 'args': [], 'kwargs': {}})
+    assert index.add(key, 'df_func', os.path.join(cache_dir, 'a.cache_record.json'), '3000-01-01') is None
+    replaced = index.add(key, 'df_func', os.path.join(cache_dir, 'b.cache_record.json'), '3000-01-01')
+
+    assert replaced == os.path.join(cache_dir, 'a.cache_record.json')
+    assert index.lookup(key) == os.path.join(cache_dir, 'b.cache_record.json')
+
+    index.remove(os.path.join(cache_dir, 'b.cache_record.json'))
+    assert index.lookup(key) is None
+
+
+def test_df_cache_uses_index(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    data = pd.DataFrame([1, 2], columns=['a'])
+    save_mock = MagicMock()
+    load_mock = MagicMock(return_value=data)
+    monkeypatch.setattr(cache.dataframe_utils, 'save_df', save_mock)
+    monkeypatch.setattr(cache.dataframe_utils, 'load_df', load_mock)
+
+    df_func = MagicMock(return_value=data)
+    df_func.__name__ = 'df_func'
+    wrapper = cache.df_cache()(df_func)
+
+    wrapper(1, 2, val1='a')
+    save_mock.assert_called_once()
+
+    glob_mock = MagicMock(return_value=[])
+    monkeypatch.setattr('glob.glob', glob_mock)
+
+    result = wrapper(1, 2, val1='a')
+
+    df_func.assert_called_once()
+    load_mock.assert_called_once()
+    glob_mock.assert_not_called()
+    pd.testing.assert_frame_equal(result, data)
+
+
+def test_df_cache_disabled_leaves_directory_empty(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(cache.config, 'enabled', False)
+    df_func = MagicMock(return_value=pd.DataFrame([1, 2], columns=['a']))
+    df_func.__name__ = 'df_func'
+
+    cache.df_cache()(df_func)(1, 2, val1='a')
+
+    df_func.assert_called_once()
+    assert os.listdir(cache_dir) == []
+
+
+def test_df_cache_drops_missing_record(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    data = pd.DataFrame([1, 2], columns=['a'])
+    monkeypatch.setattr(cache.dataframe_utils, 'save_df', MagicMock())
+
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+    key = cache_index.func_key({'func': 'df_func', 'args': [1], 'kwargs': {}})
+    index.add(key, 'df_func', os.path.join(cache_dir, 'gone.cache_record.json'), '3000-01-01')
+
+    df_func = MagicMock(return_value=data)
+    df_func.__name__ = 'df_func'
+    cache.df_cache()(df_func)(1)
+
+    df_func.assert_called_once()
+    assert index.lookup(key) != os.path.join(cache_dir, 'gone.cache_record.json')
+
+
+def _add_record(index: cache_index.CacheIndex, name: str, size: int, expires: str = '3000-01-01') -> str:
+    record_file = _write_record(index.directory, name, {'func': name, 'args': [], 'kwargs': {}, 'expires': expires})
+    index.add(name, name, record_file, expires, size)
+    return record_file
+
+
+@pytest.mark.parametrize('policy', ['lru', 'lfu'])
+def test_eviction_order_expired_first(cache_dir: str, policy: str) -> None:
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+
+    _add_record(index, 'fresh', 10)
+    _add_record(index, 'stale', 10, expires='2000-01-01')
+
+    assert [key for key, _, _ in index.eviction_order(policy)] == ['stale', 'fresh']
+
+
+def test_eviction_order_lfu(cache_dir: str) -> None:
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+
+    _add_record(index, 'older', 10)
+    _add_record(index, 'newer', 10)
+    index.touch('older')
+
+    assert [key for key, _, _ in index.eviction_order('lru')] == ['newer', 'older']
+    assert [key for key, _, _ in index.eviction_order('lfu')] == ['newer', 'older']
+
+    index.touch('newer')
+    index.touch('newer')
+    assert [key for key, _, _ in index.eviction_order('lfu')] == ['older', 'newer']
+
+
+def test_eviction_order_invalid_policy(cache_dir: str) -> None:
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+
+    with pytest.raises(ValueError):
+        index.eviction_order('random')
+
+
+def test_compact(cache_dir: str, remove: MagicMock) -> None:
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+
+    oldest = _add_record(index, 'oldest', 100)
+    _add_record(index, 'middle', 100)
+    _add_record(index, 'newest', 100)
+
+    assert cache.compact(max_bytes=250) == 100
+
+    remove.assert_called_once_with(oldest)
+    assert index.lookup('oldest') is None
+    assert index.total_size() == 200
+
+
+def test_compact_removes_stale_locks(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    # os.remove is mocked out for the unit tests
+    monkeypatch.setattr(cache.file_utils, 'remove', os.unlink)
+    with single_flight.file_lock(cache_dir, 'key'):
+        pass
+
+    assert cache.compact(max_bytes=1000) == 0
+
+    assert os.listdir(os.path.join(cache_dir, single_flight.LOCK_DIRECTORY)) == []
+
+
+def test_compact_unbounded(cache_dir: str) -> None:
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+    _add_record(index, 'record', 100)
+
+    assert cache.compact() == 0
+    assert index.total_size() == 100
+
+
+def test_df_cache_schedules_compaction(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(cache.dataframe_utils, 'save_df', MagicMock())
+    monkeypatch.setattr(cache.config, 'max_bytes', 0)
+    schedule_mock = MagicMock()
+    monkeypatch.setattr(cache.cache, '_schedule_compaction', schedule_mock)
+
+    df_func = MagicMock(return_value=pd.DataFrame([1, 2], columns=['a']))
+    df_func.__name__ = 'df_func'
+    cache.df_cache()(df_func)(1)
+
+    schedule_mock.assert_called_once()
+
+
+def test_background_compaction(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(cache.config, 'max_bytes', 0)
+    index = cache_index.open_index(cache_dir)
+    assert index is not None
+    _add_record(index, 'record', 100)
+
+    # pylint: disable=protected-access
+    cache.cache._schedule_compaction().join(timeout=10)
+
+    assert index.total_size() == 0
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest.mock import MagicMock
 
 import pandas as pd
@@ -42,12 +44,19 @@ def test_load_invalid_cache_type() -> None:
 def test_save(monkeypatch: MonkeyPatch, mock_data_1: pd.DataFrame, cache_type: str, method: str) -> None:
     to_method = MagicMock()
     monkeypatch.setattr(mock_data_1, method, to_method)
+    replace_mock = MagicMock()
+    monkeypatch.setattr(os, 'replace', replace_mock)
 
     test_filename = f'test.{cache_type}'
 
     cache.dataframe_utils.save_df(mock_data_1, test_filename)
 
-    assert to_method.called_once_with(test_filename)
+    # The frame is written to a temporary file and then renamed into place
+    to_method.assert_called_once()
+    temp_filename = to_method.call_args[0][0]
+    assert temp_filename != test_filename
+    assert temp_filename.endswith(test_filename)
+    replace_mock.assert_called_once_with(temp_filename, test_filename)
 
 
 def test_save_invalid_cache_type(mock_data_1: pd.DataFrame) -> None:
@@ -55,3 +64,30 @@ def test_save_invalid_cache_type(mock_data_1: pd.DataFrame) -> None:
 
     with pytest.raises(ValueError):
         cache.dataframe_utils.save_df(mock_data_1, test_filename)
+
+
+def test_feather_round_trip() -> None:
+    data = pd.DataFrame(
+        {'a': [1, 2, 3], 'b': ['x', None, 'z'], 'c': pd.to_datetime(['2021-04-01', '2021-04-02', None])},
+        index=[10, 20, 30]
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_filename = os.path.join(directory, 'test.feather')
+        cache.dataframe_utils.save_df(data, test_filename)
+        result = cache.dataframe_utils.load_df(test_filename)
+
+    pd.testing.assert_frame_equal(result, data)
+
+
+@pytest.mark.parametrize("cache_type", ['csv', 'parquet', 'feather'])
+def test_load_columns(cache_type: str) -> None:
+    data = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y'], 'c': [0.5, 1.5]})
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_filename = os.path.join(directory, f'test.{cache_type}')
+        cache.dataframe_utils.save_df(data, test_filename)
+        result = cache.dataframe_utils.load_df(test_filename, columns=['c', 'a', 'missing'])
+
+    assert sorted(result.columns) == ['a', 'c']
+    assert list(result['c']) == [0.5, 1.5]
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import cache
+from pybaseball.cache import memory_cache
+
+_FUTURE = date.today() + timedelta(days=1)
+
+
+@pytest.fixture(name="mock_data_1")
+def _mock_data_1() -> pd.DataFrame:
+    return pd.DataFrame([1, 2], columns=['a'])
+
+
+@pytest.fixture(autouse=True)
+def _clear_memory() -> None:
+    cache.memory.clear()
+
+
+def test_get_missing() -> None:
+    assert memory_cache.MemoryCache().get('missing') is None
+
+
+def test_get_returns_copy(mock_data_1: pd.DataFrame) -> None:
+    memory = memory_cache.MemoryCache()
+    memory.put('key', mock_data_1, _FUTURE, 10 ** 6)
+
+    first = memory.get('key')
+    assert first is not None
+    first['a'] = 0
+
+    pd.testing.assert_frame_equal(memory.get('key'), mock_data_1)
+
+
+def test_get_expired(mock_data_1: pd.DataFrame) -> None:
+    memory = memory_cache.MemoryCache()
+    memory.put('key', mock_data_1, date.today() - timedelta(days=1), 10 ** 6)
+
+    assert memory.get('key') is None
+    assert memory.size == 0
+
+
+def test_lru_eviction(mock_data_1: pd.DataFrame) -> None:
+    memory = memory_cache.MemoryCache()
+    budget = memory_cache.frame_size(mock_data_1) * 2
+
+    memory.put('a', mock_data_1, _FUTURE, budget)
+    memory.put('b', mock_data_1, _FUTURE, budget)
+    assert memory.get('a') is not None  # 'b' is now the least recently used
+    memory.put('c', mock_data_1, _FUTURE, budget)
+
+    assert memory.get('b') is None
+    assert memory.get('a') is not None
+    assert memory.get('c') is not None
+    assert memory.size <= budget
+
+
+def test_oversized_frame_not_cached(mock_data_1: pd.DataFrame) -> None:
+    memory = memory_cache.MemoryCache()
+    memory.put('a', mock_data_1, _FUTURE, 1)
+
+    assert len(memory) == 0
+
+
+def test_memory_cache_bytes_invalid() -> None:
+    with pytest.raises(ValueError):
+        cache.CacheConfig(memory_cache_bytes=-1)
+
+
+@patch('pybaseball.cache.config.enabled', True)
+@patch('pybaseball.cache.config.memory_cache_bytes', 10 ** 6)
+@patch('glob.glob', MagicMock(return_value=[]))
+def test_df_cache_memory_tier(monkeypatch: MonkeyPatch, mock_data_1: pd.DataFrame) -> None:
+    monkeypatch.setattr(cache.file_utils, 'safe_jsonify', MagicMock())
+    monkeypatch.setattr(cache.dataframe_utils, 'save_df', MagicMock())
+    load_mock = MagicMock(return_value=mock_data_1)
+    monkeypatch.setattr(cache.dataframe_utils, 'load_df', load_mock)
+
+    df_func = MagicMock(return_value=mock_data_1)
+    df_func.__name__ = "df_func"
+    wrapper = cache.df_cache()(df_func)
+
+    wrapper(1, 2, val1='a')
+    result = wrapper(1, 2, val1='a')
+
+    df_func.assert_called_once_with(1, 2, val1='a')
+    load_mock.assert_not_called()
+    pd.testing.assert_frame_equal(result, mock_data_1)
+
+
+@patch('pybaseball.cache.config.enabled', True)
+@patch('pybaseball.cache.config.memory_cache_bytes', 10 ** 6)
+def test_purge_clears_memory_tier(mock_data_1: pd.DataFrame) -> None:
+    cache.memory.put('key', mock_data_1, _FUTURE, 10 ** 6)
+
+    with patch('glob.glob', MagicMock(return_value=[])):
+        cache.purge()
+
+    assert len(cache.memory) == 0
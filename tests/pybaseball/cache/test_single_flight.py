@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import cache
+from pybaseball.cache import file_utils, single_flight
+
+
+def test_single_flight_shares_result() -> None:
+    flight = single_flight.SingleFlight()
+    release = threading.Event()
+    calls: List[int] = []
+
+    def _func() -> List[int]:
+        calls.append(1)
+        release.wait(timeout=10)
+        return [1, 2]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flight.do, 'key', _func, list)
+        time.sleep(0.1)
+        waiters = [executor.submit(flight.do, 'key', _func, list) for _ in range(3)]
+        time.sleep(0.1)
+        release.set()
+        results = [leader.result()] + [waiter.result() for waiter in waiters]
+
+    assert len(calls) == 1
+    assert all(result == [1, 2] for result in results)
+    # Waiters get their own copy
+    assert all(result is not results[0] for result in results[1:])
+
+
+def test_single_flight_shares_exception() -> None:
+    flight = single_flight.SingleFlight()
+    release = threading.Event()
+
+    def _func() -> None:
+        release.wait(timeout=10)
+        raise KeyError('failed')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, 'key', _func)
+        time.sleep(0.1)
+        waiter = executor.submit(flight.do, 'key', _func)
+        time.sleep(0.1)
+        release.set()
+
+        with pytest.raises(KeyError):
+            leader.result()
+        with pytest.raises(KeyError):
+            waiter.result()
+
+
+def test_file_lock_contended(cache_dir: str) -> None:
+    acquired = threading.Event()
+    release = threading.Event()
+
+    def _hold() -> None:
+        with single_flight.file_lock(cache_dir, 'key'):
+            acquired.set()
+            release.wait(timeout=10)
+
+    holder = threading.Thread(target=_hold)
+    holder.start()
+    acquired.wait(timeout=10)
+
+    with single_flight.file_lock(cache_dir, 'other') as contended:
+        assert not contended
+
+    threading.Timer(0.1, release.set).start()
+    with single_flight.file_lock(cache_dir, 'key') as contended:
+        assert contended
+
+    holder.join()
+
+
+def test_remove_stale_locks(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    # os.remove is mocked out for the unit tests
+    monkeypatch.setattr(file_utils, 'remove', os.unlink)
+    lock_directory = os.path.join(cache_dir, single_flight.LOCK_DIRECTORY)
+
+    with single_flight.file_lock(cache_dir, 'held'):
+        with single_flight.file_lock(cache_dir, 'released'):
+            pass
+        assert single_flight.remove_stale_locks(cache_dir) == 1
+
+    assert os.listdir(lock_directory) == ['held.lock']
+
+
+def test_file_lock_deleted_while_waiting(cache_dir: str) -> None:
+    lock_filename = os.path.join(cache_dir, single_flight.LOCK_DIRECTORY, 'key.lock')
+    acquired = threading.Event()
+    release = threading.Event()
+
+    def _hold() -> None:
+        with single_flight.file_lock(cache_dir, 'key'):
+            acquired.set()
+            release.wait(timeout=10)
+            # As remove_stale_locks would, had it got the lock first
+            os.unlink(lock_filename)
+
+    holder = threading.Thread(target=_hold)
+    holder.start()
+    acquired.wait(timeout=10)
+
+    threading.Timer(0.1, release.set).start()
+    with single_flight.file_lock(cache_dir, 'key') as contended:
+        assert contended
+        # The lock is on a lock file other processes can still find
+        assert os.path.isfile(lock_filename)
+
+    holder.join()
+
+
+def test_atomic_write_failure_keeps_original(cache_dir: str, remove: MagicMock) -> None:
+    filename = os.path.join(cache_dir, 'data.json')
+    file_utils.safe_jsonify(cache_dir, filename, {'version': 1})
+
+    with pytest.raises(ValueError):
+        with file_utils.atomic_write(filename) as temp_filename:
+            with open(temp_filename, 'w') as temp_file:
+                temp_file.write('partial')
+            raise ValueError
+
+    assert file_utils.load_json(filename) == {'version': 1}
+    remove.assert_called_once_with(temp_filename)
+
+
+def test_df_cache_rechecks_after_lock(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    data = pd.DataFrame([1, 2], columns=['a'])
+    # A miss, then cached by another process before the lock was taken, without it ever being contended
+    load = MagicMock(side_effect=[None, data])
+    monkeypatch.setattr(cache.df_cache, '_safe_load_func_cache', lambda self, func_data: load(func_data))
+    func = MagicMock(return_value=data)
+    func.__name__ = 'rechecked_func'
+
+    assert cache.df_cache()(func)(1) is data
+    func.assert_not_called()
+
+
+def test_df_cache_concurrent_calls_fetch_once(cache_dir: str, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(cache.dataframe_utils, 'save_df', MagicMock())
+    release = threading.Event()
+    data = pd.DataFrame([1, 2], columns=['a'])
+
+    def _fetch(*args: int) -> pd.DataFrame:
+        release.wait(timeout=10)
+        return data
+
+    df_func = MagicMock(side_effect=_fetch)
+    df_func.__name__ = 'df_func'
+    wrapper = cache.df_cache()(df_func)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(wrapper, 1, 2) for _ in range(4)]
+        time.sleep(0.2)
+        release.set()
+        results = [future.result() for future in futures]
+
+    df_func.assert_called_once_with(1, 2)
+    for result in results:
+        pd.testing.assert_frame_equal(result, data)
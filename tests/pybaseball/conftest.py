@@ -1,6 +1,9 @@
 import os
+import sys
+import tempfile
+import types
 import urllib.parse
-from typing import Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 from unittest.mock import MagicMock
 
 import pandas as pd
@@ -9,6 +12,9 @@ import requests
 from _pytest.monkeypatch import MonkeyPatch
 from typing_extensions import Protocol
 
+from pybaseball import cache
+from pybaseball.datasources import rate_limit
+from pybaseball.datasources.async_http import AsyncFetcher
 from pybaseball.datasources.bref import BRefSession
 
 _ParseDates = Union[bool, List[int], List[str], List[List], Dict]
@@ -28,6 +34,10 @@ class GetDataFrameCallable(Protocol):
     def __call__(self, filename: str, parse_dates: _ParseDates = False) -> pd.DataFrame: ...
 
 
+class StatcastFetchMonkeypatch(Protocol):
+    def __call__(self, respond: Callable[..., pd.DataFrame]) -> MagicMock: ...
+
+
 # Autouse to prevent integration tests sneaking into the unit tests
 @pytest.fixture(autouse=True)
 def _requests_prevent_delete(monkeypatch: MonkeyPatch, thrower: Callable, logging_side_effect: Callable) -> MagicMock:
@@ -100,6 +110,35 @@ def _remove(monkeypatch: MonkeyPatch, logging_side_effect: Callable) -> MagicMoc
     return mock
 
 
+# Autouse so every test starts with a full bucket, whatever the tests before it requested
+@pytest.fixture(autouse=True, name="rate_limits")
+def _rate_limits(monkeypatch: MonkeyPatch) -> Dict[str, rate_limit.TokenBucket]:
+    limiters = {rate_limit.SAVANT_HOST: rate_limit.TokenBucket()}
+    monkeypatch.setattr(rate_limit, '_limiters', limiters)
+    return limiters
+
+
+# pathlib.Path.mkdir is mocked out for the unit tests, which rules out pytest's tmp_path
+@pytest.fixture(name="cache_dir")
+def _cache_dir(monkeypatch: MonkeyPatch) -> Iterator[str]:
+    """
+        Turns the cache on, in a temporary directory that is removed after the test, and returns its path
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        monkeypatch.setattr(cache.file_utils, 'mkdir', lambda path: os.makedirs(path, exist_ok=True))
+        monkeypatch.setattr(cache.config, 'cache_directory', directory)
+        monkeypatch.setattr(cache.config, 'enabled', True)
+        yield directory
+
+
+@pytest.fixture(name="statcast_module")
+def _statcast_module() -> types.ModuleType:
+    """
+        Returns the pybaseball.statcast module, which the statcast function shadows in the package namespace
+    """
+    return sys.modules['pybaseball.statcast']
+
+
 @pytest.fixture()
 def data_dir() -> str:
     """
@@ -188,10 +227,42 @@ def response_get_monkeypatch(monkeypatch: MonkeyPatch) -> Callable:
 
             return DummyResponse(result)
 
+        async def _async_monkeypatch(self: AsyncFetcher, url: str, **kwargs: Any) -> bytes:
+            _monkeypatch(url)
+            return result if isinstance(result, bytes) else result.encode('UTF-8')
+
         monkeypatch.setattr(requests, 'get', _monkeypatch)
+        # The Statcast searches go through the asyncio fetcher instead
+        monkeypatch.setattr(AsyncFetcher, 'get', _async_monkeypatch)
+
+    return setup
+
+
+@pytest.fixture()
+def statcast_fetch_monkeypatch(monkeypatch: MonkeyPatch, statcast_module: types.ModuleType) -> StatcastFetchMonkeypatch:
+    """
+        Returns a function that will monkeypatch the Baseball Savant search behind every Statcast request
+    """
+    def setup(respond: Callable[..., pd.DataFrame]) -> MagicMock:
+        """
+            Answer each search with what respond returns for it, and return the mock the searches go through
+
+
+            ARGUMENTS:
+            respond     : function : called as respond(start_dt, end_dt, team=team) with the dates searched
+        """
+        mock = MagicMock(side_effect=respond)
+
+        async def _fetch_async(fetcher: AsyncFetcher, start_dt: Any, end_dt: Any, team: Optional[str] = None,
+                               filters: Any = None, columns: Any = None) -> pd.DataFrame:
+            return mock(start_dt, end_dt, team=team)
+
+        monkeypatch.setattr(statcast_module, '_fetch_small_request_async', _fetch_async)
+        return mock
 
     return setup
 
+
 @pytest.fixture()
 def bref_get_monkeypatch(monkeypatch: MonkeyPatch) -> Callable:
     """
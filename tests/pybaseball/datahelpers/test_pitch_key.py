@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from pybaseball.datahelpers import pitch_key
+
+
+def _pitches(keys: list, values: list) -> pd.DataFrame:
+    return pd.DataFrame(
+        [(*key, value) for key, value in zip(keys, values)],
+        columns=['game_pk', 'at_bat_number', 'pitch_number', 'value']
+    ).astype({'game_pk': 'Int32', 'at_bat_number': 'Int16', 'pitch_number': 'Int8'})
+
+
+def test_pitch_keys() -> None:
+    data = _pitches([(566083, 1, 1), (566083, 1, 2), (566083, 2, 1), (None, 1, 1), (None, 1, 1)], list('abcde'))
+
+    keys = pitch_key.pitch_keys(data)
+
+    assert keys.dtype == np.int64
+    assert keys[:3].is_unique
+    assert list(keys[3:]) == [pitch_key.MISSING, pitch_key.MISSING]
+
+
+def test_pitch_keys_out_of_range() -> None:
+    data = pd.DataFrame({'game_pk': [1, 1, 1], 'at_bat_number': [1, 1, 1], 'pitch_number': [1, 1000, 1000]})
+
+    keys = pitch_key.pitch_keys(data)
+
+    assert keys[0] != keys[1]
+    assert keys[1] == keys[2]
+
+
+def test_dedupe() -> None:
+    data = _pitches([(1, 1, 1), (1, 1, 2), (1, 1, 1), (None, 1, 1), (None, 1, 1)], list('abcde'))
+
+    assert list(pitch_key.dedupe(data)['value']) == ['b', 'c', 'd', 'e']
+    assert list(pitch_key.dedupe(data, keep='first')['value']) == ['a', 'b', 'd', 'e']
+    # Without the key columns there's nothing to go by
+    assert len(pitch_key.dedupe(data.drop(columns='pitch_number'))) == 5
+
+
+def test_upsert() -> None:
+    existing = _pitches([(1, 1, 1), (1, 1, 2), (2, 1, 1)], ['old', 'old', 'old'])
+    existing['pitch_type'] = pd.Categorical(['FF', 'SL', 'FF'])
+    new = _pitches([(3, 1, 1), (1, 1, 2), (1, 1, 2)], ['added', 'stale', 'corrected'])
+    new['pitch_type'] = pd.Categorical(['CH', 'CU', 'CU'])
+
+    result = pitch_key.upsert(existing, new)
+
+    # The corrected pitch takes the place of the old one, and the new one comes after
+    assert list(result['game_pk']) == [1, 1, 2, 3]
+    assert list(result['value']) == ['old', 'corrected', 'old', 'added']
+    assert list(result['pitch_type']) == ['FF', 'CU', 'FF', 'CH']
+    assert isinstance(result['pitch_type'].dtype, pd.CategoricalDtype)
+    assert list(existing['value']) == ['old', 'old', 'old']
+
+    assert list(pitch_key.upsert(pd.DataFrame(), new)['value']) == ['added', 'corrected']
+    assert pitch_key.upsert(existing, pd.DataFrame()) is existing
+
+
+def test_upsert_existing_duplicates() -> None:
+    existing = _pitches([(1, 1, 1), (1, 1, 2), (1, 1, 1)], ['old', 'other', 'repeat'])
+    new = _pitches([(1, 1, 1)], ['new'])
+
+    result = pitch_key.upsert(existing, new)
+
+    assert list(result['value']) == ['new', 'other']
@@ -0,0 +1,63 @@
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pybaseball.statcast_pitcher_spin as spin
+from pybaseball.datahelpers import statcast_features, statcast_schema
+from pybaseball.utils import flag_imputed_data
+
+
+@pytest.fixture(name='batted_balls')
+def _batted_balls() -> pd.DataFrame:
+    return statcast_schema.apply_schema(pd.DataFrame({
+        'stand': ['L', 'R', 'R', 'L'],
+        'hc_x': [139.98, 23.86, np.nan, 100.0],
+        'hc_y': [150.23, 96.65, np.nan, 100.0],
+        'launch_speed': [89.2, 89.2, np.nan, 90.3],
+        'launch_angle': [39, 39, np.nan, -17],
+        'bb_type': ['fly_ball', 'line_drive', None, 'ground_ball'],
+    }))
+
+
+def test_add_features_batted_balls(batted_balls: pd.DataFrame) -> None:
+    result = statcast_features.add_features(batted_balls, ['spray_angle', 'adj_spray_angle', 'possible_imputation'])
+
+    assert list(result.columns) == [*batted_balls.columns, 'spray_angle', 'adj_spray_angle', 'possible_imputation']
+    np.testing.assert_allclose(result['spray_angle'], [12.6457, -33.7373, np.nan, -10.8773], rtol=1e-4)
+    np.testing.assert_allclose(result['adj_spray_angle'], [-12.6457, -33.7373, np.nan, 10.8773], rtol=1e-4)
+    assert list(result['possible_imputation']) == [True, False, False, True]
+    assert list(flag_imputed_data(batted_balls)['possible_imputation']) == [True, False, False, True]
+    # The columns data already had are shared, not copied, and data itself is left alone
+    assert np.shares_memory(result['hc_x'].to_numpy(), batted_balls['hc_x'].to_numpy())
+    assert 'spray_angle' not in batted_balls.columns
+
+
+def test_add_features_spin(get_data_file_dataframe: Callable) -> None:
+    data = get_data_file_dataframe('statcast_test_data.csv')
+    expected = spin.find_intermediate_values(data.copy())
+
+    result = statcast_features.add_features(data, 'spin', chunk_size=7)
+
+    for column in statcast_features.SPIN_COLUMNS:
+        pd.testing.assert_series_equal(result[column].astype(float), expected[column].astype(float))
+    assert result['phi'].dtype == 'Int16'
+
+
+def test_add_features_iter(batted_balls: pd.DataFrame) -> None:
+    chunks = [batted_balls.iloc[:2].copy(), pd.DataFrame(), batted_balls.iloc[2:].copy()]
+
+    results = list(statcast_features.add_features_iter(chunks, 'adj_spray_angle'))
+
+    assert results[1].empty
+    pd.testing.assert_frame_equal(
+        pd.concat([results[0], results[2]]), statcast_features.add_features(batted_balls, 'adj_spray_angle')
+    )
+
+
+def test_add_features_invalid(batted_balls: pd.DataFrame) -> None:
+    with pytest.raises(ValueError):
+        statcast_features.add_features(batted_balls, 'spin_rate')
+    with pytest.raises(ValueError):
+        statcast_features.add_features(batted_balls, 'spin')
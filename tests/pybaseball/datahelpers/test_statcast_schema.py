@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from pybaseball.datahelpers import statcast_schema
+
+
+def _raw() -> pd.DataFrame:
+    return pd.DataFrame({
+        'pitch_type': ['FF', 'SL', np.nan, 'XX'],
+        'game_date': ['2019-05-01', '2019-05-01', '2019-05-02', '2019-05-02'],
+        'balls': [0, 1, 2, 3],
+        'on_1b': [np.nan, 592450.0, np.nan, 664034.0],
+        'release_speed': [95.3, 82.1, np.nan, 88.0],
+        'estimated_woba_using_speedangle': [0.123456789, np.nan, 0.5, 0.25],
+        'new_column': ['a', 'b', 'c', 'd'],
+    })
+
+
+def test_apply_schema() -> None:
+    data = statcast_schema.apply_schema(_raw())
+
+    assert isinstance(data['pitch_type'].dtype, pd.CategoricalDtype)
+    assert list(data['pitch_type'].cat.categories) == statcast_schema.CATEGORIES['pitch_type'] + ['XX']
+    assert data['pitch_type'].isna().sum() == 1
+    assert str(data['balls'].dtype) == 'Int8'
+    assert str(data['on_1b'].dtype) == 'Int32'
+    assert data['release_speed'].dtype == np.float64
+    assert data['estimated_woba_using_speedangle'].dtype == np.float64
+    assert data['game_date'].dtype == 'datetime64[ns]'
+    assert data['new_column'].dtype == object
+
+
+def test_apply_schema_leaves_columns_that_do_not_fit() -> None:
+    data = statcast_schema.apply_schema(pd.DataFrame({'balls': [0.5, 1.0], 'game_date': ['May 1', 'May 2']}))
+
+    assert data['balls'].dtype == np.float64
+    assert data['game_date'].dtype == object
+
+
+def test_union_categories() -> None:
+    first = statcast_schema.apply_schema(pd.DataFrame({'pitch_type': ['FF', 'XX']}))
+    second = statcast_schema.apply_schema(pd.DataFrame({'pitch_type': ['YY']}))
+
+    statcast_schema.union_categories([first, second])
+    combined = pd.concat([first, second])
+
+    assert isinstance(combined['pitch_type'].dtype, pd.CategoricalDtype)
+    assert list(combined['pitch_type']) == ['FF', 'XX', 'YY']
+
+
+def test_apply_schema_restores_float32_decimals() -> None:
+    data = statcast_schema.apply_schema(pd.DataFrame({'release_speed': np.array([95.1, 82.1], dtype=np.float32)}))
+
+    assert data['release_speed'].dtype == np.float64
+    assert data['release_speed'].isin([95.1]).tolist() == [True, False]
+
+
+def test_to_raw_dtypes_round_trip() -> None:
+    raw = _raw()
+
+    result = statcast_schema.to_raw_dtypes(statcast_schema.apply_schema(_raw()))
+
+    assert result['release_speed'].tolist()[:2] == [95.3, 82.1]
+    assert result['balls'].dtype == np.int64
+    assert result['on_1b'].dtype == np.float64
+    assert result['pitch_type'].dtype == object
+    pd.testing.assert_frame_equal(result.drop(columns='game_date'), raw.drop(columns='game_date'))
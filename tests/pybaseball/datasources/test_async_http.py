@@ -0,0 +1,118 @@
+import asyncio
+from typing import Any, List, Optional
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from curl_cffi import requests
+
+from pybaseball.datasources import async_http
+
+
+class _Response:
+    def __init__(self, status_code: int, content: bytes = b''):
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}")
+
+
+class _Session:
+    ''' Stands in for curl_cffi's AsyncSession, answering from a script of responses and exceptions '''
+
+    def __init__(self, script: List[Any], delay: float = 0) -> None:
+        self.script = script
+        self.delay = delay
+        self.calls: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    async def get(self, url: str, timeout: Optional[float] = None) -> _Response:
+        self.calls.append(url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        result = self.script.pop(0) if self.script else _Response(200, b'ok')
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _fetch(session: _Session, monkeypatch: MonkeyPatch, urls: List[str], **kwargs: Any) -> List[bytes]:
+    monkeypatch.setattr(requests, 'AsyncSession', lambda max_clients: session)
+
+    async def _run() -> List[bytes]:
+        async with async_http.AsyncFetcher(backoff=0, **kwargs) as fetcher:
+            return list(await asyncio.gather(*[fetcher.get(url) for url in urls]))
+
+    return async_http.run(_run())
+
+
+def test_get(monkeypatch: MonkeyPatch) -> None:
+    session = _Session([_Response(200, b'data')])
+
+    assert _fetch(session, monkeypatch, ['https://baseballsavant.mlb.com/a']) == [b'data']
+    assert session.closed
+
+
+def test_get_retries_transient_failures(monkeypatch: MonkeyPatch) -> None:
+    session = _Session([_Response(503), requests.exceptions.Timeout('timed out'), _Response(200, b'data')])
+
+    assert _fetch(session, monkeypatch, ['https://baseballsavant.mlb.com/a']) == [b'data']
+    assert len(session.calls) == 3
+
+
+def test_get_gives_up(monkeypatch: MonkeyPatch) -> None:
+    session = _Session([_Response(503)] * 3)
+
+    with pytest.raises(async_http.AsyncHTTPError):
+        _fetch(session, monkeypatch, ['https://baseballsavant.mlb.com/a'], retries=2)
+    assert len(session.calls) == 3
+
+
+def test_get_does_not_retry_client_errors(monkeypatch: MonkeyPatch) -> None:
+    session = _Session([_Response(404)])
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        _fetch(session, monkeypatch, ['https://baseballsavant.mlb.com/a'])
+    assert len(session.calls) == 1
+
+
+def test_get_limits_concurrency_per_host(monkeypatch: MonkeyPatch) -> None:
+    session = _Session([], delay=0.01)
+    urls = [f'https://baseballsavant.mlb.com/{i}' for i in range(10)] + [f'https://example.com/{i}' for i in range(10)]
+
+    _fetch(session, monkeypatch, urls, max_concurrency=3)
+
+    assert len(session.calls) == 20
+    assert session.max_in_flight == 6
+
+
+def test_invalid_fetcher() -> None:
+    with pytest.raises(ValueError):
+        async_http.AsyncFetcher(max_concurrency=0)
+    with pytest.raises(ValueError):
+        async_http.AsyncFetcher(retries=-1)
+
+
+def test_backoff_delay() -> None:
+    assert all(0 <= async_http.backoff_delay(attempt, 1.0, 30.0) <= min(30.0, 2 ** attempt) for attempt in range(8))
+
+
+def test_run_inside_event_loop() -> None:
+    async def _value() -> int:
+        return 1
+
+    async def _outer() -> int:
+        # e.g. a notebook calling statcast() from a cell
+        return async_http.run(_value())
+
+    assert asyncio.run(_outer()) == 1
@@ -0,0 +1,61 @@
+import asyncio
+import sys
+import types
+from typing import Callable, Iterator
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball.datasources import parse_pool
+from pybaseball.statcast import StatcastException, _parse_small_request, _read_columns
+
+
+@pytest.fixture(name="single_game_raw")
+def _single_game_raw(get_data_file_contents: Callable[[str], str]) -> bytes:
+    return get_data_file_contents('single_game_request_raw.csv').encode('utf-8')
+
+
+@pytest.fixture(autouse=True)
+def _disable_pool() -> Iterator[None]:
+    yield
+    parse_pool.disable()
+
+
+def test_arrow_round_trip_keeps_dtypes(single_game_raw: bytes) -> None:
+    expected = _parse_small_request(single_game_raw)
+
+    result = parse_pool.from_arrow(parse_pool.to_arrow(expected))
+
+    assert result is not None
+    pd.testing.assert_series_equal(result.dtypes, expected.dtypes)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_run_async_in_processes(single_game_raw: bytes) -> None:
+    assert parse_pool.configure(processes=1)
+
+    columns = _read_columns(['pitch_type', 'release_speed'])
+
+    result = asyncio.run(parse_pool.run_async(_parse_small_request, single_game_raw, columns))
+
+    pd.testing.assert_frame_equal(result, _parse_small_request(single_game_raw, columns))
+    with pytest.raises(StatcastException):
+        asyncio.run(parse_pool.run_async(_parse_small_request, b'"error"\n"Too many rows"\n'))
+
+
+def test_configure_without_main_falls_back(monkeypatch: MonkeyPatch, single_game_raw: bytes) -> None:
+    # Like a notebook's __main__, which has no file
+    monkeypatch.setitem(sys.modules, '__main__', types.ModuleType('__main__'))
+
+    with pytest.warns(UserWarning):
+        assert not parse_pool.configure()
+
+    assert not parse_pool.enabled()
+    result = asyncio.run(parse_pool.run_async(_parse_small_request, single_game_raw))
+    pd.testing.assert_frame_equal(result, _parse_small_request(single_game_raw))
+
+
+def test_configure_invalid() -> None:
+    with pytest.raises(ValueError):
+        parse_pool.configure(processes=0)
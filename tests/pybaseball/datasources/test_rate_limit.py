@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball.datasources import rate_limit
+
+
+class _Clock:
+    ''' Stands in for the clocks, with sleeping moving time on '''
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture(name='clock')
+def _clock(monkeypatch: MonkeyPatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(time, 'monotonic', clock.time)
+    monkeypatch.setattr(time, 'time', clock.time)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_token_bucket_queues_past_burst(clock: _Clock) -> None:
+    bucket = rate_limit.TokenBucket(rate=2, burst=3)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    # The burst goes straight through, then requests go at the rate
+    assert waits == [0, 0, 0, 0.5, 0.5]
+    assert clock.sleeps == [0.5, 0.5]
+
+    # A quiet spell refills the bucket, up to the burst
+    clock.now += 10
+    assert [bucket.acquire() for _ in range(4)] == [0, 0, 0, 0.5]
+
+    assert bucket.stats.requests == 9
+    assert bucket.stats.waited == 3
+    assert bucket.stats.total_wait == 1.5
+    assert bucket.stats.max_wait == 0.5
+    assert bucket.stats.mean_wait == pytest.approx(1.5 / 9)
+
+
+def test_token_bucket_shared_through_directory(clock: _Clock, cache_dir: str) -> None:
+    # As if in two processes
+    first = rate_limit.TokenBucket(rate=1, burst=2, directory=cache_dir)
+    second = rate_limit.TokenBucket(rate=1, burst=2, directory=cache_dir)
+
+    assert first._reserve() == 0
+    assert second._reserve() == 0
+    # The third request of either has to wait for the next token, and the fourth for the one after it
+    assert first._reserve() == 1
+    assert second._reserve() == 2
+
+
+def test_token_bucket_acquire_async() -> None:
+    bucket = rate_limit.TokenBucket(rate=1000, burst=1)
+
+    async def _acquire() -> List[float]:
+        return list(await asyncio.gather(*[bucket.acquire_async() for _ in range(3)]))
+
+    waits = asyncio.run(_acquire())
+
+    assert waits[0] == 0
+    assert all(wait > 0 for wait in waits[1:])
+    assert bucket.stats.requests == 3
+    assert bucket.stats.waited == 2
+
+
+def test_token_bucket_invalid() -> None:
+    with pytest.raises(ValueError):
+        rate_limit.TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        rate_limit.TokenBucket(burst=0)
+
+
+def test_get_waits_for_host_limit(clock: _Clock, monkeypatch: MonkeyPatch) -> None:
+    get = MagicMock(return_value='response')
+    monkeypatch.setattr(requests, 'get', get)
+    rate_limit.configure(rate=1, burst=1, host='example.com')
+    try:
+        assert rate_limit.get('https://example.com/one', timeout=None) == 'response'
+        rate_limit.get('https://example.com/two')
+        # Other hosts aren't limited
+        rate_limit.get('https://other.com/three')
+        stats = rate_limit.stats('example.com')
+    finally:
+        rate_limit.disable('example.com')
+
+    assert get.call_count == 3
+    get.assert_any_call('https://example.com/one', timeout=None)
+    assert clock.sleeps == [1]
+    assert stats is not None and stats.requests == 2 and stats.waited == 1
+    assert rate_limit.limiter('https://example.com/one') is None
+    assert rate_limit.limiter('https://baseballsavant.mlb.com/statcast_search/csv') is not None
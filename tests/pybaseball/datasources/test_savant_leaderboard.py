@@ -0,0 +1,97 @@
+import re
+from typing import List, Union
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball.datasources.savant_leaderboard import SavantLeaderboard
+from pybaseball.statcast_pitcher import statcast_pitcher_active_spin
+
+_LEADERBOARD = SavantLeaderboard(path='leaderboard/test?year={year}&min={min_pa}&csv=true', drop_null='player_name')
+
+
+@pytest.fixture(name='urls')
+def _urls(monkeypatch: MonkeyPatch) -> List[str]:
+    ''' Answers every leaderboard with a player per season, plus a league average row, and records the urls '''
+    urls: List[str] = []
+
+    def _get(url: str, **kwargs: object) -> MagicMock:
+        urls.append(url)
+        year = int(re.findall(r'year=(\d+)', url)[0])
+        content = f' player_name, player_id,pa\nPlayer {year},{year - 2000},600\n,999999,0\n'
+        return MagicMock(content=content.encode('utf-8'))
+
+    monkeypatch.setattr(requests, 'get', _get)
+    return urls
+
+
+def test_fetch_one_year(urls: List[str]) -> None:
+    data = _LEADERBOARD.fetch(2019, min_pa=100)
+
+    assert urls == ['https://baseballsavant.mlb.com/leaderboard/test?year=2019&min=100&csv=true']
+    # No year column for a single season, the league average row is dropped, and the columns are stripped
+    assert list(data.columns) == ['player_name', 'player_id', 'pa']
+    assert list(data['player_name']) == ['Player 2019']
+    assert data['player_id'].dtype == 'Int32'
+
+
+@pytest.mark.parametrize('year', ['2019', np.int64(2019)])
+def test_fetch_one_year_not_int(urls: List[str], year: Union[int, str]) -> None:
+    data = _LEADERBOARD.fetch(year, min_pa=100)
+
+    assert urls == ['https://baseballsavant.mlb.com/leaderboard/test?year=2019&min=100&csv=true']
+    assert list(data.columns) == ['player_name', 'player_id', 'pa']
+
+
+def test_fetch_years(urls: List[str]) -> None:
+    data = _LEADERBOARD.fetch([2021, 2019, 2020], min_pa='q')
+
+    assert sorted(urls) == [
+        f'https://baseballsavant.mlb.com/leaderboard/test?year={year}&min=q&csv=true' for year in (2019, 2020, 2021)
+    ]
+    assert list(data.columns) == ['year', 'player_name', 'player_id', 'pa']
+    assert list(data['year']) == [2021, 2019, 2020]
+    assert data['year'].dtype == 'Int16'
+    assert list(data['player_id']) == [21, 19, 20]
+
+
+def test_fetch_years_caches_each_year(cache_dir: str, urls: List[str]) -> None:
+    _LEADERBOARD.fetch(range(2019, 2021), min_pa=100)
+    assert len(urls) == 2
+
+    data = _LEADERBOARD.fetch(range(2020, 2022), min_pa=100)
+
+    # Only 2021 was fetched
+    assert len(urls) == 3
+    assert 'year=2021' in urls[-1]
+    assert list(data['year']) == [2020, 2021]
+
+
+def test_fetch_html_is_empty(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(requests, 'get', lambda url, **kwargs: MagicMock(content=b'<!DOCTYPE html><html></html>'))
+
+    assert _LEADERBOARD.fetch(2019, min_pa=100).empty
+    assert _LEADERBOARD.fetch([2019, 2020], min_pa=100).empty
+
+
+def test_active_spin_falls_back_to_observed(monkeypatch: MonkeyPatch) -> None:
+    def _get(url: str, **kwargs: object) -> MagicMock:
+        year, spin_type = re.findall(r'year=(\d+)_([a-z-]+)', url)[0]
+        if year == '2019' and spin_type == 'spin-based':
+            return MagicMock(content=b'<html></html>')
+        return MagicMock(content=f'"last_name, first_name",active_spin\n"{spin_type}, {year}",0.9\n'.encode('utf-8'))
+
+    monkeypatch.setattr(requests, 'get', _get)
+
+    with pytest.warns(UserWarning):
+        data = statcast_pitcher_active_spin([2019, 2020])
+
+    assert list(data['year']) == [2019, 2020]
+    assert list(data['last_name, first_name']) == ['observed, 2019', 'spin-based, 2020']
+    assert isinstance(statcast_pitcher_active_spin(2020), pd.DataFrame)
+    # A season given as a string is one season, not its digits
+    assert list(statcast_pitcher_active_spin('2020')['last_name, first_name']) == ['spin-based, 2020']
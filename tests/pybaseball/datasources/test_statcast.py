@@ -0,0 +1,56 @@
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pybaseball.datasources import statcast as statcast_ds
+
+
+@pytest.fixture(name="single_game_raw")
+def _single_game_raw(get_data_file_contents: Callable[[str], str]) -> str:
+    return get_data_file_contents('single_game_request_raw.csv')
+
+
+def test_get_statcast_data_from_csv_bytes(single_game_raw: str) -> None:
+    expected = statcast_ds.get_statcast_data_from_csv(single_game_raw)
+
+    result = statcast_ds.get_statcast_data_from_csv_bytes(single_game_raw.encode('utf-8'))
+
+    pd.testing.assert_series_equal(result.dtypes, expected.dtypes)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_get_statcast_data_from_csv_bytes_repeated_columns() -> None:
+    result = statcast_ds.get_statcast_data_from_csv_bytes(
+        '\ufeff"pitch_type","pitcher","balls","pitcher"\n"FF",1,0,2\n"SL",1,,2\n'.encode('utf-8')
+    )
+
+    assert list(result.columns) == ['pitch_type', 'pitcher', 'balls', 'pitcher.1']
+    assert str(result['balls'].dtype) == 'Int8'
+    assert result['balls'].isna().tolist() == [False, True]
+    assert list(result['pitcher.1']) == [2, 2]
+
+
+def test_get_statcast_data_from_csv_bytes_falls_back() -> None:
+    # Not a whole number, so it doesn't fit the declared Int8
+    result = statcast_ds.get_statcast_data_from_csv_bytes(b'"balls","release_speed"\n1.5,95.1\n')
+
+    assert result['balls'].dtype == np.float64
+    assert result['release_speed'].dtype == np.float64
+
+
+def test_get_statcast_data_from_csv_bytes_error() -> None:
+    result = statcast_ds.get_statcast_data_from_csv_bytes(b'"error"\n"Too many rows"\n')
+
+    assert list(result['error']) == ['Too many rows']
+
+
+def test_get_statcast_data_from_csv_bytes_columns(single_game_raw: str) -> None:
+    result = statcast_ds.get_statcast_data_from_csv_bytes(
+        single_game_raw.encode('utf-8'), columns=['release_speed', 'pitch_type', 'not_a_column']
+    )
+    fallback = statcast_ds.get_statcast_data_from_csv(single_game_raw, columns=['release_speed', 'pitch_type'])
+
+    assert list(result.columns) == ['pitch_type', 'release_speed']
+    pd.testing.assert_frame_equal(result, fallback)
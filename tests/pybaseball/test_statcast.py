@@ -1,9 +1,13 @@
-from typing import Callable
+from typing import Callable, List
+from unittest.mock import MagicMock
 
+import numpy as np
 import pandas as pd
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
 
-from pybaseball.statcast import _SC_SINGLE_GAME_REQUEST, statcast_single_game
+from pybaseball.datahelpers import statcast_schema
+from pybaseball.statcast import _SC_SINGLE_GAME_REQUEST, _SORT_COLUMNS, _combine, statcast, statcast_single_game
 from pybaseball.utils import DATE_FORMAT
 
 # For an explanation of this type, see the note on GetDataFrameCallable in tests/pybaseball/conftest.py
@@ -31,6 +35,87 @@ def test_statcast_single_game_request(response_get_monkeypatch: Callable, single
         _SC_SINGLE_GAME_REQUEST.format(game_pk=game_pk)
     )
 
-    statcast_result = statcast_single_game(game_pk).reset_index(drop=True)
+    statcast_result = statcast_single_game(game_pk, typed=False).reset_index(drop=True)
 
     pd.testing.assert_frame_equal(statcast_result, single_game, check_dtype=False)
+
+
+def test_statcast_single_game_request_typed(response_get_monkeypatch: Callable, single_game_raw: str,
+                                            single_game: pd.DataFrame) -> None:
+    game_pk = '631614'
+
+    response_get_monkeypatch(
+        single_game_raw.encode('UTF-8'),
+        _SC_SINGLE_GAME_REQUEST.format(game_pk=game_pk)
+    )
+
+    statcast_result = statcast_single_game(game_pk).reset_index(drop=True)
+
+    assert isinstance(statcast_result['pitch_type'].dtype, pd.CategoricalDtype)
+    assert statcast_result['release_speed'].dtype == np.float64
+    assert str(statcast_result['game_pk'].dtype) == 'Int32'
+    pd.testing.assert_frame_equal(statcast_schema.to_raw_dtypes(statcast_result), single_game, check_dtype=False)
+
+
+def test_statcast_typed_keeps_measurements_exact(response_get_monkeypatch: Callable, single_game_raw: str) -> None:
+    response_get_monkeypatch(single_game_raw.encode('UTF-8'))
+
+    typed = statcast('2020-09-03', '2020-09-03', verbose=False)
+    untyped = statcast('2020-09-03', '2020-09-03', verbose=False, typed=False)
+
+    assert typed['release_speed'].isin([95.1]).sum() == untyped['release_speed'].isin([95.1]).sum() == 2
+    pd.testing.assert_series_equal(typed['release_speed'], untyped['release_speed'])
+
+
+def test_statcast_single_game_request_columns(response_get_monkeypatch: Callable, single_game_raw: str,
+                                              single_game: pd.DataFrame) -> None:
+    game_pk = '631614'
+
+    response_get_monkeypatch(
+        single_game_raw.encode('UTF-8'),
+        _SC_SINGLE_GAME_REQUEST.format(game_pk=game_pk)
+    )
+
+    statcast_result = statcast_single_game(game_pk, typed=False, columns=['pitch_type', 'release_speed'])
+
+    assert list(statcast_result.columns) == ['pitch_type', 'release_speed']
+    pd.testing.assert_frame_equal(statcast_result.reset_index(drop=True), single_game[['pitch_type', 'release_speed']],
+                                  check_dtype=False)
+
+
+def _chunk(game_date: str, game_pks: List[int]) -> pd.DataFrame:
+    data = pd.DataFrame([
+        {'game_date': game_date, 'game_pk': game_pk, 'at_bat_number': 1, 'pitch_number': pitch}
+        for game_pk in game_pks for pitch in range(1, 3)
+    ])
+    return data.sort_values(_SORT_COLUMNS, ascending=False)
+
+
+def test_combine_orders_chunks_without_sorting(monkeypatch: MonkeyPatch) -> None:
+    chunks = [_chunk('2019-05-02', [3, 4]), _chunk('2019-05-04', [7]), pd.DataFrame(), _chunk('2019-05-03', [5, 6])]
+    sort_values = MagicMock(side_effect=pd.DataFrame.sort_values)
+    monkeypatch.setattr(pd.DataFrame, 'sort_values', sort_values)
+
+    result = _combine(chunks)
+
+    sort_values.assert_not_called()
+    assert list(result['game_pk']) == [7, 7, 6, 6, 5, 5, 4, 4, 3, 3]
+    assert list(result['pitch_number']) == [2, 1] * 5
+
+
+def test_combine_overlapping_chunks() -> None:
+    result = _combine([_chunk('2019-05-02', [3, 5]), _chunk('2019-05-02', [4])])
+
+    assert list(result['game_pk']) == [5, 5, 4, 4, 3, 3]
+
+
+def test_combine_drops_repeated_pitches() -> None:
+    result = _combine([_chunk('2019-05-02', [3, 5]), _chunk('2019-05-02', [5])])
+
+    assert list(result['game_pk']) == [5, 5, 3, 3]
+    assert list(result['pitch_number']) == [2, 1, 2, 1]
+
+
+def test_combine_empty() -> None:
+    assert _combine([]).empty
+    assert _combine([pd.DataFrame()]).empty
@@ -0,0 +1,97 @@
+import re
+import sys
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import StatcastFilter, statcast_aggregate
+
+_HEADER = 'pitches,player_id,player_name,total_pitches,pitch_percent,ba,abs,hits,velocity'
+_SEASONS = {
+    '2018': ['100,1,"Pitcher, A",1000,10.0,0.200,50,10,95.0', '300,2,"Pitcher, B",1000,30.0,0.300,100,30,90.0'],
+    '2019': ['300,1,"Pitcher, A",1000,30.0,0.300,50,15,97.0'],
+}
+
+
+@pytest.fixture(name='urls')
+def _urls(monkeypatch: MonkeyPatch) -> List[str]:
+    ''' Answers each season's search with its summary rows, and records the urls '''
+    urls: List[str] = []
+
+    def _get(url: str, **kwargs: object) -> MagicMock:
+        urls.append(url)
+        season = re.findall(r'game_date_gt=(\d+)', url)[0]
+        return MagicMock(content='\n'.join([_HEADER] + _SEASONS.get(season, [])).encode('utf-8'))
+
+    monkeypatch.setattr(requests, 'get', _get)
+    return urls
+
+
+def test_statcast_aggregate_one_season(urls: List[str]) -> None:
+    result = statcast_aggregate('2018-05-01', '2018-05-31', group_by='team', player_type='batter',
+                                filters=StatcastFilter(pitch_types='SL'), verbose=False)
+
+    assert len(urls) == 1
+    assert 'group_by=team' in urls[0]
+    assert 'player_type=batter' in urls[0]
+    assert 'hfPT=SL%7C' in urls[0]
+    assert 'type=details' not in urls[0]
+    assert list(result['player_id']) == [1, 2]
+
+
+def test_statcast_aggregate_merges_seasons(urls: List[str]) -> None:
+    result = statcast_aggregate('2018-01-01', '2019-12-31', verbose=False)
+
+    # One request per season
+    assert sorted(re.findall(r'game_date_gt=([\d-]+)', url)[0][:4] for url in urls) == ['2018', '2019']
+    assert all('group_by=name' in url for url in urls)
+
+    assert list(result.columns) == _HEADER.split(',')
+    assert list(result['player_id']) == [1, 2]
+    first = result.iloc[0]
+    assert first['pitches'] == 400
+    assert first['total_pitches'] == 2000
+    assert first['pitch_percent'] == pytest.approx(20.0)
+    assert first['hits'] == 25
+    # Averaged over at bats, and over pitches
+    assert first['ba'] == pytest.approx(0.25)
+    assert first['velocity'] == pytest.approx((100 * 95.0 + 300 * 97.0) / 400)
+    assert result.iloc[1]['ba'] == pytest.approx(0.3)
+
+
+def test_statcast_aggregate_merges_batted_balls(monkeypatch: MonkeyPatch, urls: List[str]) -> None:
+    module = sys.modules[__name__]
+    monkeypatch.setattr(module, '_HEADER', 'pitches,player_id,player_name,total_pitches,bip,launch_speed,woba,babip')
+    monkeypatch.setattr(module, '_SEASONS', {
+        '2018': ['1000,1,"Batter, A",20000,200,90.0,0.350,0.300'],
+        '2019': ['3000,1,"Batter, A",20000,100,84.0,0.310,0.280'],
+    })
+
+    # babip and woba have no denominator in the data, so they can't be merged
+    with pytest.warns(UserWarning, match="woba, babip.*group_by='player_year'"):
+        result = statcast_aggregate('2018-01-01', '2019-12-31', group_by='player', player_type='batter',
+                                    verbose=False)
+
+    assert list(result.columns) == ['pitches', 'player_id', 'player_name', 'total_pitches', 'bip', 'launch_speed']
+    row = result.iloc[0]
+    assert row['bip'] == 300
+    # Averaged over batted balls, not pitches: (200 * 90 + 100 * 84) / 300
+    assert row['launch_speed'] == pytest.approx(88.0)
+
+
+def test_statcast_aggregate_caches_seasons(cache_dir: str, urls: List[str]) -> None:
+    statcast_aggregate('2018-04-01', '2018-10-01', verbose=False)
+    assert len(urls) == 1
+
+    result = statcast_aggregate('2018-04-01', '2018-10-01', verbose=False)
+
+    assert len(urls) == 1
+    assert list(result['player_id']) == [1, 2]
+
+
+def test_statcast_aggregate_invalid() -> None:
+    with pytest.raises(ValueError):
+        statcast_aggregate('2018-05-01', player_type='catcher')
@@ -14,7 +14,8 @@ def _single_day_raw(get_data_file_contents: Callable[[str], str]) -> str:
 
 @pytest.fixture(name="single_day")
 def _single_day(get_data_file_dataframe: GetDataFrameCallable) -> pd.DataFrame:
-    return get_data_file_dataframe("statcast_batter_data.csv")
+    # game_date is parsed, as for statcast()
+    return get_data_file_dataframe("statcast_batter_data.csv", parse_dates=[2])
 
 
 def test_statcast_batter_input_handling(
@@ -40,8 +41,8 @@ def test_statcast_batter_input_handling(
     url_end = "&team=&position=&hfRO=&home_road=&hfFlag=&metric_1=&hfInn=&min_pitches=0&min_results=0&group_by=name&sort_col=pitches&player_event_sort=h_launch_speed&sort_order=desc&min_abs=0&type=details&"
     response_get_monkeypatch(single_day_raw, url_end)
 
-    res = statcast_batter(start_dt=dt, player_id=pid)
+    res = statcast_batter(start_dt=dt, player_id=pid, typed=False)
     pd.testing.assert_frame_equal(res, single_day, check_dtype=False)
 
-    res = statcast_batter(end_dt=dt, player_id=pid)
+    res = statcast_batter(end_dt=dt, player_id=pid, typed=False)
     pd.testing.assert_frame_equal(res, single_day, check_dtype=False)
@@ -0,0 +1,74 @@
+from datetime import date
+from typing import List, Optional
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import statcast_calendar, statcast_store, utils
+from pybaseball.datahelpers import statcast_schema
+from pybaseball.statcast import _handle_request
+
+from .conftest import StatcastFetchMonkeypatch
+
+
+@pytest.fixture(name='store')
+def _store(cache_dir: str) -> statcast_store.StatcastStore:
+    return statcast_store.StatcastStore.from_config()
+
+
+def _pitches(days: List[date]) -> pd.DataFrame:
+    return statcast_schema.apply_schema(pd.DataFrame([
+        {'game_date': day.isoformat(), 'game_pk': day.toordinal(), 'at_bat_number': 1, 'pitch_number': 1}
+        for day in days
+    ]))
+
+
+def test_game_calendar(store: statcast_store.StatcastStore) -> None:
+    store.save_days(date(2019, 7, 7), date(2019, 7, 12), _pitches([date(2019, 7, 7), date(2019, 7, 11)]))
+    store.save_days(date(2019, 7, 11), date(2019, 7, 12), _pitches([date(2019, 7, 12)]), team='SEA')
+    # Not settled yet, so not known to be empty
+    store.save_days(date.today(), date.today(), None)
+
+    league = statcast_calendar.GameCalendar.from_store(store)
+    assert league.empty_days == {date(2019, 7, 8), date(2019, 7, 9), date(2019, 7, 10), date(2019, 7, 12)}
+    assert league.has_games(date(2019, 7, 11))
+    assert league.has_games(date.today()) is None
+
+    seattle = statcast_calendar.GameCalendar.from_store(store, 'SEA')
+    assert not seattle.has_games(date(2019, 7, 11))
+    assert seattle.has_games(date(2019, 7, 12))
+    assert date(2019, 7, 8) in seattle.empty_days
+
+
+def test_update_valid_dates(store: statcast_store.StatcastStore, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(utils, 'STATCAST_VALID_DATES', dict(utils.STATCAST_VALID_DATES))
+    monkeypatch.setattr(statcast_calendar, 'STATCAST_VALID_DATES', utils.STATCAST_VALID_DATES)
+    store.save_days(date(2023, 3, 15), date(2023, 10, 31), _pitches([date(2023, 3, 30), date(2023, 10, 1)]))
+
+    # Not the whole season yet
+    statcast_calendar.update_valid_dates()
+    assert 2023 not in utils.STATCAST_VALID_DATES
+
+    store.save_days(date(2023, 11, 1), date(2023, 11, 15), _pitches([date(2023, 11, 1)]))
+    statcast_calendar.update_valid_dates()
+    assert utils.STATCAST_VALID_DATES[2023] == (date(2023, 3, 30), date(2023, 11, 1))
+    days = [start for start, _ in utils.statcast_date_range(date(2023, 3, 1), date(2023, 12, 31), 1, verbose=False)]
+    assert (days[0], days[-1]) == (date(2023, 3, 30), date(2023, 11, 1))
+
+
+def test_handle_request_skips_days_without_games(store: statcast_store.StatcastStore,
+                                                 statcast_fetch_monkeypatch: StatcastFetchMonkeypatch) -> None:
+    # The league had no games on the 2nd
+    store.save_days(date(2019, 7, 1), date(2019, 7, 3), _pitches([date(2019, 7, 1), date(2019, 7, 3)]))
+
+    def _fetch(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        return _pitches([start_dt])
+
+    fetch = statcast_fetch_monkeypatch(_fetch)
+
+    _handle_request(date(2019, 7, 2), date(2019, 7, 2), None, verbose=False, team='SEA')
+    assert fetch.call_count == 0
+
+    _handle_request(date(2019, 7, 1), date(2019, 7, 3), None, verbose=False, team='SEA')
+    assert [call.args for call in fetch.call_args_list] == [(date(2019, 7, 1), date(2019, 7, 3))]
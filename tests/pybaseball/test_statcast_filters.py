@@ -0,0 +1,64 @@
+from datetime import date
+
+import pytest
+
+from pybaseball.statcast import _SC_SMALL_REQUEST, _partition, _small_request_url
+from pybaseball.statcast_filters import StatcastFilter
+
+
+def test_params() -> None:
+    filters = StatcastFilter(
+        pitch_types=['Slider', 'SL', 'cu'], counts='0-2', pitcher_throws='r', events=['home_run', 'single'],
+        zones=[11, 1], position='SS'
+    )
+
+    assert filters.params() == {
+        'hfPT': 'CU|SL|',
+        'hfC': '02|',
+        'pitcher_throws': 'R',
+        'hfAB': 'home\\.\\.run|single|',
+        'hfZ': '1|11|',
+        'position': '6',
+    }
+
+
+def test_empty() -> None:
+    assert StatcastFilter().params() == {}
+    assert StatcastFilter().key == ''
+    assert StatcastFilter().apply(_SC_SMALL_REQUEST) == _SC_SMALL_REQUEST
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'pitch_types': 'XX'}, {'counts': '4-0'}, {'zones': 15}, {'pitcher_throws': 'S'}, {'outs': 3},
+    {'position': 'QB'},
+])
+def test_invalid(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        StatcastFilter(**kwargs)
+
+
+def test_key() -> None:
+    assert StatcastFilter(pitch_types=['SL', 'FF']).key == StatcastFilter(pitch_types=['4-Seamer', 'Slider']).key
+    assert StatcastFilter(pitch_types='SL').key != StatcastFilter(pitch_types='FF').key
+    assert len(StatcastFilter(pitch_types='SL').key) == 16
+
+
+def test_apply() -> None:
+    filters = StatcastFilter(pitch_types=['SL', 'CU'], counts=['0-2', '1-2'], batter_stands='L')
+
+    url = _small_request_url(date(2019, 5, 1), date(2019, 5, 2), filters=filters)
+
+    assert '&hfPT=CU%7CSL%7C&' in url
+    assert '&batter_stands=L&' in url
+    assert url.endswith('&hfC=02%7C12%7C')
+    assert url.count('hfPT=') == 1
+    assert '&game_date_gt=2019-05-01&game_date_lt=2019-05-02&' in url
+
+
+def test_partition() -> None:
+    filters = StatcastFilter(pitch_types='SL')
+
+    assert _partition('BOS') == 'BOS'
+    assert _partition('BOS', StatcastFilter()) == 'BOS'
+    assert _partition('BOS', filters) == f'BOS-{filters.key}'
+    assert _partition(None, filters) == f'all-{filters.key}'
@@ -0,0 +1,87 @@
+import io
+import re
+from datetime import date
+from typing import Any, List, Optional
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import statcast_games, statcast_games_iter, statcast_store
+from pybaseball.datahelpers import statcast_schema
+from pybaseball.datasources.async_http import AsyncFetcher
+
+
+def _game(game_pk: int) -> str:
+    # Game n is played on May n, with n pitches
+    return '\n'.join(
+        ['game_date,game_pk,at_bat_number,pitch_number,pitch_type,release_speed'] +
+        [f'2019-05-{game_pk:02},{game_pk},1,{pitch},FF,95.0' for pitch in range(1, game_pk + 1)]
+    )
+
+
+@pytest.fixture(name='urls')
+def _urls(monkeypatch: MonkeyPatch) -> List[str]:
+    urls: List[str] = []
+
+    async def _get(self: AsyncFetcher, url: str, **kwargs: Any) -> bytes:
+        urls.append(url)
+        game_pk = int(re.findall(r'game_pk=(\d+)', url)[0])
+        return (_game(game_pk) if game_pk < 20 else 'game_date,game_pk,at_bat_number,pitch_number').encode('utf-8')
+
+    monkeypatch.setattr(AsyncFetcher, 'get', _get)
+    return urls
+
+
+def test_statcast_games(urls: List[str]) -> None:
+    result = statcast_games([3, 1, 25, 2, 3], max_concurrency=2, verbose=False)
+
+    # Each game once
+    assert sorted(int(url.rsplit('=', 1)[1]) for url in urls) == [1, 2, 3, 25]
+    # In the order given, without the game that has no data
+    assert list(result['game_pk']) == [3, 3, 3, 1, 2, 2]
+    assert list(result['pitch_number'][:3]) == [3, 2, 1]
+    assert isinstance(result['pitch_type'].dtype, pd.CategoricalDtype)
+
+
+def test_statcast_games_iter_columns(urls: List[str]) -> None:
+    games = list(statcast_games_iter([1, 2], verbose=False, typed=False, columns=['release_speed']))
+
+    assert [list(game.columns) for game in games] == [['release_speed'], ['release_speed']]
+    assert [len(game) for game in games] == [1, 2]
+
+
+def test_statcast_games_uses_store(cache_dir: str, urls: List[str]) -> None:
+    # The league's data for May 1 and 2, as statcast() would have stored it
+    league = pd.concat([pd.read_csv(io.StringIO(_game(game_pk))) for game_pk in [2, 1]])
+    store = statcast_store.StatcastStore.from_config()
+    store.save_days(date(2019, 5, 1), date(2019, 5, 2), statcast_schema.apply_schema(league))
+
+    result = statcast_games([1, 2, 3], verbose=False)
+    assert len(urls) == 1
+    assert list(result['game_pk']) == [1, 2, 2, 3, 3, 3]
+
+    # The game that was fetched is kept too
+    statcast_games([3], verbose=False)
+    assert len(urls) == 1
+
+
+@pytest.mark.parametrize('partition, kind, fetched', [
+    (None, None, False),
+    ('SEA', statcast_store.TEAM, False),
+    # What a partition holds is recorded, not read from its name
+    ('LA-ANGELS', statcast_store.TEAM, False),
+    ('SEA-abcdef', statcast_store.FILTERED, True),
+    ('sliders', statcast_store.FILTERED, True),
+    ('pitcher-1', statcast_store.PLAYER, True),
+])
+def test_statcast_games_only_serves_whole_games(cache_dir: str, urls: List[str], partition: Optional[str],
+                                                 kind: Optional[str], fetched: bool) -> None:
+    store = statcast_store.StatcastStore.from_config()
+    data = statcast_schema.apply_schema(pd.read_csv(io.StringIO(_game(1))))
+    store.save_days(date(2019, 5, 1), date(2019, 5, 1), data, partition, kind)
+
+    result = statcast_games([1], verbose=False)
+
+    assert len(urls) == int(fetched)
+    assert list(result['game_pk']) == [1]
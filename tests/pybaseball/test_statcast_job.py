@@ -0,0 +1,115 @@
+import json
+import os
+import types
+from datetime import date
+from typing import List, Optional, Tuple
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import cache, statcast_planner, statcast_store
+from pybaseball.datahelpers import statcast_schema
+from pybaseball.statcast import _handle_request
+from pybaseball.statcast_job import JOURNAL_FILENAME, StatcastJob
+
+from .conftest import StatcastFetchMonkeypatch
+
+
+@pytest.fixture(name='job_dir')
+def _job_dir(cache_dir: str, monkeypatch: MonkeyPatch) -> str:
+    # Jobs don't need the cache, so it's off
+    monkeypatch.setattr(cache.config, 'enabled', False)
+    return os.path.join(cache_dir, 'job')
+
+
+@pytest.fixture(name='fetch')
+def _fetch(monkeypatch: MonkeyPatch, statcast_module: types.ModuleType,
+           statcast_fetch_monkeypatch: StatcastFetchMonkeypatch) -> MagicMock:
+    # Two days per request
+    monkeypatch.setattr(statcast_module, '_planners', {
+        None: statcast_planner.ChunkPlanner(row_cap=100, target_fill=1, default_rows_per_day=50)
+    })
+
+    def _fetch_small_request(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        data = statcast_schema.apply_schema(pd.DataFrame([
+            {'game_date': day.isoformat(), 'game_pk': day.toordinal(), 'at_bat_number': 1, 'pitch_number': pitch}
+            for day in statcast_store.date_span(start_dt, end_dt) for pitch in range(1, 3)
+        ]))
+        return statcast_module._process_small_request(data)
+
+    return statcast_fetch_monkeypatch(_fetch_small_request)
+
+
+def _run(job_dir: str, end: date = date(2019, 5, 6)) -> pd.DataFrame:
+    return _handle_request(date(2019, 5, 1), end, None, verbose=False, parallel=False, job_dir=job_dir)
+
+
+def _fetched(fetch: MagicMock) -> List[Tuple[date, date]]:
+    return sorted(call.args for call in fetch.call_args_list)
+
+
+def test_job_resumes(job_dir: str, fetch: MagicMock) -> None:
+    original = fetch.side_effect
+
+    def _fail_once(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        if start_dt == date(2019, 5, 3):
+            fetch.side_effect = original
+            raise ConnectionError('Connection reset')
+        return original(start_dt, end_dt, team=team)
+
+    fetch.side_effect = _fail_once
+    with pytest.raises(ConnectionError):
+        _run(job_dir)
+
+    with open(os.path.join(job_dir, JOURNAL_FILENAME)) as journal:
+        entries = [json.loads(line) for line in journal]
+    completed = {(date.fromisoformat(entry['start']), date.fromisoformat(entry['end']))
+                 for entry in entries if entry['event'] == 'chunk'}
+
+    fetch.reset_mock()
+    result = _run(job_dir)
+
+    # Only what didn't complete the first time
+    assert (date(2019, 5, 3), date(2019, 5, 4)) in _fetched(fetch)
+    assert completed and not completed & set(_fetched(fetch))
+    assert len(result) == 12
+    assert list(result['game_date'].dt.day.drop_duplicates()) == [6, 5, 4, 3, 2, 1]
+
+    # Done: nothing left to fetch
+    fetch.reset_mock()
+    assert len(_run(job_dir)) == 12
+    assert fetch.call_count == 0
+
+
+def test_job_refetches_bad_chunks(job_dir: str, fetch: MagicMock) -> None:
+    _run(job_dir)
+    chunk = os.path.join(job_dir, 'chunks', '2019-05-03_2019-05-04.feather')
+    with open(chunk, 'ab') as chunk_file:
+        chunk_file.write(b'garbage')
+    # A journal line cut off by a kill
+    with open(os.path.join(job_dir, JOURNAL_FILENAME), 'a') as journal:
+        journal.write('{"event": "chu')
+
+    fetch.reset_mock()
+    assert len(_run(job_dir)) == 12
+    assert _fetched(fetch) == [(date(2019, 5, 3), date(2019, 5, 4))]
+
+
+def test_job_pending_after_split(job_dir: str) -> None:
+    job = StatcastJob(job_dir, {'start_dt': '2019-05-01'})
+    job.plan([(date(2019, 5, 1), date(2019, 5, 4)), (date(2019, 5, 5), date(2019, 5, 5))])
+    # The first half of a split window
+    job.save_chunk(date(2019, 5, 1), date(2019, 5, 2), None)
+
+    assert StatcastJob(job_dir, {'start_dt': '2019-05-01'}).pending() == [
+        (date(2019, 5, 3), date(2019, 5, 4)), (date(2019, 5, 5), date(2019, 5, 5))
+    ]
+
+
+def test_job_other_query(job_dir: str, fetch: MagicMock) -> None:
+    _run(job_dir)
+
+    with pytest.raises(ValueError):
+        _run(job_dir, end=date(2019, 5, 7))
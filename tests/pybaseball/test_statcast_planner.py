@@ -0,0 +1,106 @@
+import types
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import statcast_planner
+from pybaseball.statcast_store import date_span
+
+from .conftest import StatcastFetchMonkeypatch
+
+
+def _days(start: date, count: int) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range(count)]
+
+
+def test_split_window() -> None:
+    assert statcast_planner.split_window(date(2020, 8, 1), date(2020, 8, 4)) == (
+        (date(2020, 8, 1), date(2020, 8, 2)), (date(2020, 8, 3), date(2020, 8, 4))
+    )
+    assert statcast_planner.split_window(date(2020, 8, 1), date(2020, 8, 2)) == (
+        (date(2020, 8, 1), date(2020, 8, 1)), (date(2020, 8, 2), date(2020, 8, 2))
+    )
+    with pytest.raises(ValueError):
+        statcast_planner.split_window(date(2020, 8, 1), date(2020, 8, 1))
+
+
+def test_plan_default_rows() -> None:
+    planner = statcast_planner.ChunkPlanner(row_cap=10000, target_fill=1, default_rows_per_day=2500)
+
+    assert planner.plan(_days(date(2020, 8, 1), 10)) == [
+        (date(2020, 8, 1), date(2020, 8, 4)), (date(2020, 8, 5), date(2020, 8, 8)),
+        (date(2020, 8, 9), date(2020, 8, 10))
+    ]
+
+
+def test_plan_observed_rows() -> None:
+    planner = statcast_planner.ChunkPlanner(row_cap=10000, target_fill=1, default_rows_per_day=2500)
+    # A light week of spring games, then a busy one
+    planner.observe(date(2020, 3, 1), date(2020, 3, 7), 7000)
+    planner.observe_days({day: 5000 for day in _days(date(2020, 3, 8), 7)})
+
+    assert planner.plan(_days(date(2020, 3, 1), 14)) == [
+        (date(2020, 3, 1), date(2020, 3, 7)), (date(2020, 3, 8), date(2020, 3, 9)),
+        (date(2020, 3, 10), date(2020, 3, 11)), (date(2020, 3, 12), date(2020, 3, 13)),
+        (date(2020, 3, 14), date(2020, 3, 14))
+    ]
+    # Unobserved days are estimated from the observed days around them
+    assert planner.expected_rows(date(2020, 3, 25)) == 5000
+
+
+def test_plan_limits(monkeypatch: MonkeyPatch) -> None:
+    planner = statcast_planner.ChunkPlanner(max_days=5, default_rows_per_day=1)
+
+    assert planner.plan(_days(date(2020, 8, 1), 7)) == [(date(2020, 8, 1), date(2020, 8, 5)),
+                                                         (date(2020, 8, 6), date(2020, 8, 7))]
+    assert planner.plan(_days(date(2020, 8, 1), 3), max_days=2) == [(date(2020, 8, 1), date(2020, 8, 2)),
+                                                                   (date(2020, 8, 3), date(2020, 8, 3))]
+    # Gaps always start a new window
+    assert planner.plan([date(2020, 8, 1), date(2020, 8, 3)]) == [(date(2020, 8, 1), date(2020, 8, 1)),
+                                                                  (date(2020, 8, 3), date(2020, 8, 3))]
+    with pytest.raises(ValueError):
+        statcast_planner.ChunkPlanner(target_fill=0)
+
+
+def test_plan_empty_days() -> None:
+    planner = statcast_planner.ChunkPlanner(default_rows_per_day=1)
+    all_star_break = set(_days(date(2020, 8, 3), 3))
+
+    # The empty days aren't requested, but a window runs through them
+    assert planner.plan(_days(date(2020, 8, 1), 7), empty_days=all_star_break) == [
+        (date(2020, 8, 1), date(2020, 8, 7))
+    ]
+    assert planner.plan(_days(date(2020, 8, 3), 3), empty_days=all_star_break) == []
+
+
+def test_handle_request_splits_truncated_windows(monkeypatch: MonkeyPatch, statcast_module: types.ModuleType,
+                                                 statcast_fetch_monkeypatch: StatcastFetchMonkeypatch) -> None:
+    planner = statcast_planner.ChunkPlanner(row_cap=10, default_rows_per_day=1)
+    monkeypatch.setattr(statcast_module, '_planners', {None: planner})
+
+    def _fetch(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        data = pd.DataFrame([
+            {'game_date': day.isoformat(), 'game_pk': 1, 'at_bat_number': 1, 'pitch_number': pitch}
+            for day in date_span(start_dt, end_dt) for pitch in range(4)
+        ])
+        return data.head(planner.row_cap)
+
+    fetch = statcast_fetch_monkeypatch(_fetch)
+
+    result = statcast_module._handle_request(date(2020, 8, 1), date(2020, 8, 4), None, verbose=False)
+
+    assert len(result) == 16
+    fetched: List[Tuple[date, date]] = sorted(call.args for call in fetch.call_args_list)
+    assert fetched == [
+        (date(2020, 8, 1), date(2020, 8, 2)), (date(2020, 8, 1), date(2020, 8, 4)),
+        (date(2020, 8, 3), date(2020, 8, 4))
+    ]
+    # What it learned is used for the next plan
+    assert planner.expected_rows(date(2020, 8, 1)) == 4
+    assert planner.plan(_days(date(2020, 8, 1), 4)) == [(date(2020, 8, 1), date(2020, 8, 1)),
+                                                         (date(2020, 8, 2), date(2020, 8, 2)),
+                                                         (date(2020, 8, 3), date(2020, 8, 3)),
+                                                         (date(2020, 8, 4), date(2020, 8, 4))]
@@ -0,0 +1,111 @@
+import re
+from datetime import date, timedelta
+from typing import Any, List
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import statcast_pitcher, statcast_planner, statcast_players, statcast_store
+from pybaseball.statcast_players import _player_partition
+from pybaseball.datasources.async_http import AsyncFetcher
+
+
+@pytest.fixture(name='urls')
+def _urls(monkeypatch: MonkeyPatch) -> List[str]:
+    ''' Answers every search with a pitch per player per day, and records the urls '''
+    urls: List[str] = []
+
+    async def _get(self: AsyncFetcher, url: str, **kwargs: Any) -> bytes:
+        urls.append(url)
+        start, end = (date.fromisoformat(value) for value in re.findall(r'game_date_[gl]t=([\d-]+)', url))
+        player_ids = [int(value) for value in re.findall(r'pitchers_lookup%5B%5D=(\d+)', url)]
+        days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+        rows = [
+            f'{day},{day.toordinal()},{player_id},1,{player_id},{player_id * 10}'
+            for day in days for player_id in player_ids
+        ]
+        return '\n'.join(['game_date,game_pk,at_bat_number,pitch_number,pitcher,batter'] + rows).encode('utf-8')
+
+    monkeypatch.setattr(AsyncFetcher, 'get', _get)
+    return urls
+
+
+def test_statcast_players_batches_players(urls: List[str]) -> None:
+    player_ids = list(range(1, 26))
+
+    result = statcast_players(player_ids, '2019-05-01', '2019-05-03', verbose=False)
+
+    # 20 players in the first request, 5 in the second
+    assert sorted(url.count('pitchers_lookup') for url in urls) == [5, 20]
+    assert len(result) == 25 * 3
+    assert sorted(result['pitcher'].unique()) == player_ids
+    assert list(result['game_date'].dt.day.drop_duplicates()) == [3, 2, 1]
+
+
+def test_statcast_players_caches_each_player(cache_dir: str, urls: List[str]) -> None:
+    statcast_players([1, 2], '2019-05-01', '2019-05-03', verbose=False)
+    assert len(urls) == 1
+    store = statcast_store.StatcastStore.from_config()
+    assert store.partition_kind(_player_partition('pitcher', 1)) == statcast_store.PLAYER
+    assert not store.is_whole_game_partition(_player_partition('pitcher', 1))
+
+    # Served from the store, player by player
+    result = statcast_pitcher('2019-05-02', '2019-05-03', 2)
+    assert len(urls) == 1
+    assert list(result['pitcher']) == [2, 2]
+
+    # Only player 3 is fetched
+    result = statcast_players([1, 3], '2019-05-01', '2019-05-03', verbose=False)
+    assert len(urls) == 2
+    assert urls[-1].count('pitchers_lookup') == 1
+    assert sorted(result['pitcher'].unique()) == [1, 3]
+
+
+def test_statcast_players_splits_truncated_windows(monkeypatch: MonkeyPatch, urls: List[str]) -> None:
+    # Any response of 3 pitches or more is at the row limit
+    monkeypatch.setattr(statcast_planner, 'is_truncated', lambda rows, row_cap=3: rows >= row_cap)
+
+    result = statcast_players([1], '2019-05-01', '2019-05-04', verbose=False)
+
+    windows = [tuple(re.findall(r'game_date_[gl]t=([\d-]+)', url)) for url in urls]
+    assert windows[0] == ('2019-05-01', '2019-05-04')
+    assert sorted(windows[1:]) == [('2019-05-01', '2019-05-02'), ('2019-05-03', '2019-05-04')]
+    assert list(result['game_date'].dt.day) == [4, 3, 2, 1]
+
+
+def test_statcast_players_refetches_truncated_days(cache_dir: str, monkeypatch: MonkeyPatch,
+                                                  urls: List[str]) -> None:
+    # A day of 2 pitches is at the row limit on its own
+    monkeypatch.setattr(statcast_planner, 'is_truncated', lambda rows, row_cap=0: rows >= 2)
+
+    with pytest.warns(UserWarning):
+        statcast_players([1, 2], '2019-05-01', '2019-05-01', verbose=False)
+    with pytest.warns(UserWarning):
+        statcast_players([1, 2], '2019-05-01', '2019-05-01', verbose=False)
+
+    assert len(urls) == 2
+
+
+def test_statcast_players_drops_repeated_pitches(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(statcast_planner, 'is_truncated', lambda rows, row_cap=5: rows >= row_cap)
+
+    async def _get(self: AsyncFetcher, url: str, **kwargs: Any) -> bytes:
+        start, end = (date.fromisoformat(value) for value in re.findall(r'game_date_[gl]t=([\d-]+)', url))
+        # A window split at the row limit comes back with the last pitch before it too
+        first = max(start - timedelta(days=1), date(2019, 5, 1))
+        days = [first + timedelta(days=offset) for offset in range((end - first).days + 1)]
+        rows = [f'{day},{day.toordinal()},1,1,1,10' for day in days]
+        return '\n'.join(['game_date,game_pk,at_bat_number,pitch_number,pitcher,batter'] + rows).encode('utf-8')
+
+    monkeypatch.setattr(AsyncFetcher, 'get', _get)
+
+    result = statcast_players([1], '2019-05-01', '2019-05-06', verbose=False)
+
+    assert list(result['game_date'].dt.day) == [6, 5, 4, 3, 2, 1]
+
+
+def test_statcast_players_invalid() -> None:
+    with pytest.raises(ValueError):
+        statcast_players([1], '2019-05-01', role='catcher')
+    with pytest.raises(ValueError):
+        statcast_players([], '2019-05-01')
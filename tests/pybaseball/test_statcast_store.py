@@ -0,0 +1,292 @@
+import os
+import types
+from datetime import date, datetime, timedelta
+from typing import Any, List, Optional, Tuple
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import cache, statcast_planner, statcast_store
+from pybaseball.datahelpers import statcast_schema
+from pybaseball.statcast import _handle_request, _partition
+from pybaseball.statcast_filters import StatcastFilter
+
+from .conftest import StatcastFetchMonkeypatch
+
+
+@pytest.fixture(name='store')
+def _store(cache_dir: str) -> statcast_store.StatcastStore:
+    return statcast_store.StatcastStore.from_config()
+
+
+def _pitches(days: List[date], per_day: int = 2) -> pd.DataFrame:
+    return statcast_schema.apply_schema(pd.DataFrame([
+        {'game_date': day.isoformat(), 'game_pk': day.toordinal(), 'at_bat_number': 1, 'pitch_number': pitch}
+        for day in days for pitch in range(1, per_day + 1)
+    ]))
+
+
+def test_from_config_reuses_store(store: statcast_store.StatcastStore) -> None:
+    assert statcast_store.StatcastStore.from_config() is store
+
+    # os.remove is mocked out for the unit tests
+    os.unlink(store.manifest_filename)
+    reopened = statcast_store.StatcastStore.from_config()
+    assert reopened is not store
+    assert os.path.isfile(reopened.manifest_filename)
+
+
+def test_contiguous_ranges() -> None:
+    days = [date(2020, 8, 1), date(2020, 8, 2), date(2020, 8, 3), date(2020, 8, 5)]
+
+    assert statcast_store.contiguous_ranges(days) == [
+        (date(2020, 8, 1), date(2020, 8, 3)), (date(2020, 8, 5), date(2020, 8, 5))
+    ]
+    assert statcast_store.contiguous_ranges(days, max_days=2) == [
+        (date(2020, 8, 1), date(2020, 8, 2)), (date(2020, 8, 3), date(2020, 8, 3)),
+        (date(2020, 8, 5), date(2020, 8, 5))
+    ]
+
+
+def test_save_days(store: statcast_store.StatcastStore) -> None:
+    start, end = date(2020, 8, 1), date(2020, 8, 3)
+    store.save_days(start, end, _pitches([date(2020, 8, 1), date(2020, 8, 3)]))
+
+    manifest = store.manifest()
+    assert list(manifest['game_date']) == list(statcast_store.date_span(start, end))
+    assert list(manifest['rows']) == [2, 0, 2]
+    assert os.path.isfile(store.day_filename(date(2020, 8, 1)))
+    assert not os.path.exists(store.day_filename(date(2020, 8, 2)))
+
+    loaded = store.load_days(statcast_store.date_span(start, end))
+    assert [len(frame) for frame in loaded] == [2, 2]
+    assert store.missing_days(statcast_store.date_span(date(2020, 7, 31), end)) == [date(2020, 7, 31)]
+
+
+def test_save_fetched_skips_truncated(store: statcast_store.StatcastStore) -> None:
+    day = date(2020, 8, 1)
+
+    assert not store.save_fetched(day, day, _pitches([day]), row_cap=2)
+    assert not store.save_fetched(day, day, _pitches([day]), response_rows=25000)
+    assert store.missing_days([day]) == [day]
+
+    assert store.save_fetched(day, day, _pitches([day]), row_cap=3)
+    assert store.missing_days([day]) == []
+
+
+def test_days_in_range() -> None:
+    days = statcast_store.days_in_range(date(2019, 10, 30), date(2020, 7, 24), verbose=False)
+
+    assert days[0] == date(2019, 10, 30)
+    assert days[-1] == date(2020, 7, 24)
+    assert date(2020, 1, 1) not in days
+
+
+def test_save_days_by_team(store: statcast_store.StatcastStore) -> None:
+    store.save_days(date(2020, 8, 1), date(2020, 8, 1), _pitches([date(2020, 8, 1)]), team='SEA')
+
+    assert store.missing_days([date(2020, 8, 1)], team='SEA') == []
+    assert store.missing_days([date(2020, 8, 1)]) == [date(2020, 8, 1)]
+
+
+def test_find_games(store: statcast_store.StatcastStore) -> None:
+    store.save_days(date(2020, 8, 1), date(2020, 8, 2), _pitches([date(2020, 8, 1), date(2020, 8, 2)]))
+    store.save_days(date(2020, 8, 2), date(2020, 8, 2), _pitches([date(2020, 8, 2)]), team='SEA')
+
+    game_pk = date(2020, 8, 2).toordinal()
+    assert store.find_games([game_pk, 1]) == {game_pk: [('SEA', date(2020, 8, 2)), ('all', date(2020, 8, 2))]}
+
+
+def test_upsert_pitches(store: statcast_store.StatcastStore) -> None:
+    day = date(2020, 8, 1)
+    stored = _pitches([day], per_day=3)
+    stored['release_speed'] = [95.0, 94.0, 93.0]
+    store.save_days(day, day, stored.sort_values('pitch_number', ascending=False))
+    newer = _pitches([day, date(2020, 8, 2)], per_day=4).iloc[[1, 3, 4]]
+    newer['release_speed'] = [99.0, 98.0, 97.0]
+
+    # Only the stored day is updated
+    assert store.upsert_pitches(newer) == [day]
+
+    loaded = store.load_days([day])[0]
+    assert list(loaded['pitch_number']) == [4, 3, 2, 1]
+    assert list(loaded['release_speed']) == [98.0, 93.0, 99.0, 95.0]
+    assert store.row_counts([day]) == {day: 4}
+    assert store.missing_days([date(2020, 8, 2)]) == [date(2020, 8, 2)]
+
+
+def test_is_fresh(store: statcast_store.StatcastStore) -> None:
+    game_date = date(2020, 8, 1)
+    now = datetime(2020, 8, 2, 12)
+
+    # Fetched after the game settled
+    assert store.is_fresh(game_date, datetime(2020, 8, 10).timestamp(), now=datetime(2021, 1, 1))
+    # Fetched before the game settled, but recently
+    assert store.is_fresh(game_date, (now - timedelta(hours=1)).timestamp(), now=now)
+    # Fetched before the game settled, a while ago
+    assert not store.is_fresh(game_date, (now - timedelta(days=1)).timestamp(), now=now)
+
+
+def test_purge_clears_store(store: statcast_store.StatcastStore, monkeypatch: MonkeyPatch) -> None:
+    # os.remove is mocked out for the unit tests
+    monkeypatch.setattr(statcast_store.file_utils, 'remove', os.unlink)
+    day = date(2020, 8, 1)
+    store.save_days(day, day, _pitches([day]))
+
+    cache.purge()
+
+    assert not os.path.exists(store.day_filename(day))
+    assert store.missing_days([day]) == [day]
+    assert store.find_games([day.toordinal()]) == {}
+
+
+def test_flush_removes_stale_days(store: statcast_store.StatcastStore, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(statcast_store.file_utils, 'remove', os.unlink)
+    monkeypatch.setattr(store, 'unsettled_ttl', timedelta(0))
+    settled, recent = date(2020, 8, 1), date.today()
+    store.save_days(settled, settled, _pitches([settled]))
+    store.save_days(recent, recent, _pitches([recent]))
+
+    cache.flush()
+
+    assert os.path.isfile(store.day_filename(settled))
+    assert not os.path.exists(store.day_filename(recent))
+    assert list(store.manifest()['game_date']) == [settled]
+
+
+def test_compact_evicts_least_recently_used_days(store: statcast_store.StatcastStore,
+                                                 monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(statcast_store.file_utils, 'remove', os.unlink)
+    first, second = date(2020, 8, 1), date(2020, 8, 2)
+    store.save_days(first, second, _pitches([first, second]))
+    store.load_days([first])
+    day_size = os.path.getsize(store.day_filename(second))
+
+    assert cache.total_size() == store.total_size() == 2 * day_size
+
+    assert cache.compact(max_bytes=day_size) == day_size
+
+    assert store.missing_days([first, second]) == [second]
+    assert not os.path.exists(store.day_filename(second))
+    assert cache.total_size() == day_size
+
+
+def test_save_days_schedules_compaction(store: statcast_store.StatcastStore, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(cache.config, 'max_bytes', 0)
+    schedule_mock = MagicMock()
+    monkeypatch.setattr(cache.cache, '_schedule_compaction', schedule_mock)
+
+    store.save_days(date(2020, 8, 1), date(2020, 8, 1), _pitches([date(2020, 8, 1)]))
+
+    schedule_mock.assert_called_once()
+
+
+def test_handle_request_fetches_missing_days(store: statcast_store.StatcastStore,
+                                             statcast_fetch_monkeypatch: StatcastFetchMonkeypatch) -> None:
+    def _fetch(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        return _pitches(list(statcast_store.date_span(start_dt, end_dt)))
+
+    fetch = statcast_fetch_monkeypatch(_fetch)
+
+    first = _handle_request(date(2020, 8, 1), date(2020, 8, 3), 1, verbose=False, parallel=False)
+    assert len(first) == 6
+    assert fetch.call_count == 3
+
+    fetch.reset_mock()
+    second = _handle_request(date(2020, 8, 2), date(2020, 8, 5), 1, verbose=False, parallel=False)
+    assert len(second) == 8
+    fetched: List[Tuple[date, date]] = sorted(call.args for call in fetch.call_args_list)
+    assert fetched == [(date(2020, 8, 4), date(2020, 8, 4)), (date(2020, 8, 5), date(2020, 8, 5))]
+    assert list(second['game_date'].dt.strftime('%Y-%m-%d').drop_duplicates()) == [
+        '2020-08-05', '2020-08-04', '2020-08-03', '2020-08-02'
+    ]
+
+
+def test_handle_request_refetches_truncated_days(store: statcast_store.StatcastStore, monkeypatch: MonkeyPatch,
+                                                statcast_module: types.ModuleType,
+                                                statcast_fetch_monkeypatch: StatcastFetchMonkeypatch) -> None:
+    # A day of 2 pitches is at the row limit on its own
+    monkeypatch.setattr(statcast_module, '_planners', {None: statcast_planner.ChunkPlanner(row_cap=2)})
+
+    def _fetch(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        return _pitches([start_dt])
+
+    fetch = statcast_fetch_monkeypatch(_fetch)
+
+    with pytest.warns(UserWarning):
+        assert len(_handle_request(date(2020, 8, 1), date(2020, 8, 1), 1, verbose=False)) == 2
+    assert store.missing_days([date(2020, 8, 1)]) == [date(2020, 8, 1)]
+
+    with pytest.warns(UserWarning):
+        _handle_request(date(2020, 8, 1), date(2020, 8, 1), 1, verbose=False)
+    assert fetch.call_count == 2
+
+
+def test_handle_request_keeps_filtered_days_apart(store: statcast_store.StatcastStore, monkeypatch: MonkeyPatch,
+                                                  statcast_module: types.ModuleType) -> None:
+    fetch = MagicMock(side_effect=lambda start_dt, end_dt, filters: _pitches([start_dt], 1 if filters else 2))
+
+    async def _fetch_async(fetcher: Any, start_dt: date, end_dt: date, team: Optional[str] = None,
+                           filters: Any = None, columns: Any = None) -> pd.DataFrame:
+        return fetch(start_dt, end_dt, filters)
+
+    monkeypatch.setattr(statcast_module, '_fetch_small_request_async', _fetch_async)
+    sliders = StatcastFilter(pitch_types='SL')
+
+    assert len(_handle_request(date(2020, 8, 1), date(2020, 8, 1), 1, verbose=False)) == 2
+    assert len(_handle_request(date(2020, 8, 1), date(2020, 8, 1), 1, verbose=False, filters=sliders)) == 1
+    assert fetch.call_count == 2
+
+    # Both are served from the store from now on
+    assert len(_handle_request(date(2020, 8, 1), date(2020, 8, 1), 1, verbose=False,
+                               filters=StatcastFilter(pitch_types='Slider'))) == 1
+    assert fetch.call_count == 2
+    assert list(store.manifest(_partition(None, sliders))['rows']) == [1]
+
+
+def test_partition_kinds(store: statcast_store.StatcastStore,
+                         statcast_fetch_monkeypatch: StatcastFetchMonkeypatch) -> None:
+    statcast_fetch_monkeypatch(lambda start_dt, end_dt, team=None: _pitches([start_dt]))
+    sliders = StatcastFilter(pitch_types='SL')
+    day = date(2020, 8, 1)
+
+    for team in [None, 'SEA']:
+        for filters in [None, sliders]:
+            _handle_request(day, day, 1, verbose=False, team=team, filters=filters)
+
+    assert store.partition_kind(None) == statcast_store.LEAGUE
+    assert store.partition_kind('SEA') == statcast_store.TEAM
+    assert store.partition_kind(_partition(None, sliders)) == statcast_store.FILTERED
+    assert store.partition_kind(_partition('SEA', sliders)) == statcast_store.FILTERED
+    assert store.partition_kind('never-saved') is None
+    assert store.is_whole_game_partition(None)
+    assert store.is_whole_game_partition('SEA')
+    assert not store.is_whole_game_partition(_partition('SEA', sliders))
+    assert not store.is_whole_game_partition('never-saved')
+
+    with pytest.raises(ValueError):
+        store.save_days(day, day, _pitches([day]), 'SEA', kind='season')
+
+
+def test_handle_request_columns(store: statcast_store.StatcastStore, monkeypatch: MonkeyPatch,
+                                statcast_module: types.ModuleType) -> None:
+    fetch = MagicMock(side_effect=lambda start_dt, end_dt: _pitches([start_dt]).assign(release_speed=95.0))
+
+    async def _fetch_async(fetcher: Any, start_dt: date, end_dt: date, team: Optional[str] = None,
+                           filters: Any = None, columns: Any = None) -> pd.DataFrame:
+        # Days fetched for the store are parsed whole
+        assert columns is None
+        return fetch(start_dt, end_dt)
+
+    monkeypatch.setattr(statcast_module, '_fetch_small_request_async', _fetch_async)
+
+    fetched = _handle_request(date(2020, 8, 1), date(2020, 8, 1), 1, verbose=False, columns=['release_speed'])
+    stored = _handle_request(date(2020, 8, 1), date(2020, 8, 1), 1, verbose=False, columns=['release_speed', 'game_pk'])
+
+    assert fetch.call_count == 1
+    assert list(fetched.columns) == ['release_speed']
+    assert list(stored.columns) == ['release_speed', 'game_pk']
+    # The store still has every column for the next query
+    assert len(store.load_days([date(2020, 8, 1)])[0].columns) == 5
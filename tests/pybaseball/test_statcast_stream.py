@@ -0,0 +1,112 @@
+import os
+import types
+from datetime import date
+from typing import List, Optional, Tuple
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from pybaseball import cache, statcast_planner, statcast_store
+from pybaseball.datahelpers import statcast_schema
+from pybaseball.statcast_stream import read_statcast_parquet, statcast_iter, statcast_to_parquet
+
+from .conftest import StatcastFetchMonkeypatch
+
+
+@pytest.fixture(name='directory')
+def _directory(cache_dir: str, monkeypatch: MonkeyPatch) -> str:
+    # A directory to write to, with the cache off
+    monkeypatch.setattr(cache.config, 'enabled', False)
+    return cache_dir
+
+
+@pytest.fixture(name='fetch')
+def _fetch(monkeypatch: MonkeyPatch, statcast_module: types.ModuleType,
+           statcast_fetch_monkeypatch: StatcastFetchMonkeypatch) -> MagicMock:
+    # Two days per request
+    monkeypatch.setattr(statcast_module, '_planners', {
+        None: statcast_planner.ChunkPlanner(row_cap=100, target_fill=1, default_rows_per_day=50)
+    })
+
+    def _fetch_small_request(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        days = list(statcast_store.date_span(start_dt, end_dt))
+        data = statcast_schema.apply_schema(pd.DataFrame([
+            {
+                'game_date': day.isoformat(), 'game_pk': 1, 'at_bat_number': 1, 'pitch_number': pitch,
+                # All null on the first day, strings after that
+                'bb_type': None if day.day == 1 else 'fly_ball',
+                # Whole numbers on the first day, with nulls after that
+                'hit_location': 7 if day.day == 1 else np.nan,
+            }
+            for day in days for pitch in range(1, 4)
+        ]))
+        return statcast_module._process_small_request(data)
+
+    return statcast_fetch_monkeypatch(_fetch_small_request)
+
+
+def _days(data: pd.DataFrame) -> List[str]:
+    return list(data['game_date'].dt.strftime('%Y-%m-%d').drop_duplicates())
+
+
+def test_statcast_iter(directory: str, fetch: MagicMock) -> None:
+    chunks = list(statcast_iter('2019-05-01', '2019-05-05', verbose=False))
+
+    assert [_days(chunk) for chunk in chunks] == [
+        ['2019-05-01', '2019-05-02'], ['2019-05-03', '2019-05-04'], ['2019-05-05']
+    ]
+    assert all(list(chunk['pitch_number'][:3]) == [1, 2, 3] for chunk in chunks)
+
+
+def test_statcast_iter_close_early(directory: str, fetch: MagicMock) -> None:
+    chunks = statcast_iter('2019-05-01', '2019-05-31', verbose=False, parallel=False)
+
+    first = next(chunks)
+    chunks.close()
+
+    assert _days(first) == ['2019-05-01', '2019-05-02']
+    # One chunk was yielded and at most one was being fetched ahead
+    assert fetch.call_count <= 2
+
+
+def test_statcast_iter_uses_store(cache_dir: str, fetch: MagicMock) -> None:
+    list(statcast_iter('2019-05-01', '2019-05-02', verbose=False))
+
+    fetch.reset_mock()
+    chunks = list(statcast_iter('2019-05-01', '2019-05-04', verbose=False))
+
+    fetched: List[Tuple[date, date]] = [call.args for call in fetch.call_args_list]
+    assert fetched == [(date(2019, 5, 3), date(2019, 5, 4))]
+    assert [_days(chunk) for chunk in chunks] == [
+        ['2019-05-01', '2019-05-02'], ['2019-05-03', '2019-05-04']
+    ]
+
+
+def test_statcast_iter_columns(cache_dir: str, fetch: MagicMock) -> None:
+    list(statcast_iter('2019-05-01', '2019-05-02', verbose=False))
+
+    chunks = list(statcast_iter('2019-05-01', '2019-05-04', verbose=False, columns=['hit_location', 'pitch_number']))
+
+    # Both from the store and fetched
+    assert [list(chunk.columns) for chunk in chunks] == [['hit_location', 'pitch_number']] * 2
+    assert list(chunks[0]['pitch_number'][:3]) == [1, 2, 3]
+
+
+def test_statcast_to_parquet(directory: str, fetch: MagicMock) -> None:
+    path = os.path.join(directory, 'dataset')
+
+    assert statcast_to_parquet(path, '2019-05-01', '2019-05-05', verbose=False) == 15
+    assert sorted(os.listdir(os.path.join(path, '2019'))) == [
+        'statcast_2019-05-01_2019-05-02.parquet', 'statcast_2019-05-03_2019-05-04.parquet',
+        'statcast_2019-05-05_2019-05-05.parquet'
+    ]
+
+    result = read_statcast_parquet(path)
+    assert len(result) == 15
+    assert result['bb_type'].notna().sum() == 12
+    assert result['hit_location'].sum() == 21
+
+    assert list(read_statcast_parquet(path, columns=['game_date']).columns) == ['game_date']
@@ -0,0 +1,92 @@
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from pybaseball import statcast_store
+from pybaseball.statcast_sync import main, statcast_sync
+
+from .conftest import StatcastFetchMonkeypatch
+
+
+@pytest.fixture(name='pitches_per_day')
+def _pitches_per_day() -> Dict[date, int]:
+    return {}
+
+
+@pytest.fixture(name='fetch')
+def _fetch(cache_dir: str, statcast_fetch_monkeypatch: StatcastFetchMonkeypatch,
+           pitches_per_day: Dict[date, int]) -> MagicMock:
+    def _fetch_small_request(start_dt: date, end_dt: date, team: Optional[str] = None) -> pd.DataFrame:
+        return pd.DataFrame([
+            {'game_date': day.isoformat(), 'game_pk': 1, 'at_bat_number': 1, 'pitch_number': pitch}
+            for day in statcast_store.date_span(start_dt, end_dt) for pitch in range(pitches_per_day.get(day, 2))
+        ])
+
+    return statcast_fetch_monkeypatch(_fetch_small_request)
+
+
+def _fetched_days(fetch: MagicMock) -> List[date]:
+    ranges: List[Tuple[date, date]] = [call.args for call in fetch.call_args_list]
+    return sorted(day for start, end in ranges for day in statcast_store.date_span(start, end))
+
+
+def test_statcast_sync_appends_and_refetches_trailing_days(fetch: MagicMock) -> None:
+    first = statcast_sync('2019-04-01', '2019-04-10', refetch_days=2, verbose=False, parallel=False)
+    assert len(first) == 10
+    assert set(first['status']) == {'new'}
+
+    fetch.reset_mock()
+    second = statcast_sync('2019-04-01', '2019-04-12', refetch_days=2, verbose=False, parallel=False)
+    assert _fetched_days(fetch) == [date(2019, 4, 11), date(2019, 4, 12)]
+    assert list(second['status'].value_counts().sort_index().items()) == [('new', 2), ('stored', 10)]
+
+    fetch.reset_mock()
+    third = statcast_sync('2019-04-01', '2019-04-12', refetch_days=2, verbose=False, parallel=False)
+    assert _fetched_days(fetch) == [date(2019, 4, 11), date(2019, 4, 12)]
+    assert list(third['status'].value_counts().sort_index().items()) == [('refetched', 2), ('stored', 10)]
+
+
+def test_statcast_sync_walks_back_changed_days(fetch: MagicMock, pitches_per_day: Dict[date, int]) -> None:
+    statcast_sync('2019-04-01', '2019-04-10', refetch_days=2, verbose=False, parallel=False)
+
+    # A correction to the last two days, and to the two before them
+    pitches_per_day.update({date(2019, 4, day): 3 for day in range(7, 11)})
+    fetch.reset_mock()
+    result = statcast_sync('2019-04-01', '2019-04-10', refetch_days=2, verbose=False, parallel=False)
+
+    assert _fetched_days(fetch) == [date(2019, 4, day) for day in range(5, 11)]
+    assert list(result['status'].value_counts().sort_index().items()) == [
+        ('changed', 4), ('refetched', 2), ('stored', 4)
+    ]
+    assert list(result['rows'])[-4:] == [3, 3, 3, 3]
+
+
+def test_statcast_sync_counts_game_days(fetch: MagicMock, pitches_per_day: Dict[date, int]) -> None:
+    # An off day among the trailing days
+    pitches_per_day[date(2019, 4, 9)] = 0
+    statcast_sync('2019-04-01', '2019-04-10', refetch_days=2, verbose=False, parallel=False)
+
+    result = statcast_sync('2019-04-01', '2019-04-10', refetch_days=2, verbose=False, parallel=False)
+
+    assert list(result['status'])[-3:] == ['refetched', 'stored', 'refetched']
+
+
+def test_statcast_sync_skips_offseason(fetch: MagicMock) -> None:
+    result = statcast_sync('2019-10-29', '2019-11-05', refetch_days=1, verbose=False, parallel=False)
+
+    assert list(result['game_date']) == [date(2019, 10, 29), date(2019, 10, 30)]
+
+
+def test_statcast_sync_invalid_refetch_days(cache_dir: str) -> None:
+    with pytest.raises(ValueError):
+        statcast_sync('2019-04-01', '2019-04-10', refetch_days=-1)
+
+
+def test_statcast_sync_cli(fetch: MagicMock, capsys: pytest.CaptureFixture) -> None:
+    main(['--start-date', '2019-04-01', '--end-date', '2019-04-03', '--refetch-days', '1'])
+
+    assert _fetched_days(fetch) == [date(2019, 4, 1), date(2019, 4, 2), date(2019, 4, 3)]
+    assert 'Synced 2019-04-01 to 2019-04-03: 3 days fetched (3 new, 0 changed)' in capsys.readouterr().out
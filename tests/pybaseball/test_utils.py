@@ -1,8 +1,12 @@
+import sys
 from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
 
+import pandas as pd
 import pytest
+from _pytest.monkeypatch import MonkeyPatch
 
-from pybaseball.utils import DATE_FORMAT, sanitize_date_range
+from pybaseball.utils import DATE_FORMAT, sanitize_date_range, split_request
 
 
 def test_sanitize_date_range_nones() -> None:
@@ -52,3 +56,15 @@ def test_sanitize_date_range_start_dt_gt_end_dt() -> None:
     assert start_dt_date < end_dt_date
     assert str(start_dt_date) == end_dt
     assert str(end_dt_date) == start_dt
+
+
+@pytest.mark.parametrize('lookup, role', [('pitchers_lookup', 'pitcher'), ('batters_lookup', 'batter')])
+def test_split_request_deprecated(monkeypatch: MonkeyPatch, lookup: str, role: str) -> None:
+    players_mock = MagicMock(return_value=pd.DataFrame())
+    # The statcast_players function shadows its module in the package namespace
+    monkeypatch.setattr(sys.modules['pybaseball.statcast_players'], 'statcast_players', players_mock)
+
+    with pytest.warns(DeprecationWarning):
+        split_request('2020-08-01', '2020-08-04', 1, f'game_date_gt={{}}&game_date_lt={{}}&{lookup}%5B%5D={{}}')
+
+    players_mock.assert_called_once_with([1], '2020-08-01', '2020-08-04', role=role, typed=False)